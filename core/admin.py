@@ -1,23 +1,175 @@
-from django.contrib import admin
-from .models import Department, Faculty, Notice, Program, Event, Gallery, Faq
+import zipfile
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
+from . import export
+from .models import Department, Faculty, Notice, Program, Event, Gallery, Faq, Exam, ExamResult, AdmissionApplication, Alumnus
+from .normalization import normalize_roll
+from .signals import content_changed
+
+# Below this many rows an exact COUNT(*) is cheap enough to keep.
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Use the planner's row estimate for unfiltered changelists on PostgreSQL."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+        return super().count
+
+
+def export_response(queryset, format):
+    response = StreamingHttpResponse(export.encode(queryset, format), content_type=export.FORMATS[format])
+    response['Content-Disposition'] = f'attachment; filename="{export.filename(queryset.model, format)}"'
+    return response
+
+
+def make_export_action(format):
+    def action(modeladmin, request, queryset):
+        return export_response(queryset, format)
+
+    action.__name__ = f'export_{format}'
+    return admin.action(description=f"Export selected as {format.upper()}", permissions=['view'])(action)
+
+
+class ExportMixin:
+    """
+    Stream a model out as CSV or JSONL (core.export).
+
+    The selection can be exported with an action, and the whole filtered
+    changelist from its object tools without selecting anything.
+    """
+    change_list_template = 'admin/export_change_list.html'
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        for format in export.FORMATS:
+            action = make_export_action(format)
+            if self.has_view_permission(request):
+                actions[action.__name__] = (action, action.__name__, action.short_description)
+        return actions
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                'export/<str:format>/', self.admin_site.admin_view(self.export_view),
+                name=f'{opts.app_label}_{opts.model_name}_export',
+            ),
+        ] + super().get_urls()
+
+    def export_view(self, request, format):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        if format not in export.FORMATS:
+            raise Http404(f"Unknown export format '{format}'.")
+        # The same filters, search and ordering as the changelist it was linked from.
+        changelist = self.get_changelist_instance(request)
+        return export_response(changelist.get_queryset(request), format)
+
+
+class ScalableModelAdmin(ExportMixin, admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+# Larger selections are announced without their pks, which listeners treat
+# as a change to the whole table.
+ANNOUNCE_MAX_PKS = 50
+
+
+def bulk_update(modeladmin, request, queryset, **changes):
+    """
+    Apply ``changes`` to the selection in one UPDATE.
+
+    Values are validated against the model fields first, and
+    ``content_changed`` fires once for the whole batch.
+    """
+    model = queryset.model
+    try:
+        for name, value in changes.items():
+            model._meta.get_field(name).clean(value, None)
+    except ValidationError as e:
+        modeladmin.message_user(request, "; ".join(e.messages), messages.ERROR)
+        return 0
+
+    with transaction.atomic():
+        # Read before the UPDATE: the changes may take rows out of a filtered selection.
+        pks = list(queryset.values_list('pk', flat=True)[:ANNOUNCE_MAX_PKS + 1])
+        if len(pks) > ANNOUNCE_MAX_PKS:
+            pks = None
+        updated = queryset.update(**changes)
+        transaction.on_commit(lambda: content_changed.send(sender=model, pks=pks, fields=list(changes)))
+
+    modeladmin.message_user(
+        request, f"Updated {updated} {model._meta.verbose_name_plural}.", messages.SUCCESS
+    )
+    return updated
+
+
+def make_category_action(category, label):
+    def action(modeladmin, request, queryset):
+        bulk_update(modeladmin, request, queryset, category=category)
+
+    action.__name__ = f"set_category_{category.replace(' ', '_')}"
+    return admin.action(description=f"Move selected to category: {label}")(action)
+
+
+def category_actions(choices):
+    return [make_category_action(value, label) for value, label in choices]
+
 
 @admin.register(Department)
-class DepartmentAdmin(admin.ModelAdmin):
+class DepartmentAdmin(ScalableModelAdmin):
     list_display = ('name', 'code', 'department_head', 'established')
-    search_fields = ('name', 'code', 'department_head')
+    list_select_related = ('department_head',)
+    search_fields = ('name', '=code', 'department_head__name')
 
 @admin.register(Faculty)
-class FacultyAdmin(admin.ModelAdmin):
+class FacultyAdmin(ScalableModelAdmin):
     list_display = ('name', 'designation', 'department', 'email', 'phone')
     list_filter = ('designation', 'department')
-    search_fields = ('name', 'email', 'bio')
+    list_select_related = ('department',)
+    search_fields = ('name', '=email')
 
 @admin.register(Notice)
-class NoticeAdmin(admin.ModelAdmin):
+class NoticeAdmin(ScalableModelAdmin):
     list_display = ('title', 'category', 'publish_date', 'is_important')
     list_filter = ('category', 'publish_date')
-    search_fields = ('title', 'content')
+    # Prefix/exact lookups so the title and slug indexes can serve the search
+    search_fields = ('^title', '=slug')
     date_hierarchy = 'publish_date'
+    actions = ['mark_important', 'unmark_important', *category_actions(Notice.CATEGORY_CHOICES)]
+
+    @admin.action(description="Mark selected notices as important")
+    def mark_important(self, request, queryset):
+        bulk_update(self, request, queryset, is_important=True)
+
+    @admin.action(description="Unmark selected notices as important")
+    def unmark_important(self, request, queryset):
+        bulk_update(self, request, queryset, is_important=False)
 
 # @admin.register(Program)
 # class ProgramAdmin(admin.ModelAdmin):
@@ -26,18 +178,157 @@ class NoticeAdmin(admin.ModelAdmin):
 #     search_fields = ('name', 'description')
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(ScalableModelAdmin):
     list_display = ('title', 'date', 'location', 'is_featured')
     list_filter = ('is_featured', 'date')
-    search_fields = ('title', 'description', 'location')
+    search_fields = ('^title', '=slug', 'location')
     date_hierarchy = 'date'
+    actions = ['feature_events', 'unfeature_events']
+
+    @admin.action(description="Feature selected events")
+    def feature_events(self, request, queryset):
+        # Mirrors Event.save(): past events can never be featured
+        past = queryset.filter(date__lt=timezone.now().date()).count()
+        if past:
+            self.message_user(request, f"Skipped {past} past events.", messages.WARNING)
+        bulk_update(self, request, queryset.filter(date__gte=timezone.now().date()), is_featured=True)
+
+    @admin.action(description="Unfeature selected events")
+    def unfeature_events(self, request, queryset):
+        bulk_update(self, request, queryset, is_featured=False)
+
+class GalleryImportForm(forms.Form):
+    archive = forms.FileField()
+    category = forms.ChoiceField(choices=Gallery.CATEGORY_CHOICES)
+    title = forms.CharField(max_length=100, required=False, help_text="Leave blank to use each file name.")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_files = getattr(settings, 'GALLERY_IMPORT_ADMIN_MAX_FILES', 40)
+        self.fields['archive'].help_text = f"A .zip file of at most {self.max_files} images."
+
+    def clean_archive(self):
+        archive = self.cleaned_data['archive']
+        if not zipfile.is_zipfile(archive):
+            raise ValidationError("Upload a .zip file.")
+        archive.seek(0)
+        # Imported here so Pillow stays out of every worker's boot.
+        from .gallery_import import iter_sources
+
+        count = sum(1 for _ in iter_sources(archive))
+        archive.seek(0)
+        if count > self.max_files:
+            raise ValidationError(
+                f"The archive has {count} images; import at most {self.max_files} at a time here, "
+                f"or all of them with `manage.py import_gallery`."
+            )
+        return archive
+
 
 @admin.register(Gallery)
-class GalleryAdmin(admin.ModelAdmin):
+class GalleryAdmin(ScalableModelAdmin):
     list_display = ('title', 'category', 'upload_date')
     list_filter = ('category', 'upload_date')
-    search_fields = ('title', 'description')
+    search_fields = ('^title',)
+    date_hierarchy = 'upload_date'
+    actions = category_actions(Gallery.CATEGORY_CHOICES)
+    change_list_template = 'admin/core/gallery/change_list.html'
+
+    def get_urls(self):
+        return [
+            path('import/', self.admin_site.admin_view(self.import_view), name='core_gallery_import'),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form = GalleryImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            from .gallery_import import import_gallery
+
+            result = import_gallery(
+                form.cleaned_data['archive'], form.cleaned_data['category'],
+                title=form.cleaned_data['title'],
+            )
+            if result.created:
+                messages.success(request, f"Imported {len(result.created)} images.")
+            for name, error in result.failed:
+                messages.warning(request, f"Skipped {name}: {error}")
+            return redirect(reverse('admin:core_gallery_changelist'))
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'form': form,
+            'title': "Import gallery images",
+        }
+        return TemplateResponse(request, 'admin/core/gallery/import.html', context)
 
 @admin.register(Faq)
-class FaqAdmin(admin.ModelAdmin):
+class FaqAdmin(ExportMixin, admin.ModelAdmin):
     list_display = ('question', 'ans', 'page')
+
+@admin.register(Exam)
+class ExamAdmin(ExportMixin, admin.ModelAdmin):
+    list_display = ('name', 'year', 'result_count', 'is_published', 'published_at')
+    list_filter = ('is_published', 'year')
+    search_fields = ('name',)
+    actions = ['publish_exams', 'unpublish_exams']
+
+    @admin.action(description="Publish selected exams")
+    def publish_exams(self, request, queryset):
+        queryset.filter(published_at__isnull=True).update(published_at=timezone.now())
+        bulk_update(self, request, queryset, is_published=True)
+
+    @admin.action(description="Unpublish selected exams")
+    def unpublish_exams(self, request, queryset):
+        bulk_update(self, request, queryset, is_published=False)
+
+@admin.register(ExamResult)
+class ExamResultAdmin(ScalableModelAdmin):
+    list_display = ('roll', 'name', 'exam', 'gpa', 'grade')
+    list_filter = ('exam',)
+    list_select_related = ('exam',)
+    search_fields = ('=roll', 'name')
+
+    def get_search_results(self, request, queryset, search_term):
+        # Rolls are stored normalized (ExamResult.save), so 00123 finds 123.
+        if search_term.strip().isdigit():
+            search_term = normalize_roll(search_term)
+        return super().get_search_results(request, queryset, search_term)
+
+    def announce_deleted(self, exam_ids):
+        transaction.on_commit(lambda: content_changed.send(sender=Exam, pks=list(exam_ids)))
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self.announce_deleted([obj.exam_id])
+
+    def delete_queryset(self, request, queryset):
+        exam_ids = set(queryset.values_list('exam_id', flat=True))
+        super().delete_queryset(request, queryset)
+        self.announce_deleted(exam_ids)
+
+@admin.register(AdmissionApplication)
+class AdmissionApplicationAdmin(ScalableModelAdmin):
+    list_display = ('reference', 'applicant_name', 'program', 'ssc_roll', 'ssc_gpa', 'status', 'submitted_at')
+    list_filter = ('status', 'program', 'ssc_board')
+    list_select_related = ('program',)
+    search_fields = ('=reference', '=ssc_roll', 'applicant_name')
+    readonly_fields = ('reference', 'submitted_at')
+    date_hierarchy = 'submitted_at'
+    actions = ['accept_applications', 'reject_applications']
+
+    @admin.action(description="Accept selected applications")
+    def accept_applications(self, request, queryset):
+        bulk_update(self, request, queryset, status='accepted')
+
+    @admin.action(description="Reject selected applications")
+    def reject_applications(self, request, queryset):
+        bulk_update(self, request, queryset, status='rejected')
+
+@admin.register(Alumnus)
+class AlumnusAdmin(ScalableModelAdmin):
+    list_display = ('name', 'batch_year', 'department', 'profession', 'organization')
+    list_filter = ('batch_year', 'department')
+    list_select_related = ('department',)
+    search_fields = ('name', '=roll')
@@ -0,0 +1,328 @@
+"""
+Online admission applications, accepted through an append-only spool.
+
+A submitted form is validated, checked against the indexed submission
+hash and the hashes still waiting in the spool for a duplicate, and
+appended as one JSON line to this worker's spool file in
+``ADMISSION_SPOOL_DIR``. The request never waits on a database write,
+so the first days of an admission window don't queue applicants behind
+each other's INSERTs.
+
+A drainer claims spool files by renaming them and writes their
+applications in batched transactions: a thread in each web worker
+(``ADMISSION_DRAIN_IN_PROCESS``) and/or ``manage.py drain_admissions``.
+Renaming is atomic, so any number of drainers can run; a file left
+behind by a drainer that died is reclaimed after ``ADMISSION_DRAIN_STALE``
+seconds, and the unique hash keeps a replayed file from inserting twice.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections, transaction
+
+from .models import AdmissionApplication, Program
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development servers only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SPOOL_PREFIX = 'spool-'
+CLAIMED_PREFIX = 'draining-'
+# Hashes spooled but not yet drained, one empty file each.
+PENDING_DIR = 'pending'
+# With ADMISSION_CACHE_ALIAS, how long a hash stays in the cache after a
+# submission: long enough to cover the gap before the drainer writes it.
+RECENT_TIMEOUT = 600  # seconds
+
+FIELDS = [
+    field for field in AdmissionApplication._meta.concrete_fields
+    if not field.primary_key
+]
+
+
+def spool_dir():
+    return getattr(settings, 'ADMISSION_SPOOL_DIR', os.path.join(settings.BASE_DIR, '.admissions'))
+
+
+def submission_hash(program_id, ssc_board, ssc_year, ssc_roll):
+    key = f"{program_id}|{ssc_board}|{ssc_year}|{str(ssc_roll).strip().upper().lstrip('0')}"
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def new_reference():
+    return base64.b32encode(secrets.token_bytes(5)).decode()
+
+
+def _pending_path(digest):
+    return os.path.join(spool_dir(), PENDING_DIR, digest)
+
+
+def mark_pending(digest):
+    """
+    Record ``digest`` as spooled; False if some worker already spooled it.
+
+    By default this creates a file in the spool directory with O_EXCL, so
+    exactly one of two simultaneous submissions wins on any worker of the
+    host. ``ADMISSION_CACHE_ALIAS`` names a shared cache to use instead
+    when workers run on several hosts.
+    """
+    alias = getattr(settings, 'ADMISSION_CACHE_ALIAS', None)
+    if alias:
+        return caches[alias].add(f'admission:{digest}', 1, RECENT_TIMEOUT)
+    path = _pending_path(digest)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+    except FileExistsError:
+        return False
+    return True
+
+
+def clear_pending(digests):
+    alias = getattr(settings, 'ADMISSION_CACHE_ALIAS', None)
+    if alias:
+        caches[alias].delete_many([f'admission:{digest}' for digest in digests])
+        return
+    for digest in digests:
+        try:
+            os.remove(_pending_path(digest))
+        except FileNotFoundError:
+            pass
+
+
+def is_duplicate(digest):
+    """True when the hash is stored, or was spooled by another submission still waiting to drain."""
+    if AdmissionApplication.objects.filter(submission_hash=digest).exists():
+        return True
+    return not mark_pending(digest)
+
+
+def to_record(application):
+    return {field.attname: field.value_to_string(application) for field in FIELDS}
+
+
+def from_record(record):
+    return AdmissionApplication(**{
+        field.attname: field.to_python(record[field.attname])
+        for field in FIELDS if field.attname in record
+    })
+
+
+def _lock(fd):
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def _append(line):
+    directory = spool_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{SPOOL_PREFIX}{os.getpid()}.jsonl')
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            _lock(fd)
+            # A drainer may have claimed the file between open() and the
+            # lock; write only while the path still names this file.
+            try:
+                current = os.stat(path).st_ino
+            except FileNotFoundError:
+                current = None
+            if current != os.fstat(fd).st_ino:
+                continue
+            os.write(fd, line)
+            if getattr(settings, 'ADMISSION_SPOOL_FSYNC', True):
+                os.fsync(fd)
+            return
+        finally:
+            os.close(fd)
+
+
+def submit(application):
+    """
+    Spool an unsaved application and return it with its reference set.
+
+    Raises ValidationError when the candidate already applied to the program.
+    """
+    application.reference = new_reference()
+    application.submission_hash = submission_hash(
+        application.program_id, application.ssc_board, application.ssc_year, application.ssc_roll,
+    )
+    if is_duplicate(application.submission_hash):
+        raise ValidationError("An application for this program with the same SSC roll, board and year has already been submitted.")
+    line = (json.dumps(to_record(application), ensure_ascii=False, separators=(',', ':')) + '\n').encode()
+    try:
+        _append(line)
+    except BaseException:
+        clear_pending([application.submission_hash])
+        raise
+    if getattr(settings, 'ADMISSION_DRAIN_IN_PROCESS', True):
+        _drainer.ensure_running()
+    return application
+
+
+def claim():
+    """Rename pending spool files (and stale claims) to files this drainer owns."""
+    directory = spool_dir()
+    if not os.path.isdir(directory):
+        return []
+    stale_after = getattr(settings, 'ADMISSION_DRAIN_STALE', 300)
+    claimed = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if name.startswith(SPOOL_PREFIX):
+            if not stat.st_size:
+                continue
+        elif not (name.startswith(CLAIMED_PREFIX) and time.time() - stat.st_mtime > stale_after):
+            continue
+        target = os.path.join(directory, f'{CLAIMED_PREFIX}{uuid.uuid4().hex}.jsonl')
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            continue  # another drainer got there first
+        os.utime(target)  # marks the claim time for stale detection
+        claimed.append(target)
+    return claimed
+
+
+def read_claimed(path):
+    with open(path, 'rb') as f:
+        # Waits for a writer that locked the file before it was renamed.
+        _lock(f.fileno())
+        lines = f.read().splitlines()
+    records = []
+    for number, line in enumerate(lines, start=1):
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            logger.error(f"Skipping unreadable line {number} of {path}")
+    return records
+
+
+def save(records, batch_size=None):
+    """Insert the applications in ``records`` in batched transactions; return (created, duplicates)."""
+    batch_size = batch_size or getattr(settings, 'ADMISSION_BATCH_SIZE', 500)
+    created = duplicates = 0
+    for start in range(0, len(records), batch_size):
+        batch = {}
+        for record in records[start:start + batch_size]:
+            application = from_record(record)
+            if application.submission_hash in batch:
+                duplicates += 1
+            else:
+                batch[application.submission_hash] = application
+        with transaction.atomic():
+            existing = set(AdmissionApplication.objects.filter(
+                submission_hash__in=list(batch)
+            ).values_list('submission_hash', flat=True))
+            programs = set(Program.objects.filter(
+                pk__in={a.program_id for a in batch.values()}
+            ).values_list('pk', flat=True))
+            new = []
+            for digest, application in batch.items():
+                if digest in existing:
+                    duplicates += 1
+                elif application.program_id not in programs:
+                    logger.error(f"Dropping application {application.reference}: program {application.program_id} no longer exists")
+                else:
+                    new.append(application)
+            stored, file_duplicates = _insert(new)
+            created += stored
+            duplicates += file_duplicates
+    return created, duplicates
+
+
+def _insert(applications):
+    """
+    Insert ``applications``, skipping hashes a concurrent drainer stored
+    first; return (created, duplicates).
+
+    ignore_conflicts also skips a row whose random reference collides with
+    a stored one, so the rows are read back by hash and those that are
+    still missing are retried under a new reference.
+    """
+    created = duplicates = 0
+    while applications:
+        AdmissionApplication.objects.bulk_create(applications, ignore_conflicts=True)
+        stored = dict(AdmissionApplication.objects.filter(
+            submission_hash__in=[a.submission_hash for a in applications]
+        ).values_list('submission_hash', 'reference'))
+        retry = []
+        for application in applications:
+            reference = stored.get(application.submission_hash)
+            if reference == application.reference:
+                created += 1
+            elif reference is not None:
+                duplicates += 1
+            else:
+                taken = application.reference
+                application.reference = new_reference()
+                logger.warning(f"Application reference {taken} was already taken; stored as {application.reference}")
+                retry.append(application)
+        applications = retry
+    return created, duplicates
+
+
+def drain():
+    """Move every spooled application into the database; return (created, duplicates)."""
+    created = duplicates = 0
+    for path in claim():
+        records = read_claimed(path)
+        file_created, file_duplicates = save(records)
+        created += file_created
+        duplicates += file_duplicates
+        # Stored now, so the database check catches resubmissions.
+        clear_pending({record.get('submission_hash') for record in records} - {None})
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # reclaimed as stale by another drainer; the hashes dedupe it
+    if created or duplicates:
+        logger.info(f"Drained {created} admission applications ({duplicates} duplicates)")
+    return created, duplicates
+
+
+class _Drainer:
+    """Background thread draining the spool every ``ADMISSION_DRAIN_INTERVAL`` seconds."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pid = None
+
+    def ensure_running(self):
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid != os.getpid():
+                # Started lazily, and again in a forked child: threads don't survive fork().
+                threading.Thread(target=self.run, name='admission-drainer', daemon=True).start()
+                self.pid = os.getpid()
+
+    def run(self):
+        while True:
+            time.sleep(getattr(settings, 'ADMISSION_DRAIN_INTERVAL', 2))
+            try:
+                drain()
+            except Exception as e:
+                logger.error(f"Draining admission applications failed: {e}", exc_info=True)
+            finally:
+                close_old_connections()
+
+
+_drainer = _Drainer()
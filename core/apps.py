@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        import cloudinary
+        from django.conf import settings
+
+        from . import signals, search, stats, results, reference, facets, navigation  # noqa: F401
+
+        cloudinary.config(**settings.CLOUDINARY)
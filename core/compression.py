@@ -0,0 +1,86 @@
+"""
+gzip/brotli helpers for ``core.middleware.CompressionMiddleware``.
+
+Brotli is optional: without the ``Brotli`` package only gzip is offered.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+def available_encodings():
+    """Encodings the server can produce, in order of preference."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def parse_accept_encoding(header):
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    accepted = {}
+    for item in header.split(','):
+        coding, *params = [part.strip() for part in item.split(';')]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+def negotiate_encoding(header, encodings=None):
+    """
+    Pick the best content coding for an Accept-Encoding header, or None to
+    send the body uncompressed.
+
+    Follows RFC 9110: ``q=0`` rules a coding out, ``*`` covers codings not
+    listed explicitly, and ties go to the server's preference order.
+    """
+    if not header:
+        return None
+    encodings = encodings or available_encodings()
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get('x-gzip') if encoding == 'gzip' else None)
+        if q is None:
+            q = wildcard
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(data, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    # wbits=31 produces a gzip container; mtime is left at 0 so equal input
+    # always gives equal output.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, level):
+    """Compress an iterable of bytes, flushing after each chunk so streamed
+    pages still reach the browser progressively."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
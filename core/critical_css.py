@@ -0,0 +1,312 @@
+"""
+Per-page critical CSS and a purged site stylesheet, built from output.css.
+
+``build_css`` collects the class candidates the templates and the Python
+code in ``core/`` use (the same token scan Tailwind runs over its
+sources) and keeps only the rules those classes need. The result is
+written to ``static/css/build/``:
+
+* ``site.<hash>.css``: every rule used anywhere, loaded asynchronously
+  and cached across pages;
+* ``critical/<page>.css``: the rules for the top of one page, inlined
+  into its ``<head>`` by the ``{% stylesheets %}`` tag. The page is
+  assembled in document order (base layout, blocks, includes) and the
+  markup is cut where its CSS would pass ``CRITICAL_CSS_MAX_BYTES``;
+* ``manifest.json``: maps page templates to their critical CSS.
+"""
+import glob
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.template import engines
+
+SOURCE_STYLESHEET = 'css/output.css'
+BUILD_DIR = 'css/build'
+MANIFEST = f'{BUILD_DIR}/manifest.json'
+
+TEMPLATE_REFERENCE_RE = re.compile(r'{%\s*(?:extends|include)\s+["\']([^"\']+)["\']')
+EXTENDS_RE = re.compile(r'{%\s*extends\s+["\']([^"\']+)["\']\s*%}')
+INCLUDE_RE = re.compile(r'{%\s*include\s+["\']([^"\']+)["\'][^%]*%}')
+BLOCK_RE = re.compile(r'{%\s*block\s+(\w+)\s*%}(.*?){%\s*endblock(?:\s+\1)?\s*%}', re.S)
+CANDIDATE_RE = re.compile(r'[^<>"\'`\s={}]+')
+CLASS_SELECTOR_RE = re.compile(r'\.((?:\\[0-9a-fA-F]{1,6} ?|\\.|[\w-])+)')
+ESCAPE_RE = re.compile(r'\\([0-9a-fA-F]{1,6} ?|.)')
+
+
+@dataclass
+class Rule:
+    """A style rule (``body``), a grouping at-rule such as @media
+    (``children``) or a statement at-rule such as @import (neither)."""
+    prelude: str
+    body: str = None
+    children: list = None
+
+
+def _strip_comments(css):
+    return re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+
+
+def parse(css):
+    """Parse a stylesheet into a tree of style rules and (nested) at-rules."""
+    css = _strip_comments(css)
+    position = 0
+
+    def parse_block():
+        nonlocal position
+        rules = []
+        start = position
+        while position < len(css):
+            char = css[position]
+            if char in '"\'':
+                position = css.index(char, position + 1) + 1
+                continue
+            if char == ';':
+                # Statement at-rule such as @import or @charset.
+                prelude = css[start:position].strip()
+                if prelude:
+                    rules.append(Rule(prelude))
+                position += 1
+                start = position
+            elif char == '{':
+                prelude = ' '.join(css[start:position].split())
+                position += 1
+                if prelude.startswith(('@media', '@supports', '@layer', '@container')):
+                    rules.append(Rule(prelude, children=parse_block()))
+                else:
+                    depth, body_start = 1, position
+                    while depth:
+                        if css[position] == '{':
+                            depth += 1
+                        elif css[position] == '}':
+                            depth -= 1
+                        position += 1
+                    rules.append(Rule(prelude, css[body_start:position - 1]))
+                start = position
+            elif char == '}':
+                position += 1
+                return rules
+            else:
+                position += 1
+        return rules
+
+    return parse_block()
+
+
+def _unescape(name):
+    def replace(match):
+        value = match.group(1)
+        if re.fullmatch(r'[0-9a-fA-F]{1,6} ?', value):
+            return chr(int(value.strip(), 16))
+        return value
+    return ESCAPE_RE.sub(replace, name)
+
+
+def selector_classes(selector):
+    return {_unescape(name) for name in CLASS_SELECTOR_RE.findall(selector)}
+
+
+def split_selectors(prelude):
+    """Split a selector list on commas outside parentheses."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(prelude[start:i].strip())
+            start = i + 1
+    parts.append(prelude[start:].strip())
+    return [part for part in parts if part]
+
+
+def purge(rules, used):
+    """Keep the rules whose selectors only need classes in ``used``."""
+    kept = []
+    for rule in rules:
+        if rule.children is not None:
+            children = purge(rule.children, used)
+            if children:
+                kept.append(Rule(rule.prelude, children=children))
+        elif rule.prelude.startswith('@'):
+            kept.append(rule)  # @font-face, @keyframes, @import, ...
+        else:
+            selectors = [s for s in split_selectors(rule.prelude) if selector_classes(s) <= used]
+            if selectors:
+                kept.append(Rule(', '.join(selectors), rule.body))
+    return kept
+
+
+def _drop_unused_keyframes(rules, css):
+    names = set(re.findall(r'animation(?:-name)?\s*:\s*([\w-]+)', css))
+    return [
+        rule for rule in rules
+        if not rule.prelude.startswith('@keyframes') or rule.prelude.split()[1] in names
+    ]
+
+
+def serialize(rules):
+    out = []
+    for rule in rules:
+        if rule.children is not None:
+            out.append(f'{rule.prelude}{{{serialize(rule.children)}}}')
+        elif rule.body is None:
+            out.append(f'{rule.prelude};')
+        else:
+            out.append(f"{rule.prelude}{{{' '.join(rule.body.split())}}}")
+    return ''.join(out)
+
+
+def render_css(rules, used):
+    kept = purge(rules, used)
+    css = serialize(kept)
+    return serialize(_drop_unused_keyframes(kept, css))
+
+
+def _read_template(name):
+    template = engines['django'].get_template(name)
+    with open(template.origin.name, encoding='utf-8') as f:
+        return f.read()
+
+
+def document_source(name, seen=()):
+    """
+    The markup of ``name`` in document order: its blocks substituted into
+    the templates it extends, and literal includes inlined.
+    """
+    if name in seen:
+        return ''
+    seen = (*seen, name)
+    source = _read_template(name)
+    parent = EXTENDS_RE.search(source)
+    if parent:
+        blocks = {block: body for block, body in BLOCK_RE.findall(source)}
+        source = BLOCK_RE.sub(
+            lambda match: blocks.get(match[1], match[2]), document_source(parent[1], seen),
+        )
+    return INCLUDE_RE.sub(lambda match: document_source(match[1], seen), source)
+
+
+def template_sources(name, seen=None):
+    """Source of ``name`` and of every template it extends or includes by literal name."""
+    seen = set() if seen is None else seen
+    if name in seen:
+        return []
+    seen.add(name)
+    source = _read_template(name)
+    sources = [source]
+    for reference in TEMPLATE_REFERENCE_RE.findall(source):
+        sources.extend(template_sources(reference, seen))
+    return sources
+
+
+def class_candidates(sources):
+    return {token for source in sources for token in CANDIDATE_RE.findall(source)}
+
+
+def python_sources():
+    """Source of the Python modules in core/, which set classes on widgets and in views."""
+    sources = []
+    for path in sorted(glob.glob(os.path.join(settings.BASE_DIR, 'core', '**', '*.py'), recursive=True)):
+        with open(path, encoding='utf-8') as f:
+            sources.append(f.read())
+    return sources
+
+
+def critical_markup(rules, markup, max_bytes):
+    """The CSS for the longest start of ``markup`` whose CSS fits in ``max_bytes``."""
+    css = render_css(rules, class_candidates([markup]))
+    if len(css.encode()) <= max_bytes:
+        return css
+    # More markup never needs less CSS, so search for the cut point.
+    low, high, css = 0, len(markup), ''
+    while low < high:
+        middle = (low + high + 1) // 2
+        candidate = render_css(rules, class_candidates([markup[:middle]]))
+        if len(candidate.encode()) <= max_bytes:
+            low, css = middle, candidate
+        else:
+            high = middle - 1
+    return css
+
+
+def page_templates(directory=None):
+    """Top-level templates in templates/; components/ and admin/ hold fragments."""
+    directory = directory or os.path.join(settings.BASE_DIR, 'templates')
+    return sorted(
+        name for name in os.listdir(directory)
+        if name.endswith('.html') and name != 'base.html'
+    )
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def build(static_dir=None):
+    """Write the purged stylesheet, per-page critical CSS and manifest; return the manifest."""
+    static_dir = static_dir or os.path.join(settings.BASE_DIR, 'static')
+    with open(os.path.join(static_dir, SOURCE_STYLESHEET), encoding='utf-8') as f:
+        source = f.read()
+    rules = parse(source)
+
+    pages = page_templates()
+    used = class_candidates(python_sources())
+    for page in pages:
+        used |= class_candidates(template_sources(page))
+    site_css = render_css(rules, used)
+    digest = hashlib.sha256(site_css.encode()).hexdigest()[:12]
+    stylesheet = f'{BUILD_DIR}/site.{digest}.css'
+
+    build_dir = os.path.join(static_dir, BUILD_DIR)
+    for stale in os.listdir(build_dir) if os.path.isdir(build_dir) else []:
+        if stale.startswith('site.') and stale.endswith('.css'):
+            os.remove(os.path.join(build_dir, stale))
+    _write(os.path.join(static_dir, stylesheet), site_css)
+
+    manifest = {
+        'source_bytes': len(source.encode()),
+        'stylesheet': stylesheet,
+        'stylesheet_bytes': len(site_css.encode()),
+        'pages': {},
+    }
+    max_bytes = getattr(settings, 'CRITICAL_CSS_MAX_BYTES', 14 * 1024)
+    for page in pages:
+        critical = critical_markup(rules, document_source(page), max_bytes)
+        path = f"{BUILD_DIR}/critical/{page.replace('/', '-').removesuffix('.html')}.css"
+        _write(os.path.join(static_dir, path), critical)
+        manifest['pages'][page] = {'critical': path, 'critical_bytes': len(critical.encode())}
+    _write(os.path.join(static_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True))
+    load_manifest.cache_clear()
+    critical_css.cache_clear()
+    return manifest
+
+
+@lru_cache(maxsize=None)
+def load_manifest():
+    path = finders.find(MANIFEST)
+    if not path:
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def critical_css(template_name):
+    manifest = load_manifest()
+    page = manifest and manifest['pages'].get(template_name)
+    if not page:
+        return None
+    path = finders.find(page['critical'])
+    if not path:
+        return None
+    with open(path, encoding='utf-8') as f:
+        return f.read()
@@ -0,0 +1,94 @@
+"""
+Streaming CSV/JSONL export of any core model.
+
+Rows are read with ``values_list(...).iterator(chunk_size)`` (a server-side
+cursor on PostgreSQL, fetchmany on SQLite) and encoded one at a time, so
+memory stays flat however large the table. Foreign keys are exported as
+their id plus a label column fetched through a join (``department`` is
+the department's name), so reports need no second lookup.
+"""
+import csv
+import datetime
+import decimal
+import json
+
+from cloudinary import CloudinaryResource
+from django.db import models
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+CHUNK_SIZE = 2000
+
+# Internal columns that mean nothing outside the site.
+EXCLUDED_FIELDS = {'navigation', 'search_key', 'submission_hash'}
+
+# Tried in order for the label column of a foreign key.
+LABEL_FIELDS = ('name', 'title', 'reference', 'question')
+
+
+def columns(model):
+    """``(header, lookup)`` pairs for every exported column of ``model``."""
+    result = []
+    for field in model._meta.concrete_fields:
+        if field.name in EXCLUDED_FIELDS:
+            continue
+        if isinstance(field, models.ForeignKey):
+            result.append((field.attname, field.attname))
+            related = field.related_model._meta
+            label = next((name for name in LABEL_FIELDS if any(f.name == name for f in related.concrete_fields)), None)
+            if label:
+                result.append((field.name, f'{field.name}__{label}'))
+        else:
+            result.append((field.name, field.name))
+    return result
+
+
+def _plain(value):
+    if isinstance(value, CloudinaryResource):
+        return value.url
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+def rows(queryset, chunk_size=CHUNK_SIZE):
+    """The header and a generator of plain-value rows for ``queryset``."""
+    spec = columns(queryset.model)
+    lookups = [lookup for _, lookup in spec]
+    values = queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+    return [header for header, _ in spec], ([_plain(v) for v in row] for row in values)
+
+
+class _Line:
+    """File-like target for csv.writer that hands back what it was given."""
+
+    def write(self, value):
+        return value
+
+
+def encode(queryset, format, chunk_size=CHUNK_SIZE):
+    """Yield the export of ``queryset`` as encoded ``format`` lines."""
+    header, data = rows(queryset, chunk_size)
+    if format == 'csv':
+        writer = csv.writer(_Line())
+        # The BOM makes spreadsheet programs read the Bengali text as UTF-8.
+        yield '\ufeff'.encode() + writer.writerow(header).encode()
+        for row in data:
+            yield writer.writerow([
+                json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+                for value in row
+            ]).encode()
+    elif format == 'jsonl':
+        for row in data:
+            yield (json.dumps(dict(zip(header, row)), ensure_ascii=False) + '\n').encode()
+    else:
+        raise ValueError(f"Unknown export format '{format}'.")
+
+
+def filename(model, format):
+    return f"{model._meta.model_name}-{datetime.date.today():%Y-%m-%d}.{format}"
@@ -0,0 +1,201 @@
+"""
+Declarative facets for list views.
+
+A facet is a query parameter that narrows a list to one value of a field
+(``?category=exam``). ``FacetedListMixin`` validates every facet parameter
+in one place, applies the filters and gives templates each facet's options
+with the number of rows each would show.
+
+The counts for all facets come from one GROUP BY over the facet fields of
+the list before any facet is applied; each facet's counts then apply the
+other facets' selections in Python, so every option shows what picking it
+would leave. Those grouped rows don't depend on the selection, so they are
+cached per query (search terms included) and dropped on ``content_changed``
+through a version shared by the workers (core.reference).
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import transaction
+from django.db.models import Count
+from django.dispatch import receiver
+
+from . import reference
+from .middleware import record_cache
+from .signals import content_changed
+
+logger = logging.getLogger(__name__)
+
+
+class Facet:
+    """Filter ``field`` by the ``param`` query parameter, one of ``choices``."""
+
+    def __init__(self, param, field=None, choices=(), name=None, label=''):
+        self.param = param
+        self.field = field or param
+        self._choices = choices
+        self.name = name or param
+        self.label = label
+
+    def choices(self):
+        """``(value, label)`` pairs, value being what the URL carries."""
+        return self._choices
+
+    def parse(self, raw):
+        """The URL value for ``raw``; ValueError if it is not a choice."""
+        if raw not in dict(self.choices()):
+            raise ValueError(f"Invalid {self.name}.")
+        return raw
+
+    def to_db(self, value):
+        return value
+
+    def from_db(self, value):
+        return value
+
+
+class DepartmentFacet(Facet):
+    """Departments by slug (or id), resolved from the in-memory list in core.reference."""
+
+    def __init__(self, param='department', field='department_id', name='department', label='বিভাগ'):
+        super().__init__(param, field, name=name, label=label)
+
+    def choices(self):
+        return [(department.slug, department.name) for department in reference.departments()]
+
+    def parse(self, raw):
+        department_id = reference.department_id(raw)
+        if department_id is None:
+            raise ValueError(f"Invalid {self.name}.")
+        return self.from_db(department_id)
+
+    def to_db(self, value):
+        return reference.department_id(value)
+
+    def from_db(self, value):
+        for department in reference.departments():
+            if department.id == value:
+                return department.slug
+        return None
+
+
+def _version_kind(model):
+    return f'facets.{model._meta.label_lower}'
+
+
+def grouped_counts(queryset, facets):
+    """``[(values, count)]`` for every combination of the facet fields in ``queryset``."""
+    fields = [facet.field for facet in facets]
+    model = queryset.model
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        # e.g. a search that matched nothing (pk__in=[]): every count is zero.
+        return []
+    cache = caches[getattr(settings, 'FACET_CACHE_ALIAS', 'default')]
+    query = hashlib.sha1(f'{sql}|{params!r}'.encode()).hexdigest()
+    key = f'facets:{model._meta.label_lower}:{reference.current_version(_version_kind(model))}:{query}'
+    rows = cache.get(key)
+    record_cache(rows is not None)
+    if rows is None:
+        grouped = queryset.order_by().values_list(*fields).annotate(n=Count('pk'))
+        rows = [
+            (tuple(facet.from_db(value) for facet, value in zip(facets, row[:-1])), row[-1])
+            for row in grouped
+        ]
+        cache.set(key, rows, getattr(settings, 'FACET_CACHE_TIMEOUT', 300))
+    return rows
+
+
+def facet_lists(request, queryset, facets, selection):
+    """Template-ready options with counts for each facet, keyed by parameter."""
+    rows = grouped_counts(queryset, facets)
+    params = request.GET.copy()
+    params.pop('page', None)
+
+    def url(param, value):
+        query = params.copy()
+        if value is None:
+            query.pop(param, None)
+        else:
+            query[param] = value
+        return f'?{query.urlencode()}'
+
+    lists = {}
+    for i, facet in enumerate(facets):
+        counts, total = {}, 0
+        for values, n in rows:
+            if all(
+                values[j] == selection[other.param]
+                for j, other in enumerate(facets) if j != i and other.param in selection
+            ):
+                counts[values[i]] = counts.get(values[i], 0) + n
+                total += n
+        selected = selection.get(facet.param)
+        lists[facet.param] = {
+            'param': facet.param,
+            'label': facet.label,
+            'selected': selected,
+            'total': total,
+            'all_url': url(facet.param, None),
+            'options': [
+                {
+                    'value': value,
+                    'label': label,
+                    'count': counts.get(value, 0),
+                    'selected': value == selected,
+                    'url': url(facet.param, value),
+                }
+                for value, label in facet.choices()
+            ],
+        }
+    return lists
+
+
+class FacetedListMixin:
+    """
+    ListView filtering by ``facets``.
+
+    Call ``apply_facets(queryset)`` from ``get_queryset`` once the other
+    filters (search) are applied. An invalid parameter adds a warning and
+    raises ValueError. The context gets ``facets``, the output of
+    ``facet_lists``.
+    """
+    facets = ()
+
+    def apply_facets(self, queryset):
+        self.facet_base = queryset
+        self.facet_selection = {}
+        for facet in self.facets:
+            raw = self.request.GET.get(facet.param, '').strip()
+            if not raw:
+                continue
+            try:
+                value = facet.parse(raw)
+            except ValueError:
+                messages.warning(self.request, f"Invalid {facet.name} selected.")
+                raise
+            self.facet_selection[facet.param] = value
+            queryset = queryset.filter(**{facet.field: facet.to_db(value)})
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['facets'] = {}
+        base = getattr(self, 'facet_base', None)
+        if base is not None:
+            try:
+                context['facets'] = facet_lists(self.request, base, self.facets, self.facet_selection)
+            except Exception as e:
+                logger.error(f"Error in {type(self).__name__} facet counts: {e}", exc_info=True)
+        return context
+
+
+@receiver(content_changed)
+def invalidate_counts(sender, **kwargs):
+    kind = _version_kind(sender)
+    transaction.on_commit(lambda: reference.bump(kind))
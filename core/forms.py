@@ -0,0 +1,63 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from .models import AdmissionApplication, Program
+
+INPUT_CLASSES = 'w-full px-4 py-2 border border-gray-300 rounded focus:outline-none focus:border-primary'
+
+
+class AdmissionApplicationForm(forms.ModelForm):
+    class Meta:
+        model = AdmissionApplication
+        fields = [
+            'program', 'applicant_name', 'father_name', 'mother_name', 'date_of_birth',
+            'phone', 'email', 'ssc_roll', 'ssc_board', 'ssc_year', 'ssc_gpa',
+        ]
+        labels = {
+            'program': 'প্রোগ্রাম',
+            'applicant_name': 'আবেদনকারীর নাম',
+            'father_name': 'পিতার নাম',
+            'mother_name': 'মাতার নাম',
+            'date_of_birth': 'জন্ম তারিখ',
+            'phone': 'মোবাইল নম্বর',
+            'email': 'ইমেইল',
+            'ssc_roll': 'এসএসসি রোল',
+            'ssc_board': 'বোর্ড',
+            'ssc_year': 'পাসের সাল',
+            'ssc_gpa': 'জিপিএ',
+        }
+        widgets = {
+            'date_of_birth': forms.DateInput(attrs={'type': 'date'}),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['program'].queryset = Program.objects.order_by('level', 'name')
+        for field in self.fields.values():
+            field.widget.attrs['class'] = INPUT_CLASSES
+
+    def clean_phone(self):
+        phone = self.cleaned_data['phone'].replace(' ', '').replace('-', '')
+        if not phone.lstrip('+').isdigit() or not 10 <= len(phone.lstrip('+')) <= 14:
+            raise ValidationError("Enter a valid mobile number.")
+        return phone
+
+    def clean_ssc_roll(self):
+        roll = self.cleaned_data['ssc_roll'].strip()
+        if not roll.isdigit():
+            raise ValidationError("The SSC roll should contain digits only.")
+        return roll
+
+    def clean_ssc_year(self):
+        year = self.cleaned_data['ssc_year']
+        current = timezone.now().year
+        if not current - 5 <= year <= current:
+            raise ValidationError(f"The SSC year must be between {current - 5} and {current}.")
+        return year
+
+    def clean_ssc_gpa(self):
+        gpa = self.cleaned_data['ssc_gpa']
+        if not 1 <= gpa <= 5:
+            raise ValidationError("GPA must be between 1.00 and 5.00.")
+        return gpa
@@ -0,0 +1,165 @@
+"""
+Bulk gallery import from a ZIP archive or a folder of images.
+
+Each image is decoded, rotated according to its EXIF orientation,
+downscaled and re-encoded, then uploaded to Cloudinary with its gallery
+thumbnail generated eagerly. Both steps run on a bounded thread pool
+(Pillow and the HTTP upload release the GIL). Uploaded images are then
+written to ``Gallery`` with one ``bulk_create``. A file that fails is
+reported and skipped; the rest of the batch carries on.
+"""
+import io
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from cloudinary import uploader
+from django.conf import settings
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import Gallery
+from .signals import content_changed
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.tif', '.tiff')
+
+# Longest side of the stored original; larger photos are scaled down.
+MAX_DIMENSION = getattr(settings, 'GALLERY_IMPORT_MAX_DIMENSION', 2560)
+JPEG_QUALITY = 85
+# Size the gallery grid displays, generated at upload time.
+THUMBNAIL = {'width': 600, 'height': 450, 'crop': 'fill', 'gravity': 'auto'}
+UPLOAD_FOLDER = 'gallery'
+UPLOAD_RETRIES = 3
+
+
+@dataclass
+class ImportResult:
+    created: list = field(default_factory=list)
+    failed: list = field(default_factory=list)  # (file name, error message)
+
+
+def iter_sources(source):
+    """
+    Yield ``(name, read)`` for every image in ``source``: a directory path,
+    a ZIP path or an open ZIP file. ``read()`` returns the file's bytes.
+    """
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(IMAGE_EXTENSIONS) and not name.startswith('.'):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, source), lambda path=path: open(path, 'rb').read()
+        return
+    archive = zipfile.ZipFile(source)
+    for info in archive.infolist():
+        base = os.path.basename(info.filename)
+        # Skip folders and the resource forks macOS adds to archives.
+        if info.is_dir() or base.startswith('.') or '__MACOSX/' in info.filename:
+            continue
+        if base.lower().endswith(IMAGE_EXTENSIONS):
+            yield info.filename, lambda info=info: archive.read(info)
+
+
+def prepare_image(data, max_dimension=MAX_DIMENSION):
+    """Return ``(bytes, format)`` for an upright, downscaled copy without EXIF data."""
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            image.save(output, 'PNG', optimize=True)
+            return output.getvalue(), 'png'
+        image.convert('RGB').save(output, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+        return output.getvalue(), 'jpg'
+
+
+def upload_image(data, retries=UPLOAD_RETRIES):
+    """Upload to Cloudinary, retrying transient failures with backoff."""
+    for attempt in range(retries + 1):
+        try:
+            return uploader.upload_resource(
+                io.BytesIO(data), folder=UPLOAD_FOLDER, resource_type='image', eager=[THUMBNAIL],
+            )
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(2 ** attempt)
+
+
+def title_for(name, title=None):
+    if title:
+        return title[:100]
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return stem.replace('_', ' ').replace('-', ' ').strip()[:100] or None
+
+
+def _process(name, data, category, title, max_dimension):
+    prepared, _ = prepare_image(data, max_dimension)
+    resource = upload_image(prepared)
+    return Gallery(title=title_for(name, title), image=resource, category=category)
+
+
+def import_gallery(source, category, title=None, workers=4, max_dimension=MAX_DIMENSION, progress=None):
+    """
+    Import every image in ``source`` into ``category``.
+
+    ``progress(done, total, name, error)`` is called as each file finishes;
+    ``total`` is None until every file has been queued. At most
+    ``2 * workers`` files are held in memory at once.
+    """
+    if category not in dict(Gallery.CATEGORY_CHOICES):
+        raise ValueError(f"Unknown gallery category: {category}")
+
+    result = ImportResult()
+    pending = {}
+    finished = []
+    done = 0
+    total = None
+
+    def collect(futures):
+        nonlocal done
+        for future in futures:
+            index, name = pending.pop(future)
+            error = None
+            try:
+                finished.append((index, future.result()))
+            except UnidentifiedImageError:
+                error = "not a readable image"
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+            if error:
+                result.failed.append((name, error))
+            done += 1
+            if progress:
+                progress(done, total, name, error)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        seen = 0
+        for name, read in iter_sources(source):
+            seen += 1
+            if len(pending) >= 2 * workers:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+            try:
+                data = read()
+            except Exception as e:
+                result.failed.append((name, str(e)))
+                done += 1
+                if progress:
+                    progress(done, None, name, str(e))
+                continue
+            pending[pool.submit(_process, name, data, category, title, max_dimension)] = (seen, name)
+        total = seen
+        while pending:
+            collect(wait(pending, return_when=FIRST_COMPLETED).done)
+
+    # Keep the source order rather than the order uploads happened to finish.
+    images = [image for _, image in sorted(finished, key=lambda item: item[0])]
+    if images:
+        with transaction.atomic():
+            result.created = Gallery.objects.bulk_create(images, batch_size=500)
+            pks = [image.pk for image in result.created]
+            transaction.on_commit(lambda: content_changed.send(sender=Gallery, pks=pks))
+    return result
@@ -0,0 +1,236 @@
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.urls import URLPattern
+
+from core import urls as core_urls
+
+# Routes that are not public pages.
+SKIPPED_ROUTES = {'metrics', 'ready', 'throttle_dashboard'}
+
+# Regressions smaller than this are treated as timer noise.
+NOISE_FLOOR_MS = 2.0
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return None
+    rank = max(0, min(len(values) - 1, round(pct / 100 * len(values) + 0.5) - 1))
+    return values[rank]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every public route in core/urls.py with concurrent clients through the "
+        "WSGI handler and report throughput and p50/p95/p99 latency per view."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per route.")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--warmup', type=int, default=5, help="Untimed requests per route.")
+        parser.add_argument('--routes', nargs='*', help="Only these route names, e.g. notices faculty.")
+        parser.add_argument(
+            '--output', default=os.path.join(settings.BASE_DIR, '.benchmarks', 'latest.json'),
+        )
+        parser.add_argument(
+            '--baseline', default=os.path.join(settings.BASE_DIR, '.benchmarks', 'baseline.json'),
+            help="Fail when p95 latency regresses past this stored run.",
+        )
+        parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline.")
+        parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed p95 regression (0.25 = 25%%).")
+        parser.add_argument('--header', action='append', default=[], help="Extra request header, e.g. 'Accept-Encoding: gzip'.")
+
+    def handle(self, *args, **options):
+        # Per-request log lines would drown the report.
+        logging.getLogger('core.performance').disabled = True
+        self.handler = WSGIHandler()
+        self.headers = self.parse_headers(options['header'])
+
+        results = {}
+        for name, paths in self.targets(options['routes']):
+            results[name] = self.run_route(paths, options['requests'], options['concurrency'], options['warmup'])
+            self.print_row(name, results[name])
+
+        report = {
+            'created': datetime.now(dt_timezone.utc).isoformat(),
+            'database': connections['default'].vendor,
+            'streaming': getattr(settings, 'STREAMING_RESPONSES', False),
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'routes': results,
+        }
+        self.write_json(options['output'], report)
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if options['save_baseline']:
+            self.write_json(options['baseline'], report)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+        elif os.path.exists(options['baseline']):
+            self.compare(report, options['baseline'], options['tolerance'])
+
+    def parse_headers(self, raw_headers):
+        headers = {}
+        for raw in raw_headers:
+            name, _, value = raw.partition(':')
+            headers['HTTP_' + name.strip().upper().replace('-', '_')] = value.strip()
+        return headers
+
+    def targets(self, only):
+        """Yield ``(route name, [paths])`` for each benchmarked route."""
+        for pattern in core_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            route = str(pattern.pattern)
+            if pattern.name in SKIPPED_ROUTES or '#' in route or (only and pattern.name not in only):
+                continue
+            view_class = getattr(pattern.callback, 'view_class', None)
+            if hasattr(view_class, 'benchmark_paths'):
+                # Views that need query parameters supply their own sample requests.
+                paths = view_class.benchmark_paths()
+                if paths:
+                    yield pattern.name, paths
+                else:
+                    self.stdout.write(self.style.WARNING(f"Skipping {pattern.name}: no sample requests"))
+                continue
+            if '<slug:slug>' not in route:
+                yield pattern.name, ['/' + route]
+                continue
+            model = getattr(view_class, 'model', None)
+            slugs = list(model.objects.values_list('slug', flat=True)[:50]) if model else []
+            if not slugs:
+                self.stdout.write(self.style.WARNING(f"Skipping {pattern.name}: no rows to request"))
+                continue
+            yield pattern.name, ['/' + route.replace('<slug:slug>', slug) for slug in slugs]
+
+    def request(self, path):
+        path, _, query = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'SCRIPT_NAME': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+            **self.headers,
+        }
+        status = []
+        started = time.perf_counter()
+        body = self.handler(environ, lambda s, headers, exc_info=None: status.append(s))
+        ttfb = None
+        size = 0
+        try:
+            for chunk in body:
+                if ttfb is None and chunk:
+                    ttfb = time.perf_counter() - started
+                size += len(chunk)
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+        elapsed = time.perf_counter() - started
+        return int(status[0].split()[0]), elapsed, ttfb if ttfb is not None else elapsed, size
+
+    def run_route(self, paths, total, concurrency, warmup):
+        for i in range(warmup):
+            self.request(paths[i % len(paths)])
+
+        latencies, ttfbs, errors, sizes = [], [], [], []
+        counter = iter(range(total))
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        i = next(counter, None)
+                    if i is None:
+                        return
+                    status, elapsed, ttfb, size = self.request(paths[i % len(paths)])
+                    with lock:
+                        latencies.append(elapsed)
+                        ttfbs.append(ttfb)
+                        sizes.append(size)
+                        if status >= 400:
+                            errors.append(status)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        latencies.sort()
+        ttfbs.sort()
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            'path': paths[0],
+            'requests': len(latencies),
+            'errors': len(errors),
+            'throughput_rps': round(len(latencies) / wall, 1) if wall else None,
+            'p50_ms': ms(percentile(latencies, 50)),
+            'p95_ms': ms(percentile(latencies, 95)),
+            'p99_ms': ms(percentile(latencies, 99)),
+            'ttfb_p50_ms': ms(percentile(ttfbs, 50)),
+            'ttfb_p95_ms': ms(percentile(ttfbs, 95)),
+            'avg_bytes': round(sum(sizes) / len(sizes)) if sizes else 0,
+        }
+
+    def print_row(self, name, result):
+        line = (
+            f"{name:<20} {result['throughput_rps']:>8} req/s  "
+            f"p50 {result['p50_ms']:>8} ms  p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  "
+            f"ttfb p50 {result['ttfb_p50_ms']:>8} ms"
+        )
+        if result['errors']:
+            line += f"  ({result['errors']} errors)"
+            self.stdout.write(self.style.WARNING(line))
+        else:
+            self.stdout.write(line)
+
+    def write_json(self, path, data):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def compare(self, report, baseline_path, tolerance):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        regressions = []
+        for name, result in report['routes'].items():
+            before = baseline.get('routes', {}).get(name)
+            if not before or before.get('p95_ms') is None or result['p95_ms'] is None:
+                continue
+            limit = before['p95_ms'] * (1 + tolerance)
+            if result['p95_ms'] > limit and result['p95_ms'] - before['p95_ms'] > NOISE_FLOOR_MS:
+                regressions.append(f"{name}: p95 {before['p95_ms']} ms -> {result['p95_ms']} ms")
+        if regressions:
+            raise CommandError("Latency regressed past the baseline:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
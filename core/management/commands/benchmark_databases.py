@@ -0,0 +1,176 @@
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+import dj_database_url
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.db.models import F
+
+from core.models import Faculty, Notice
+
+from .benchmark import percentile
+
+# (name, reader threads, writer threads) as a multiple of --threads.
+MIXES = {
+    'read': (1, 0),
+    'mixed': (1, 1),
+    'write': (0, 1),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare database backends under concurrent reads and writes: notice lists and "
+        "lookups, faculty by department (a join) and single-row notice updates. Each "
+        "database must be migrated and seeded (seed_scale) with comparable data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', action='append', default=[],
+            help="Alias from DATABASES to include (default: default).",
+        )
+        parser.add_argument(
+            '--url', action='append', default=[], metavar='NAME=URL',
+            help="Extra database to include, e.g. pg=postgres://localhost/dgc.",
+        )
+        parser.add_argument('--mix', action='append', choices=sorted(MIXES), help="Only these workloads.")
+        parser.add_argument('--threads', type=int, default=4, help="Reader and writer threads each.")
+        parser.add_argument('--seconds', type=float, default=10.0, help="Duration of each workload.")
+        parser.add_argument(
+            '--output', default=os.path.join(settings.BASE_DIR, '.benchmarks', 'databases.json'),
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['database'] or [DEFAULT_DB_ALIAS]
+        for item in options['url']:
+            name, sep, url = item.partition('=')
+            if not sep or name in connections:
+                raise CommandError(f"--url takes a new NAME=URL, not '{item}'.")
+            config = dj_database_url.parse(url)
+            connections.settings[name] = connections.configure_settings({DEFAULT_DB_ALIAS: {}, name: config})[name]
+            aliases.append(name)
+
+        samples = {alias: self.samples(alias) for alias in aliases}
+        mixes = options['mix'] or list(MIXES)
+        results = {}
+        for mix in mixes:
+            readers, writers = (n * options['threads'] for n in MIXES[mix])
+            self.stdout.write(f"\n{mix}: {readers} readers, {writers} writers, {options['seconds']:g}s")
+            for alias in aliases:
+                result = self.run(alias, samples[alias], readers, writers, options['seconds'])
+                results.setdefault(mix, {})[alias] = result
+                self.print_row(alias, result)
+            self.print_winner(results[mix])
+
+        report = {
+            'created': datetime.now(dt_timezone.utc).isoformat(),
+            'threads': options['threads'],
+            'seconds': options['seconds'],
+            'databases': {alias: connections[alias].vendor for alias in aliases},
+            'mixes': results,
+        }
+        os.makedirs(os.path.dirname(options['output']), exist_ok=True)
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(f"\nResults written to {options['output']}")
+
+    def samples(self, alias):
+        notices = list(Notice.objects.using(alias).values_list('pk', 'slug', 'category')[:5000])
+        departments = list(
+            Faculty.objects.using(alias).order_by().values_list('department_id', flat=True).distinct()[:100]
+        )
+        if not notices:
+            raise CommandError(f"'{alias}' has no notices; migrate and seed it first (seed_scale).")
+        return {'notices': notices, 'departments': departments}
+
+    def read(self, alias, sample, rng):
+        pk, slug, category = rng.choice(sample['notices'])
+        choice = rng.randrange(4)
+        if choice == 0:
+            list(Notice.objects.using(alias).only('title', 'slug', 'publish_date', 'category')
+                 .filter(category=category).order_by('-publish_date', '-id')[:20])
+        elif choice == 1:
+            Notice.objects.using(alias).get(slug=slug)
+        elif choice == 2 and sample['departments']:
+            list(Faculty.objects.using(alias).select_related('department')
+                 .filter(department_id=rng.choice(sample['departments'])).order_by('name')[:20])
+        else:
+            Notice.objects.using(alias).filter(category=category).count()
+
+    def write(self, alias, sample, rng):
+        pk = rng.choice(sample['notices'])[0]
+        # A real row write that leaves the data as it was; update() sends no signals.
+        with transaction.atomic(using=alias):
+            Notice.objects.using(alias).filter(pk=pk).update(is_important=F('is_important'))
+
+    def run(self, alias, sample, readers, writers, seconds):
+        latencies = {'read': [], 'write': []}
+        errors = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def worker(kind, seed):
+            rng = random.Random(seed)
+            operation = self.read if kind == 'read' else self.write
+            done = []
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        operation(alias, sample, rng)
+                    except DatabaseError as e:
+                        with lock:
+                            errors.append(str(e))
+                        continue
+                    done.append(time.perf_counter() - started)
+            finally:
+                connections[alias].close()
+                with lock:
+                    latencies[kind].extend(done)
+
+        threads = [threading.Thread(target=worker, args=('read', i)) for i in range(readers)]
+        threads += [threading.Thread(target=worker, args=('write', -i - 1)) for i in range(writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        def ms(value):
+            return None if value is None else round(value * 1000, 2)
+
+        result = {'errors': len(errors), 'first_error': errors[0] if errors else None}
+        for kind, values in latencies.items():
+            values.sort()
+            result[f'{kind}s_per_s'] = round(len(values) / wall, 1)
+            result[f'{kind}_p50_ms'] = ms(percentile(values, 50))
+            result[f'{kind}_p95_ms'] = ms(percentile(values, 95))
+        return result
+
+    def print_row(self, alias, result):
+        def cell(value):
+            return '-' if value is None else f'{value:g}'
+
+        self.stdout.write(
+            f"  {alias:<12} reads/s {cell(result['reads_per_s']):>8}  p95 {cell(result['read_p95_ms']):>7}ms   "
+            f"writes/s {cell(result['writes_per_s']):>8}  p95 {cell(result['write_p95_ms']):>7}ms   "
+            f"errors {result['errors']}"
+        )
+        if result['first_error']:
+            self.stdout.write(self.style.WARNING(f"    {result['first_error']}"))
+
+    def print_winner(self, results):
+        if len(results) < 2:
+            return
+        for kind in ('reads', 'writes'):
+            rates = {alias: result[f'{kind}_per_s'] for alias, result in results.items() if result[f'{kind}_per_s']}
+            if rates:
+                best = max(rates, key=rates.get)
+                self.stdout.write(self.style.SUCCESS(f"  {kind}: {best} ({rates[best]:g}/s)"))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from core.critical_css import build
+
+
+class Command(BaseCommand):
+    help = (
+        "Purge static/css/output.css down to the classes the templates use and write "
+        "per-page critical CSS to static/css/build/."
+    )
+
+    def handle(self, *args, **options):
+        manifest = build()
+        source = manifest['source_bytes']
+
+        self.stdout.write(f"{'page':<24} {'critical':>10} {'saved':>10}")
+        for page, entry in sorted(manifest['pages'].items()):
+            critical = entry['critical_bytes']
+            self.stdout.write(
+                f"{page:<24} {critical:>10,} {source - critical:>10,}  ({1 - critical / source:.0%} of output.css)"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Site stylesheet {manifest['stylesheet']}: {manifest['stylesheet_bytes']:,} bytes "
+            f"(output.css is {source:,})"
+        ))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.admissions import drain
+
+
+class Command(BaseCommand):
+    help = (
+        "Write spooled admission applications to the database in batched transactions. "
+        "Use --loop to run as a background worker when ADMISSION_DRAIN_IN_PROCESS is off."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep draining until interrupted.")
+        parser.add_argument('--interval', type=float, default=2, help="Seconds between drains with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            created, duplicates = drain()
+            if created or duplicates or not options['loop']:
+                self.stdout.write(f"Saved {created} applications, skipped {duplicates} duplicates")
+            if not options['loop']:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
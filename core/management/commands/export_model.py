@@ -0,0 +1,54 @@
+import sys
+
+from django.apps import apps
+from django.core.exceptions import FieldError, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from core.export import CHUNK_SIZE, FORMATS, encode
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a core model (e.g. 'notice') out as CSV or JSONL, optionally filtered with "
+        "--filter field=value, without loading the table into memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help="Model name, e.g. 'notice' or 'core.Notice'.")
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--output', help="File to write; standard output by default.")
+        parser.add_argument(
+            '--filter', action='append', default=[], metavar='FIELD=VALUE',
+            help="Queryset filter such as category=exam or publish_date__year=2024; repeatable.",
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        label = options['model'] if '.' in options['model'] else f"core.{options['model']}"
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError):
+            raise CommandError(f"Unknown model '{options['model']}'.")
+
+        filters = {}
+        for item in options['filter']:
+            field, sep, value = item.partition('=')
+            if not sep:
+                raise CommandError(f"Filters look like field=value, not '{item}'.")
+            filters[field] = value
+        try:
+            queryset = model._default_manager.filter(**filters).order_by('pk')
+            chunks = encode(queryset, options['format'], options['chunk_size'])
+            out = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+            try:
+                for chunk in chunks:
+                    out.write(chunk)
+            finally:
+                if options['output']:
+                    out.close()
+        except (FieldError, ValidationError, ValueError) as e:
+            raise CommandError(f"Invalid filter: {e}")
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(
+                f"Exported {model._meta.verbose_name_plural.lower()} to {options['output']}"
+            ))
@@ -0,0 +1,140 @@
+import csv
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from core.models import Alumnus, Department
+from core.normalization import search_key
+from core.search import analyze
+from core.signals import content_changed
+
+TEXT_COLUMNS = {'profession': 150, 'organization': 150, 'location': 100, 'bio': None}
+YEAR_COLUMNS = ('batch_year', 'batch', 'year')
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load alumni from a CSV with 'name' and 'batch_year' (or 'batch'/'year') columns and "
+        "optional 'department', 'roll', 'profession', 'organization', 'location', 'email' and 'bio'. "
+        "Rows with a roll update the alumnus of that batch and roll if it exists."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file')
+        parser.add_argument('--replace', action='store_true', help="Delete every existing alumnus first.")
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.departments = self.department_lookup()
+        # After --replace the whole search index is rebuilt once instead of per batch.
+        self.announce_batches = not options['replace']
+        batch, imported, errors, unknown_departments = [], 0, [], set()
+
+        with open(options['csv_file'], newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            columns = {name: name.strip().lower() for name in reader.fieldnames or []}
+            if 'name' not in columns.values() or not set(YEAR_COLUMNS) & set(columns.values()):
+                raise CommandError("The CSV needs a 'name' and a 'batch_year' column.")
+
+            with transaction.atomic():
+                if options['replace']:
+                    Alumnus.objects.all().delete()
+                for line, raw in enumerate(reader, start=2):
+                    row = {columns[k]: (v or '').strip() for k, v in raw.items() if k in columns}
+                    try:
+                        alumnus = self.build_alumnus(row, unknown_departments)
+                    except ValueError as e:
+                        errors.append(f"line {line}: {e}")
+                        continue
+                    batch.append(alumnus)
+                    if len(batch) >= options['batch_size']:
+                        imported += self.save(batch)
+                        batch = []
+                        self.stdout.write(f"  {imported:,} rows")
+                imported += self.save(batch)
+                if options['replace']:
+                    content_changed.send(sender=Alumnus, pks=None)
+                else:
+                    transaction.on_commit(analyze)
+
+        for error in errors[:20]:
+            self.stderr.write(self.style.WARNING(error))
+        if len(errors) > 20:
+            self.stderr.write(self.style.WARNING(f"... and {len(errors) - 20} more"))
+        if unknown_departments:
+            self.stderr.write(self.style.WARNING(
+                f"Unknown departments left empty: {', '.join(sorted(unknown_departments))}"
+            ))
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported:,} alumni ({len(errors)} rows skipped)"))
+
+    def department_lookup(self):
+        """Departments by name, code, slug and normalised name, so 'Physics', 'PHY' and 'পদার্থবিজ্ঞান' all match."""
+        lookup = {}
+        for department in Department.objects.only('id', 'name', 'code', 'slug'):
+            for key in (department.name, department.code, department.slug):
+                if key:
+                    lookup[key.casefold()] = department.pk
+            lookup.setdefault(search_key(department.name), department.pk)
+        return lookup
+
+    def build_alumnus(self, row, unknown_departments):
+        name = ' '.join(row.get('name', '').split())
+        if not name:
+            raise ValueError("missing name")
+        year = next((row[column] for column in YEAR_COLUMNS if row.get(column)), '')
+        if not year.isdigit() or not 1900 <= int(year) <= 2100:
+            raise ValueError(f"batch year '{year}' is not a year")
+
+        department_id = None
+        department = row.get('department', '')
+        if department:
+            department_id = self.departments.get(department.casefold()) or self.departments.get(search_key(department))
+            if department_id is None:
+                unknown_departments.add(department)
+
+        email = row.get('email', '')
+        if email:
+            try:
+                validate_email(email)
+            except ValidationError:
+                email = ''
+
+        alumnus = Alumnus(
+            name=name[:150], batch_year=int(year), department_id=department_id,
+            roll=row.get('roll', '')[:30], email=email, search_key=search_key(name),
+        )
+        for column, length in TEXT_COLUMNS.items():
+            value = row.get(column, '')
+            setattr(alumnus, column, value[:length] if length else value)
+        return alumnus
+
+    def save(self, batch):
+        """Update alumni already known by (batch year, roll) and create the rest."""
+        if not batch:
+            return 0
+        rolled = {(a.batch_year, a.roll): a for a in batch if a.roll}
+        existing = {
+            (year, roll): pk
+            for pk, year, roll in Alumnus.objects.filter(
+                batch_year__in={year for year, _ in rolled}, roll__in={roll for _, roll in rolled},
+            ).values_list('pk', 'batch_year', 'roll')
+        }
+        updates, creates = [], [a for a in batch if not a.roll]
+        for key, alumnus in rolled.items():
+            if key in existing:
+                alumnus.pk = existing[key]
+                updates.append(alumnus)
+            else:
+                creates.append(alumnus)
+        created = Alumnus.objects.bulk_create(creates)
+        Alumnus.objects.bulk_update(
+            updates,
+            ['name', 'department', 'email', 'search_key', *TEXT_COLUMNS],
+        )
+        if self.announce_batches:
+            # bulk writes skip post_save; the search index is updated on commit.
+            pks = [a.pk for a in created if a.pk is not None] + [a.pk for a in updates]
+            content_changed.send(sender=Alumnus, pks=pks)
+        return len(rolled) + sum(1 for a in batch if not a.roll)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.gallery_import import MAX_DIMENSION, import_gallery
+from core.models import Gallery
+
+
+class Command(BaseCommand):
+    help = (
+        "Import every image in a ZIP archive or folder into the gallery, processing "
+        "and uploading them in parallel."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="Path to a .zip file or a folder of images.")
+        parser.add_argument('--category', required=True, choices=[value for value, _ in Gallery.CATEGORY_CHOICES])
+        parser.add_argument('--title', help="Title for every image (defaults to the file name).")
+        parser.add_argument('--workers', type=int, default=4)
+        parser.add_argument('--max-dimension', type=int, default=MAX_DIMENSION)
+
+    def handle(self, *args, **options):
+        def progress(done, total, name, error):
+            position = f"[{done}/{total}]" if total else f"[{done}]"
+            if error:
+                self.stderr.write(self.style.WARNING(f"{position} {name}: {error}"))
+            elif options['verbosity'] > 0:
+                self.stdout.write(f"{position} {name}")
+
+        try:
+            result = import_gallery(
+                options['source'], options['category'], title=options['title'],
+                workers=options['workers'], max_dimension=options['max_dimension'], progress=progress,
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(e)
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(result.created)} images"))
+        if result.failed:
+            self.stdout.write(self.style.WARNING(f"{len(result.failed)} files failed:"))
+            for name, error in result.failed:
+                self.stdout.write(f"  {name}: {error}")
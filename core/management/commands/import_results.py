@@ -0,0 +1,112 @@
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.models import Exam, ExamResult
+from core.normalization import normalize_roll
+
+# Columns with a fixed meaning; every other column is a subject grade.
+FIXED_COLUMNS = ('roll', 'name', 'gpa', 'grade')
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load exam results from a CSV with a 'roll' column and optional 'name', 'gpa' and "
+        "'grade' columns. Any other column is stored as a subject grade. Re-importing a roll "
+        "overwrites it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file')
+        parser.add_argument('--exam', required=True, help="Slug of an existing exam, or the name of a new one.")
+        parser.add_argument('--year', type=int, help="Year for a new exam.")
+        parser.add_argument('--replace', action='store_true', help="Delete the exam's existing results first.")
+        parser.add_argument('--publish', action='store_true', help="Publish the exam once imported.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        exam = self.get_exam(options['exam'], options['year'])
+        # Keyed by roll: PostgreSQL rejects an upsert that touches a row twice.
+        batch, imported, errors = {}, 0, []
+
+        with open(options['csv_file'], newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or 'roll' not in [c.strip().lower() for c in reader.fieldnames]:
+                raise CommandError("The CSV needs a 'roll' column.")
+            columns = {name: name.strip().lower() for name in reader.fieldnames}
+
+            with transaction.atomic():
+                if options['replace']:
+                    exam.results.all().delete()
+                for line, raw in enumerate(reader, start=2):
+                    row = {columns[k]: (v or '').strip() for k, v in raw.items() if k in columns}
+                    try:
+                        result = self.build_result(exam, raw, columns, row)
+                    except ValueError as e:
+                        errors.append(f"line {line}: {e}")
+                        continue
+                    batch[result.roll] = result
+                    if len(batch) >= options['batch_size']:
+                        imported += self.save(batch.values())
+                        batch = {}
+                        self.stdout.write(f"  {imported:,} rows")
+                imported += self.save(batch.values())
+
+                exam.result_count = exam.results.count()
+                if options['publish']:
+                    exam.is_published = True
+                # Written even when the count and flag are unchanged: the
+                # save announces the change, which rebuilds the lookup index
+                # of a published exam on commit (core.results).
+                exam.save(update_fields=['result_count', 'is_published'])
+
+        for error in errors[:20]:
+            self.stderr.write(self.style.WARNING(error))
+        if len(errors) > 20:
+            self.stderr.write(self.style.WARNING(f"... and {len(errors) - 20} more"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported:,} results into {exam} ({len(errors)} rows skipped)"
+        ))
+
+    def get_exam(self, value, year):
+        exam = Exam.objects.filter(slug=value).first()
+        if exam:
+            return exam
+        if not year:
+            raise CommandError(f"No exam with slug '{value}'; pass --year to create it.")
+        return Exam.objects.create(name=value, year=year)
+
+    def build_result(self, exam, raw, columns, row):
+        roll = normalize_roll(row.get('roll', ''))
+        if not roll:
+            raise ValueError("missing roll")
+        if len(roll) > 20:
+            raise ValueError(f"roll '{roll}' is longer than 20 characters")
+        gpa = None
+        if row.get('gpa'):
+            try:
+                gpa = Decimal(row['gpa']).quantize(Decimal('0.01'))
+            except InvalidOperation:
+                raise ValueError(f"GPA '{row['gpa']}' is not a number")
+            if not 0 <= gpa <= 5:
+                raise ValueError(f"GPA {gpa} is out of range")
+        subjects = {
+            name.strip(): (value or '').strip()
+            for name, value in raw.items()
+            if name in columns and columns[name] not in FIXED_COLUMNS and (value or '').strip()
+        }
+        return ExamResult(
+            exam=exam, roll=roll, name=row.get('name', '')[:100], gpa=gpa,
+            grade=row.get('grade', '')[:4], subjects=subjects,
+        )
+
+    def save(self, results):
+        results = list(results)
+        if results:
+            ExamResult.objects.bulk_create(
+                results, update_conflicts=True, unique_fields=['exam', 'roll'],
+                update_fields=['name', 'gpa', 'grade', 'subjects'],
+            )
+        return len(results)
@@ -0,0 +1,275 @@
+import logging
+import os
+import re
+from contextlib import ExitStack
+
+from django.apps import apps
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import DatabaseError, connections, migrations, models
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+from django.test.utils import CaptureQueriesContext
+
+from core import urls as core_urls
+
+from .benchmark import Command as BenchmarkCommand
+
+# Literals and numbers, so the same query with other parameters is explained once.
+LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+def normalize(sql):
+    return LITERAL.sub('?', sql)
+
+
+def walk(node):
+    yield node
+    for child in node.get('Plans', ()):
+        yield from walk(child)
+
+
+def explain(connection, sql):
+    """``(scanned tables, used index names, sorts)`` of the plan for ``sql``."""
+    scans, used, sorted_ = set(), set(), False
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            for detail in (row[3] for row in cursor.fetchall()):
+                scan = re.match(r'SCAN (\w+)$', detail)
+                if scan:
+                    scans.add(scan[1])
+                index = re.search(r'USING (?:COVERING )?INDEX (\w+)', detail)
+                if index:
+                    used.add(index[1])
+                sorted_ = sorted_ or 'TEMP B-TREE FOR ORDER BY' in detail
+        elif connection.vendor == 'postgresql':
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+            for node in walk(cursor.fetchone()[0][0]['Plan']):
+                if node['Node Type'] == 'Seq Scan':
+                    scans.add(node['Relation Name'])
+                if 'Index Name' in node:
+                    used.add(node['Index Name'])
+                sorted_ = sorted_ or node['Node Type'] in ('Sort', 'Incremental Sort')
+        else:
+            raise DatabaseError(f"EXPLAIN is not supported on {connection.vendor}.")
+    return scans, used, sorted_
+
+
+def wanted_columns(sql, table):
+    """Columns of ``table`` an index should lead with for ``sql``: equality filters, then the ordering or a range."""
+    column = rf'"{table}"\."(\w+)"'
+    equal = re.findall(column + r' (?:= |IN \(|IS NULL)', sql)
+    ranged = re.findall(column + r' (?:[<>]=? |BETWEEN )', sql)
+    ordering = []
+    order_by = re.search(r' ORDER BY (.*?)(?: LIMIT | OFFSET |\)|$)', sql)
+    if order_by:
+        for name, direction in re.findall(column + r' (ASC|DESC)', order_by[1]):
+            ordering.append(('-' if direction == 'DESC' else '') + name)
+    result = []
+    for name in equal + (ordering or ranged[:1]):
+        if name.lstrip('-') not in {item.lstrip('-') for item in result}:
+            result.append(name)
+    return result
+
+
+class Command(BenchmarkCommand):
+    help = (
+        "Request every route in core/urls.py (and each facet filter), EXPLAIN the queries they "
+        "run on the current database (SQLite or PostgreSQL), and report table scans, sorts, "
+        "unused and redundant indexes, with suggested composite indexes. --migration writes "
+        "the suggestions as a migration to review."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--routes', nargs='*', help="Only these route names, e.g. notices faculty.")
+        parser.add_argument(
+            '--min-rows', type=int, default=1000,
+            help="Ignore scans of tables smaller than this; a scan is cheapest there.",
+        )
+        parser.add_argument('--migration', action='store_true', help="Write the advice as a core migration.")
+
+    def handle(self, *args, **options):
+        logging.getLogger('core.performance').disabled = True
+        self.handler = WSGIHandler()
+        self.headers = {}
+        tables = {model._meta.db_table: model for model in apps.get_app_config('core').get_models()}
+
+        queries = self.capture(options['routes'])
+        self.stdout.write(f"Captured {len(queries)} distinct SELECT statements.\n")
+
+        used, findings = set(), []
+        for (alias, _), (sql, routes) in queries.items():
+            try:
+                scans, indexes, sorted_ = explain(connections[alias], sql)
+            except DatabaseError as e:
+                self.stdout.write(self.style.WARNING(f"Could not explain a query of {', '.join(sorted(routes))}: {e}"))
+                continue
+            used |= indexes
+            from_table = re.search(r' FROM "(\w+)"', sql)
+            flagged = set(scans)
+            if sorted_ and from_table:
+                flagged.add(from_table[1])
+            for table in flagged & set(tables):
+                findings.append((table, sql, routes, table in scans))
+
+        suggestions = self.report_scans(tables, findings, options['min_rows'])
+        redundant = self.report_indexes(tables, used)
+
+        if options['migration'] and (suggestions or redundant):
+            self.write_migration(suggestions, redundant)
+
+    def capture(self, only):
+        """``{(alias, normalized sql): (sql, route names)}`` for the SELECTs the routes run."""
+        queries = {}
+        for name, paths in self.targets(only):
+            with ExitStack() as stack:
+                captured = {alias: stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections}
+                for path in paths[:3] + self.facet_paths(name, paths[0]):
+                    self.request(path)
+            for alias, context in captured.items():
+                for query in context.captured_queries:
+                    sql = query['sql']
+                    if not sql.lstrip().upper().startswith('SELECT'):
+                        continue
+                    entry = queries.setdefault((alias, normalize(sql)), (sql, set()))
+                    entry[1].add(name)
+        return queries
+
+    def facet_paths(self, name, path):
+        """The list at ``path`` narrowed by the first option of each of its facets."""
+        for pattern in core_urls.urlpatterns:
+            if pattern.name == name:
+                facets = getattr(getattr(pattern.callback, 'view_class', None), 'facets', ())
+                return [
+                    f"{path}{'&' if '?' in path else '?'}{facet.param}={facet.choices()[0][0]}"
+                    for facet in facets if facet.choices()
+                ]
+        return []
+
+    def report_scans(self, tables, findings, min_rows):
+        """Print the scans and sorts; returns ``{(model, fields): routes}`` to add."""
+        self.stdout.write(self.style.MIGRATE_HEADING("Table scans and sorts"))
+        rows = {}
+        suggestions = {}
+        for table, sql, routes, scanned in sorted(findings, key=lambda finding: finding[0]):
+            model = tables[table]
+            if table not in rows:
+                rows[table] = model._default_manager.count()
+            what = 'scan' if scanned else 'sort'
+            line = f"  {table} ({rows[table]:,} rows) {what} in {', '.join(sorted(routes))}"
+            if rows[table] < min_rows:
+                self.stdout.write(f"{line}: small table, fine")
+                continue
+            columns = wanted_columns(sql, table)
+            if not columns:
+                self.stdout.write(self.style.WARNING(f"{line}: no indexable filter"))
+                self.stdout.write(f"    {sql[:300]}")
+                continue
+            fields = self.field_names(model, columns)
+            self.stdout.write(self.style.WARNING(f"{line}: wants an index on {fields}"))
+            self.stdout.write(f"    {sql[:300]}")
+            suggestions.setdefault((model, tuple(fields)), set()).update(routes)
+
+        # A suggestion that leads a longer one is served by it.
+        for model, fields in list(suggestions):
+            longer = next((other for other in suggestions if other[0] is model
+                           and len(other[1]) > len(fields) and other[1][:len(fields)] == fields), None)
+            if longer:
+                suggestions[longer] |= suggestions.pop((model, fields))
+        if not findings:
+            self.stdout.write(self.style.SUCCESS("  None: every query is served by an index."))
+        for (model, fields), routes in suggestions.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"  Suggest {model.__name__}: models.Index(fields={list(fields)!r})  # {', '.join(sorted(routes))}"
+            ))
+        return suggestions
+
+    def field_names(self, model, columns):
+        by_column = {field.column: field.name for field in model._meta.concrete_fields}
+        return [('-' if column.startswith('-') else '') + by_column.get(column.lstrip('-'), column.lstrip('-'))
+                for column in columns]
+
+    def report_indexes(self, tables, used):
+        """Print unused and redundant indexes; returns the redundant ones as ``(model, name, field or None)``."""
+        self.stdout.write(self.style.MIGRATE_HEADING("\nIndexes"))
+        connection = connections['default']
+        redundant = []
+        with connection.cursor() as cursor:
+            for table, model in sorted(tables.items()):
+                constraints = connection.introspection.get_constraints(cursor, table)
+                declared = {index.name for index in model._meta.indexes}
+                candidates = [
+                    (name, info) for name, info in constraints.items()
+                    if info['index'] or info['unique'] or info['primary_key']
+                ]
+                for name, info in candidates:
+                    if not info['index'] or info['unique'] or info['primary_key'] or name.endswith('_like'):
+                        continue
+                    cover = self.covering_index(name, info, candidates)
+                    if cover:
+                        field = next((f for f in model._meta.concrete_fields
+                                      if isinstance(f, models.ForeignKey) and [f.column] == info['columns']), None)
+                        if name in declared or field is not None:
+                            redundant.append((model, name, None if name in declared else field))
+                        fix = (
+                            "drop it from Meta.indexes" if name in declared
+                            else f"set db_index=False on {model.__name__}.{field.name}" if field
+                            else "drop it"
+                        )
+                        self.stdout.write(self.style.WARNING(
+                            f"  {name} on {table}{tuple(info['columns'])} is covered by {cover}: {fix}"
+                        ))
+                    elif name in declared and name not in used:
+                        self.stdout.write(
+                            f"  {name} on {table}{tuple(info['columns'])} was not used by any route "
+                            f"(it may still serve the admin, imports or writes)"
+                        )
+        return redundant
+
+    def covering_index(self, name, info, candidates):
+        """The name of another index starting with the same columns as ``info``, if any."""
+        columns, orders = info['columns'], info.get('orders') or []
+        for other_name, other in candidates:
+            if other_name == name or other['columns'][:len(columns)] != columns:
+                continue
+            if len(other['columns']) == len(columns) and not (other['unique'] or other['primary_key']):
+                # Two identical plain indexes: keep the first by name.
+                if other_name > name:
+                    continue
+            other_orders = (other.get('orders') or [])[:len(orders)]
+            flipped = ['DESC' if order == 'ASC' else 'ASC' for order in orders]
+            # Unique constraints have no recorded order; a B-tree reads both ways.
+            if not other_orders or other_orders in (orders, flipped) or len(columns) == 1:
+                # SQLite's introspection leaves UNIQUE column constraints unnamed.
+                return f"unique{tuple(other['columns'])}" if other_name.startswith('__') else other_name
+        return None
+
+    def write_migration(self, suggestions, redundant):
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        leaf = loader.graph.leaf_nodes('core')[0]
+        operations = []
+        for (model, fields), _ in suggestions.items():
+            index = models.Index(fields=list(fields))
+            index.set_name_with_model(model)
+            operations.append(migrations.AddIndex(model_name=model._meta.model_name, index=index))
+        for model, name, field in redundant:
+            if field is None:
+                operations.append(migrations.RemoveIndex(model_name=model._meta.model_name, name=name))
+            else:
+                _, _, field_args, field_kwargs = field.deconstruct()
+                altered = field.__class__(*field_args, **{**field_kwargs, 'db_index': False})
+                operations.append(migrations.AlterField(
+                    model_name=model._meta.model_name, name=field.name, field=altered,
+                ))
+
+        migration = type('Migration', (migrations.Migration,), {
+            'dependencies': [leaf],
+            'operations': operations,
+        })(f'{int(leaf[1][:4]) + 1:04d}_index_advice', 'core')
+        writer = MigrationWriter(migration)
+        with open(writer.path, 'w') as f:
+            f.write(writer.as_string())
+        self.stdout.write(self.style.SUCCESS(
+            f"\nWrote {os.path.relpath(writer.path)}. Review it, then make the matching changes to the "
+            f"models' Meta.indexes and fields so makemigrations stays clean."
+        ))
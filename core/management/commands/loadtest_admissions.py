@@ -0,0 +1,187 @@
+import io
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from urllib.parse import urlencode
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.admissions import drain
+from core.management.commands.benchmark import percentile
+from core.models import AdmissionApplication, Program
+
+CSRF_INPUT_RE = re.compile(rb'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class Command(BaseCommand):
+    help = (
+        "Post concurrent admission applications through the WSGI handler and report sustained "
+        "submissions per second, duplicate detection and how fast the spool drains."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--submissions', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duplicates', type=float, default=0.05, help="Share of resubmitted applications.")
+        parser.add_argument(
+            '--drain-during', action='store_true',
+            help="Keep the in-process drainer running during the test instead of draining afterwards.",
+        )
+        parser.add_argument('--keep', action='store_true', help="Keep the test applications afterwards.")
+
+    def handle(self, *args, **options):
+        logging.getLogger('core.performance').disabled = True
+        programs = list(Program.objects.values_list('pk', flat=True)[:10])
+        if not programs:
+            raise CommandError("Create at least one program first (e.g. manage.py seed_scale).")
+        self.handler = WSGIHandler()
+        self.path = reverse('core:admission_apply')
+        self.cookie, self.token = self.csrf()
+
+        forms = self.build_forms(programs, options['submissions'], options['duplicates'])
+        with override_settings(ADMISSION_DRAIN_IN_PROCESS=options['drain_during']):
+            outcomes, latencies, wall = self.run(forms, options['concurrency'])
+            started = time.perf_counter()
+            created, duplicates = drain()
+            drain_wall = time.perf_counter() - started
+
+        accepted = [ref for kind, ref in outcomes if kind == 'accepted']
+        rejected = sum(1 for kind, _ in outcomes if kind == 'duplicate')
+        errors = sum(1 for kind, _ in outcomes if kind == 'error')
+        latencies.sort()
+        saved = AdmissionApplication.objects.filter(reference__in=accepted).count()
+
+        self.stdout.write(
+            f"Submitted {len(forms)} applications with {options['concurrency']} clients in {wall:.2f}s: "
+            f"{len(accepted) / wall:.0f} accepted/s, "
+            f"p50 {percentile(latencies, 50) * 1000:.1f} ms, p95 {percentile(latencies, 95) * 1000:.1f} ms"
+        )
+        self.stdout.write(f"Rejected as duplicates at submission: {rejected}; errors: {errors}")
+        if created:
+            self.stdout.write(f"Drained {created} applications in {drain_wall:.2f}s ({created / drain_wall:.0f}/s)")
+        self.stdout.write(f"Skipped {duplicates} duplicates while draining")
+        style = self.style.SUCCESS if saved == len(accepted) else self.style.ERROR
+        self.stdout.write(style(f"{saved} of {len(accepted)} accepted applications are in the database"))
+
+        if not options['keep']:
+            for start in range(0, len(accepted), 500):
+                AdmissionApplication.objects.filter(reference__in=accepted[start:start + 500]).delete()
+        if errors or saved != len(accepted):
+            raise CommandError("The load test lost or failed submissions.")
+
+    def environ(self, method, body=b'', cookie=''):
+        return {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': self.path,
+            'QUERY_STRING': '',
+            'SCRIPT_NAME': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'HTTP_COOKIE': cookie,
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(body)),
+            'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+    def request(self, environ):
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = int(status.split()[0])
+            response['headers'] = headers
+
+        body = self.handler(environ, start_response)
+        try:
+            content = b''.join(body)
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+        return response['status'], response['headers'], content
+
+    def csrf(self):
+        status, headers, content = self.request(self.environ('GET'))
+        cookie = next(
+            (value.strip().split(';')[0] for name, value in headers
+             if name.lower() == 'set-cookie' and value.strip().startswith('csrftoken=')),
+            None,
+        )
+        match = CSRF_INPUT_RE.search(content)
+        if status != 200 or not cookie or not match:
+            raise CommandError(f"Could not load the application form (status {status}).")
+        return cookie, match.group(1).decode()
+
+    def build_forms(self, programs, total, duplicate_share):
+        year = timezone.now().year - 1
+        base = random.randint(100000, 800000)
+        forms = []
+        for i in range(total):
+            if forms and random.random() < duplicate_share:
+                forms.append(random.choice(forms))
+                continue
+            forms.append(urlencode({
+                'csrfmiddlewaretoken': self.token,
+                'program': random.choice(programs),
+                'applicant_name': f"Load Test {i}",
+                'father_name': "Father",
+                'mother_name': "Mother",
+                'date_of_birth': '2008-01-01',
+                'phone': f"017{base + i:08d}",
+                'ssc_roll': str(base * 10 + i),
+                'ssc_board': 'dhaka',
+                'ssc_year': year,
+                'ssc_gpa': '4.50',
+            }).encode())
+        return forms
+
+    def run(self, forms, concurrency):
+        outcomes, latencies = [], []
+        counter = iter(range(len(forms)))
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        i = next(counter, None)
+                    if i is None:
+                        return
+                    started = time.perf_counter()
+                    status, headers, _ = self.request(self.environ('POST', forms[i], self.cookie))
+                    elapsed = time.perf_counter() - started
+                    location = dict(headers).get('Location', '')
+                    if status == 302 and '?ref=' in location:
+                        outcome = ('accepted', location.rsplit('=', 1)[1])
+                    elif status == 200:
+                        outcome = ('duplicate', None)
+                    else:
+                        outcome = ('error', status)
+                    with lock:
+                        outcomes.append(outcome)
+                        latencies.append(elapsed)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes, latencies, time.perf_counter() - started
@@ -0,0 +1,92 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Boots a worker the way dgc/wsgi.py does, timing each phase.
+BOOT_SCRIPT = """
+import json, os, time
+started = time.perf_counter()
+phases = {}
+def mark(name):
+    global started
+    now = time.perf_counter()
+    phases[name] = round((now - started) * 1000, 1)
+    started = now
+from django.conf import settings
+settings.INSTALLED_APPS
+mark('settings')
+import django
+django.setup(set_prefix=False)
+mark('setup')
+from django.core.handlers.wsgi import WSGIHandler
+WSGIHandler()
+mark('middleware')
+from core.warmup import warmup
+phases['warmup_steps'] = warmup()
+mark('warmup')
+print('PHASES' + json.dumps(phases))
+"""
+
+IMPORT_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot a fresh worker in a subprocess and report where the cold start goes: "
+        "settings, app loading, middleware, warmup and the slowest imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help="How many packages to list.")
+        parser.add_argument(
+            '--budget', type=float, default=getattr(settings, 'STARTUP_BUDGET_MS', None),
+            help="Fail when the boot takes longer than this many ms.",
+        )
+        parser.add_argument('--runs', type=int, default=3, help="Boots to run; the fastest is reported.")
+
+    def handle(self, *args, **options):
+        runs = [self.boot() for _ in range(max(1, options['runs']))]
+        phases, imports = min(runs, key=lambda run: sum(v for v in run[0].values() if isinstance(v, float)))
+        steps = phases.pop('warmup_steps', {})
+        total = sum(phases.values())
+
+        for name, ms in phases.items():
+            self.stdout.write(f"{name:<12} {ms:>8.1f} ms")
+        for name, ms in steps.items():
+            self.stdout.write(f"  {name:<10} {ms:>8.1f} ms")
+        self.stdout.write(f"{'total':<12} {total:>8.1f} ms\n")
+
+        self.stdout.write("Slowest packages (import self time):")
+        for package, us in sorted(imports.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"  {package:<32} {us / 1000:>8.1f} ms")
+
+        budget = options['budget']
+        if budget and total > budget:
+            raise CommandError(f"Startup took {total:.0f} ms, over the {budget:.0f} ms budget.")
+        if budget:
+            self.stdout.write(self.style.SUCCESS(f"Within the {budget:.0f} ms budget."))
+
+    def boot(self):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'dgc.settings')}
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        marker = next((line for line in result.stdout.splitlines() if line.startswith('PHASES')), None)
+        if result.returncode or marker is None:
+            raise CommandError(f"Boot failed:\n{result.stderr[-2000:]}")
+
+        # Self time of every imported module, summed per package (two levels
+        # deep, so django.db and django.contrib.admin show up separately).
+        imports = defaultdict(int)
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE_RE.match(line)
+            if match:
+                imports['.'.join(match.group(2).split('.')[:2])] += int(match.group(1))
+        return json.loads(marker[len('PHASES'):]), imports
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.navigation import SEQUENCES, rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the previous/next and related links stored on every notice and event."
+
+    def handle(self, *args, **options):
+        for model in SEQUENCES:
+            count = rebuild(model)
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt navigation for {count} {model._meta.verbose_name_plural.lower()}"
+            ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.search import INDEXED_MODELS, update_index
+
+
+class Command(BaseCommand):
+    help = "Recompute search keys and trigrams for the fuzzy faculty/department/alumni name search."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=sorted(INDEXED_MODELS), help="Only rebuild this model.")
+
+    def handle(self, *args, **options):
+        kinds = [options['kind']] if options['kind'] else list(INDEXED_MODELS)
+        for kind in kinds:
+            update_index(kind)
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt search index for {INDEXED_MODELS[kind].objects.count()} {kind} rows"
+            ))
@@ -0,0 +1,345 @@
+import random
+import secrets
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from core.models import Department, Faculty, Notice, Program, Event, Gallery, Faq, Exam, ExamResult, Alumnus
+from core.signals import content_changed
+
+DEPARTMENTS = [
+    ('বাংলা', 'Bangla', 'BAN'),
+    ('ইংরেজি', 'English', 'ENG'),
+    ('ইতিহাস', 'History', 'HIS'),
+    ('ইসলামের ইতিহাস ও সংস্কৃতি', 'Islamic History and Culture', 'IHC'),
+    ('দর্শন', 'Philosophy', 'PHI'),
+    ('রাষ্ট্রবিজ্ঞান', 'Political Science', 'POL'),
+    ('অর্থনীতি', 'Economics', 'ECO'),
+    ('সমাজবিজ্ঞান', 'Sociology', 'SOC'),
+    ('হিসাববিজ্ঞান', 'Accounting', 'ACC'),
+    ('ব্যবস্থাপনা', 'Management', 'MGT'),
+    ('পদার্থবিজ্ঞান', 'Physics', 'PHY'),
+    ('রসায়ন', 'Chemistry', 'CHE'),
+    ('গণিত', 'Mathematics', 'MAT'),
+    ('উদ্ভিদবিজ্ঞান', 'Botany', 'BOT'),
+    ('প্রাণিবিজ্ঞান', 'Zoology', 'ZOO'),
+    ('ভূগোল ও পরিবেশ', 'Geography and Environment', 'GEO'),
+]
+
+FIRST_NAMES = [
+    ('মোহাম্মদ', 'Mohammad'), ('আব্দুল', 'Abdul'), ('নাসরিন', 'Nasrin'), ('ফারহানা', 'Farhana'),
+    ('রফিকুল', 'Rafiqul'), ('শাহানা', 'Shahana'), ('মাহমুদ', 'Mahmud'), ('তানজিলা', 'Tanjila'),
+    ('সুমন', 'Sumon'), ('রুবিনা', 'Rubina'), ('কামরুল', 'Kamrul'), ('সাবরিনা', 'Sabrina'),
+    ('অমিত', 'Amit'), ('দীপিকা', 'Dipika'), ('জাহিদ', 'Zahid'), ('মৌসুমী', 'Mousumi'),
+]
+
+LAST_NAMES = [
+    ('হোসেন', 'Hossain'), ('ইসলাম', 'Islam'), ('রহমান', 'Rahman'), ('আক্তার', 'Akter'),
+    ('চৌধুরী', 'Chowdhury'), ('সরকার', 'Sarker'), ('দাস', 'Das'), ('খান', 'Khan'),
+    ('মিয়া', 'Mia'), ('বেগম', 'Begum'), ('পাল', 'Paul'), ('আলম', 'Alam'),
+]
+
+NOTICE_TITLES = {
+    'routine': [
+        '{year} সালের একাদশ শ্রেণির ক্লাস রুটিন',
+        'Revised class routine for {year} honours {part} year',
+        'রমজান মাসে পরিবর্তিত ক্লাস সময়সূচি ({year})',
+    ],
+    'academic': [
+        '{year} শিক্ষাবর্ষের ক্লাস শুরুর বিজ্ঞপ্তি',
+        'Notice regarding {part} year tutorial classes ({year})',
+        'গ্রীষ্মকালীন ছুটি সংক্রান্ত বিজ্ঞপ্তি {year}',
+    ],
+    'admission': [
+        '{year}-{next} শিক্ষাবর্ষে একাদশ শ্রেণিতে ভর্তি বিজ্ঞপ্তি',
+        'Honours {part} year admission notice {year}',
+        'ভর্তির দ্বিতীয় মেধা তালিকা প্রকাশ ({year})',
+    ],
+    'exam': [
+        '{year} সালের এইচএসসি নির্বাচনী পরীক্ষার সময়সূচি',
+        'Honours {part} year final exam form fill-up {year}',
+        'Degree pass {part} year exam result published ({year})',
+    ],
+    'event': [
+        'মহান বিজয় দিবস উদযাপন {year}',
+        'Annual sports competition {year}',
+        'আন্তর্জাতিক মাতৃভাষা দিবস পালন {year}',
+    ],
+    'other': [
+        'বৃত্তির আবেদন সংক্রান্ত বিজ্ঞপ্তি {year}',
+        'Library card renewal notice {year}',
+        'শিক্ষার্থীদের পরিচয়পত্র বিতরণ ({year})',
+    ],
+}
+
+PARTS = ['1st', '2nd', '3rd', '4th']
+
+DESCRIPTION_SENTENCES = [
+    'এতদ্বারা সংশ্লিষ্ট সকল শিক্ষার্থীর অবগতির জন্য জানানো যাচ্ছে যে,',
+    'বিস্তারিত তথ্যের জন্য কলেজের নোটিশ বোর্ড দেখার অনুরোধ করা হলো।',
+    'All students are requested to collect their admit cards from the academic section.',
+    'নির্ধারিত সময়ের মধ্যে ফি জমা না দিলে আবেদন বাতিল বলে গণ্য হবে।',
+    'The schedule is subject to change by order of the National University.',
+    'প্রয়োজনে সংশ্লিষ্ট বিভাগের বিভাগীয় প্রধানের সাথে যোগাযোগ করুন।',
+]
+
+EVENT_TITLES = [
+    ('বার্ষিক ক্রীড়া প্রতিযোগিতা', 'Annual sports day'),
+    ('বিজ্ঞান মেলা', 'Science fair'),
+    ('নবীন বরণ অনুষ্ঠান', 'Freshers reception'),
+    ('বৃক্ষরোপণ কর্মসূচি', 'Tree plantation programme'),
+    ('বিতর্ক প্রতিযোগিতা', 'Debate competition'),
+    ('সাংস্কৃতিক সন্ধ্যা', 'Cultural evening'),
+]
+
+LOCATIONS = ['কলেজ মাঠ', 'মিলনায়তন', 'Main auditorium', 'বিজ্ঞান ভবন', 'Library hall']
+
+ORGANIZATIONS = ['সোনালী ব্যাংক', 'Dhaka Medical College', 'ধামরাই উপজেলা পরিষদ', 'BRAC', 'Grameenphone']
+
+# Public ids of Cloudinary's stock demo images so seeded pages render.
+SAMPLE_IMAGES = ['sample', 'samples/landscapes/nature-mountains', 'samples/people/smiling-man']
+
+
+class Command(BaseCommand):
+    help = "Generate realistic Bengali/English content at configurable volumes with bulk inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--notices', type=int, default=50000)
+        parser.add_argument('--faculty', type=int, default=5000)
+        parser.add_argument('--gallery', type=int, default=20000)
+        parser.add_argument('--events', type=int, default=2000)
+        parser.add_argument('--programs', type=int, default=3, help="Programs per department.")
+        parser.add_argument('--results', type=int, default=0, help="Rows for a published test exam.")
+        parser.add_argument('--alumni', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=None, help="Random seed for repeatable data.")
+        parser.add_argument(
+            '--clear', action='store_true',
+            help="Delete ALL existing departments, faculty, notices, programs, events, gallery images and FAQs first.",
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        # Makes slugs unique across repeated runs against the same database.
+        self.run_id = secrets.token_hex(3)
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+
+        with transaction.atomic():
+            if options['clear']:
+                for model in (Gallery, Event, Notice, Program, Faq, Faculty, Department):
+                    model.objects.all().delete()
+            departments = self.seed_departments()
+            self.seed_faculty(departments, options['faculty'])
+            self.seed_programs(departments, options['programs'])
+            self.seed_notices(options['notices'])
+            self.seed_events(options['events'])
+            self.seed_gallery(options['gallery'])
+            self.seed_faqs()
+            self.seed_results(options['results'])
+            self.seed_alumni(departments, options['alumni'])
+
+        # bulk_create skips post_save, so announce each model once.
+        for model in (Department, Faculty, Program, Notice, Event, Gallery, Faq, Alumnus):
+            content_changed.send(sender=model, pks=None)
+
+    def slug(self, text, i):
+        return f"{slugify(text)[:30]}-{self.run_id}-{i}"
+
+    def report(self, model, count):
+        self.stdout.write(self.style.SUCCESS(f"Created {count} {model._meta.verbose_name_plural}"))
+
+    def seed_departments(self):
+        existing = set(Department.objects.values_list('code', flat=True))
+        new = [
+            Department(
+                name=name_bn,
+                code=code,
+                description=f"{name_bn} বিভাগ / Department of {name_en}",
+                established=date(self.rng.randint(1972, 2010), self.rng.randint(1, 12), 1),
+                slug=self.slug(name_en, i),
+            )
+            for i, (name_bn, name_en, code) in enumerate(DEPARTMENTS)
+            if code not in existing
+        ]
+        Department.objects.bulk_create(new, batch_size=self.batch_size)
+        self.report(Department, len(new))
+        return list(Department.objects.all())
+
+    def person(self):
+        first_bn, first_en = self.rng.choice(FIRST_NAMES)
+        last_bn, last_en = self.rng.choice(LAST_NAMES)
+        return f"{first_bn} {last_bn}", f"{first_en} {last_en}"
+
+    def seed_faculty(self, departments, count):
+        designations = [value for value, _ in Faculty.DESIGNATION_CHOICES if value != 'principal']
+        rows = []
+        for i in range(count):
+            name_bn, name_en = self.person()
+            designation = self.rng.choice(designations)
+            rows.append(Faculty(
+                name=name_bn if i % 2 else name_en,
+                designation=designation,
+                designation_rank=Faculty.DESIGNATION_RANKS[designation],
+                department=self.rng.choice(departments),
+                education=f"M.A. ({self.rng.choice(DEPARTMENTS)[1]}), University of Dhaka",
+                bio=' '.join(self.rng.sample(DESCRIPTION_SENTENCES, 3)),
+                email=f"{slugify(name_en)}.{self.run_id}{i}@dgc.edu.bd",
+                phone=f"01{self.rng.randint(300000000, 999999999)}",
+                join_date=(self.now - timedelta(days=self.rng.randint(30, 30 * 365))).date(),
+                slug=self.slug(name_en, i),
+            ))
+        created = Faculty.objects.bulk_create(rows, batch_size=self.batch_size)
+        self.report(Faculty, len(created))
+
+        heads = []
+        for department in departments:
+            if department.department_head_id is None:
+                head = next((f for f in created if f.department_id == department.pk), None)
+                if head:
+                    department.department_head = head
+                    heads.append(department)
+        Department.objects.bulk_update(heads, ['department_head'], batch_size=self.batch_size)
+
+    def seed_programs(self, departments, per_department):
+        rows = []
+        for department in departments:
+            for n in range(per_department):
+                level, label = Program.LEVEL_CHOICES[n % len(Program.LEVEL_CHOICES)]
+                rows.append(Program(
+                    name=f"{label} in {department.name}",
+                    level=level,
+                    department=department,
+                    description=' '.join(self.rng.sample(DESCRIPTION_SENTENCES, 2)),
+                    duration='2 years' if level == 'hsc' else '4 years',
+                    slug=self.slug(f"{department.code}-{level}", len(rows)),
+                ))
+        Program.objects.bulk_create(rows, batch_size=self.batch_size)
+        self.report(Program, len(rows))
+
+    def seed_notices(self, count):
+        categories = [value for value, _ in Notice.CATEGORY_CHOICES]
+        rows = []
+        for i in range(count):
+            category = self.rng.choice(categories)
+            year = self.rng.randint(2010, self.now.year)
+            title = self.rng.choice(NOTICE_TITLES[category]).format(
+                year=year, next=year + 1, part=self.rng.choice(PARTS)
+            )
+            rows.append(Notice(
+                title=title,
+                description=' '.join(self.rng.sample(DESCRIPTION_SENTENCES, self.rng.randint(2, 5))),
+                category=category,
+                publish_date=self.now - timedelta(minutes=self.rng.randint(0, 60 * 24 * 365 * 15)),
+                image=self.rng.choice(SAMPLE_IMAGES) if i % 5 == 0 else None,
+                is_important=self.rng.random() < 0.02,
+                slug=self.slug(f"notice-{category}-{year}", i),
+            ))
+            if len(rows) == self.batch_size:
+                Notice.objects.bulk_create(rows)
+                rows = []
+        Notice.objects.bulk_create(rows)
+        self.report(Notice, count)
+
+    def seed_events(self, count):
+        rows = []
+        for i in range(count):
+            title_bn, title_en = self.rng.choice(EVENT_TITLES)
+            day = (self.now + timedelta(days=self.rng.randint(-3650, 180))).date()
+            rows.append(Event(
+                title=f"{title_bn} {day.year}" if i % 2 else f"{title_en} {day.year}",
+                description=' '.join(self.rng.sample(DESCRIPTION_SENTENCES, 3)),
+                date=day,
+                location=self.rng.choice(LOCATIONS),
+                image=self.rng.choice(SAMPLE_IMAGES),
+                is_featured=day >= self.now.date() and self.rng.random() < 0.2,
+                slug=self.slug(title_en, i),
+            ))
+        Event.objects.bulk_create(rows, batch_size=self.batch_size)
+        self.report(Event, count)
+
+    def seed_gallery(self, count):
+        categories = [value for value, _ in Gallery.CATEGORY_CHOICES]
+        rows = []
+        for i in range(count):
+            title_bn, title_en = self.rng.choice(EVENT_TITLES)
+            rows.append(Gallery(
+                title=title_bn if i % 3 else title_en,
+                image=self.rng.choice(SAMPLE_IMAGES),
+                category=self.rng.choice(categories),
+            ))
+            if len(rows) == self.batch_size or i == count - 1:
+                self.create_gallery_batch(rows)
+                rows = []
+        self.report(Gallery, count)
+
+    def create_gallery_batch(self, rows):
+        # upload_date is auto_now_add, so spread it out after the insert.
+        created = Gallery.objects.bulk_create(rows)
+        for image in created:
+            image.upload_date = self.now - timedelta(minutes=self.rng.randint(0, 60 * 24 * 365 * 8))
+        Gallery.objects.bulk_update(created, ['upload_date'])
+
+    def seed_faqs(self):
+        if Faq.objects.exists():
+            return
+        rows = [
+            Faq(question='ভর্তির আবেদন কীভাবে করব?', ans='অনলাইনে আবেদন ফরম পূরণ করে ফি জমা দিন।', page='admission'),
+            Faq(question='What documents are needed for admission?', ans='SSC marksheet, testimonial and two photos.', page='admission'),
+            Faq(question='কলেজ অফিস কখন খোলা থাকে?', ans='রবি থেকে বৃহস্পতিবার সকাল ৯টা থেকে বিকাল ৪টা।', page='contact'),
+        ]
+        Faq.objects.bulk_create(rows)
+        self.report(Faq, len(rows))
+
+    def seed_results(self, count):
+        if not count:
+            return
+        # Saving announces the exam, so its result index is built on commit.
+        exam = Exam.objects.create(
+            name=f"HSC Test Exam {self.run_id}", year=self.now.year, is_published=True,
+        )
+        subjects = ['Bangla', 'English', 'ICT', 'Physics', 'Chemistry', 'Mathematics']
+        grades = [('A+', 5), ('A', 4), ('A-', 3.5), ('B', 3), ('C', 2), ('D', 1)]
+        rows = []
+        for i in range(count):
+            sheet = {subject: self.rng.choice(grades) for subject in subjects}
+            gpa = round(sum(point for _, point in sheet.values()) / len(sheet), 2)
+            rows.append(ExamResult(
+                exam=exam, roll=str(100000 + i), name=self.person()[1], gpa=gpa,
+                grade=next(grade for grade, point in grades if gpa >= point) if gpa >= 1 else 'F',
+                subjects={subject: grade for subject, (grade, _) in sheet.items()},
+            ))
+            if len(rows) >= self.batch_size:
+                ExamResult.objects.bulk_create(rows)
+                rows = []
+        ExamResult.objects.bulk_create(rows)
+        Exam.objects.filter(pk=exam.pk).update(result_count=count)
+        self.report(ExamResult, count)
+
+    def seed_alumni(self, departments, count):
+        professions = [
+            ('শিক্ষক', 'Teacher'), ('ব্যাংকার', 'Banker'), ('চিকিৎসক', 'Doctor'),
+            ('প্রকৌশলী', 'Engineer'), ('উদ্যোক্তা', 'Entrepreneur'), ('সরকারি কর্মকর্তা', 'Civil servant'),
+        ]
+        rows = []
+        for i in range(count):
+            name_bn, name_en = self.person()
+            name = name_bn if i % 2 else name_en
+            profession = self.rng.choice(professions)[i % 2]
+            rows.append(Alumnus(
+                name=name,
+                batch_year=self.rng.randint(1975, self.now.year - 1),
+                department=self.rng.choice(departments),
+                roll=f"{self.run_id}{i}",
+                profession=profession,
+                organization=self.rng.choice(ORGANIZATIONS),
+                bio=' '.join(self.rng.sample(DESCRIPTION_SENTENCES, 3)),
+            ))
+            if len(rows) >= self.batch_size:
+                Alumnus.objects.bulk_create(rows)
+                rows = []
+        Alumnus.objects.bulk_create(rows)
+        self.report(Alumnus, count)
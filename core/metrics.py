@@ -0,0 +1,270 @@
+"""
+In-process request metrics rendered in the Prometheus text format.
+
+Each worker process aggregates into its own ``MetricsRegistry`` and
+periodically snapshots it to ``METRICS_DIR/worker-<host>-<pid>-<start>.json``.
+The ``/metrics`` view merges every snapshot in the directory, so the numbers
+cover all gunicorn/uWSGI workers without a shared server. Counters only ever
+grow, so the snapshots of workers that have exited are folded into
+``aggregate.json`` by the next collection on their host rather than kept
+(and re-read) one file per worker lifetime.
+"""
+import json
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.urls import URLPattern, URLResolver
+
+# Latency histogram upper bounds in seconds.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_VIEW = 'unmatched'
+
+AGGREGATE = 'aggregate.json'
+LOCK = '.lock'
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development servers only
+    fcntl = None
+
+
+def _empty_view():
+    return {
+        'requests': {},
+        'errors': 0,
+        'buckets': [0] * len(BUCKETS),
+        'duration_sum': 0.0,
+        'duration_count': 0,
+        'db_queries': 0,
+        'db_seconds': 0.0,
+        'cache': {'hit': 0, 'miss': 0},
+        'throttled': {},
+    }
+
+
+def _merge(into, other):
+    for key, value in other.items():
+        if isinstance(value, dict):
+            _merge(into.setdefault(key, {}), value)
+        elif isinstance(value, list):
+            current = into.setdefault(key, [0] * len(value))
+            for i, n in enumerate(value):
+                current[i] += n
+        else:
+            into[key] = into.get(key, 0) + value
+
+
+def route_names(patterns=None, namespace=None):
+    """Every named route in the project URLconf, as ``namespace:name``."""
+    if patterns is None:
+        from django.urls import get_resolver
+        patterns = get_resolver().url_patterns
+    names = []
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == 'admin':
+                continue
+            ns = pattern.namespace
+            if namespace:
+                ns = f"{namespace}:{ns}" if ns else namespace
+            names.extend(route_names(pattern.url_patterns, ns))
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.append(f"{namespace}:{pattern.name}" if namespace else pattern.name)
+    return list(dict.fromkeys(names))
+
+
+class MetricsRegistry:
+    def __init__(self, directory=None, flush_interval=None):
+        self.directory = directory or settings.METRICS_DIR
+        self.flush_interval = (
+            settings.METRICS_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        )
+        self.pid = os.getpid()
+        self.host = socket.gethostname()
+        self.filename = os.path.join(
+            self.directory, f"worker-{self.host}-{self.pid}-{int(time.time())}.json"
+        )
+        self.views = {}
+        self.lock = threading.Lock()
+        self.last_flush = 0.0
+
+    def observe(self, metrics):
+        view = metrics.view_name or UNMATCHED_VIEW
+        status_class = f"{metrics.status // 100}xx"
+        with self.lock:
+            data = self.views.setdefault(view, _empty_view())
+            data['requests'][status_class] = data['requests'].get(status_class, 0) + 1
+            if metrics.status >= 500:
+                data['errors'] += 1
+            for i, bound in enumerate(BUCKETS):
+                if metrics.total_time <= bound:
+                    data['buckets'][i] += 1
+            data['duration_sum'] += metrics.total_time
+            data['duration_count'] += 1
+            data['db_queries'] += metrics.db_queries
+            data['db_seconds'] += metrics.db_time
+            data['cache']['hit'] += metrics.cache.hits
+            data['cache']['miss'] += metrics.cache.misses
+            due = time.monotonic() - self.last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def observe_throttled(self, view, client):
+        """Count a request rejected by the throttle, per client address."""
+        limit = getattr(settings, 'THROTTLE_TRACKED_CLIENTS', 200)
+        with self.lock:
+            clients = self.views.setdefault(view or UNMATCHED_VIEW, _empty_view())['throttled']
+            clients[client] = clients.get(client, 0) + 1
+            if len(clients) > limit:
+                # Keep the heaviest half so one scan of many addresses
+                # cannot grow the snapshot without bound.
+                top = sorted(clients.items(), key=lambda item: item[1], reverse=True)[:limit // 2]
+                clients.clear()
+                clients.update(top)
+
+    def flush(self):
+        with self.lock:
+            snapshot = json.dumps(self.views)
+            self.last_flush = time.monotonic()
+        os.makedirs(self.directory, exist_ok=True)
+        _write(self.filename, snapshot)
+
+    def exited(self, name):
+        """True when snapshot ``name`` belongs to a worker of this host that is no longer running."""
+        parts = name.removeprefix('worker-').removesuffix('.json').rsplit('-', 2)
+        # worker-<pid>-<start>.json snapshots predate the host in the name.
+        host, pid = (parts[0], parts[1]) if len(parts) == 3 else (self.host, parts[0])
+        try:
+            pid = int(pid)
+        except ValueError:
+            return False
+        if host != self.host or pid == self.pid:
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass  # alive, run by another user
+        return False
+
+    def collect(self):
+        """Merge the snapshots of every worker, including this one, folding those of exited workers."""
+        self.flush()
+        with open(os.path.join(self.directory, LOCK), 'a') as lock:
+            # One collection at a time, so a snapshot is never both folded
+            # into the aggregate and read on its own.
+            if fcntl:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            aggregate = _read(os.path.join(self.directory, AGGREGATE)) or {'views': {}, 'folded': []}
+            folded = set(aggregate['folded'])
+            live, exited = {}, []
+            for entry in os.scandir(self.directory):
+                if not entry.name.startswith('worker-') or not entry.name.endswith('.json'):
+                    continue
+                if entry.name in folded:
+                    exited.append(entry.path)  # folded before a crash removed it
+                    continue
+                views = _read(entry.path)
+                if views is None:
+                    continue
+                if self.exited(entry.name):
+                    _merge(aggregate['views'], views)
+                    aggregate['folded'].append(entry.name)
+                    exited.append(entry.path)
+                else:
+                    live[entry.name] = views
+            if exited:
+                # Names are kept until their files are gone, so a crash
+                # between these two steps can't count a snapshot twice.
+                _write(os.path.join(self.directory, AGGREGATE), json.dumps(aggregate))
+                for path in exited:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                aggregate['folded'] = []
+                _write(os.path.join(self.directory, AGGREGATE), json.dumps(aggregate))
+
+        merged = {name: _empty_view() for name in route_names()}
+        for views in [aggregate['views'], *live.values()]:
+            for name, data in views.items():
+                _merge(merged.setdefault(name, _empty_view()), data)
+        return merged
+
+    def render(self):
+        views = self.collect()
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        family('dgc_http_requests_total', 'counter', 'Requests served, by view and status class.')
+        for view, data in views.items():
+            for status_class, n in sorted(data['requests'].items()):
+                lines.append(f'dgc_http_requests_total{{view="{view}",status="{status_class}"}} {n}')
+
+        family('dgc_http_errors_total', 'counter', 'Responses with a 5xx status.')
+        for view, data in views.items():
+            lines.append(f'dgc_http_errors_total{{view="{view}"}} {data["errors"]}')
+
+        family('dgc_http_request_duration_seconds', 'histogram', 'Request latency.')
+        for view, data in views.items():
+            for bound, n in zip(BUCKETS, data['buckets']):
+                lines.append(f'dgc_http_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {n}')
+            lines.append(f'dgc_http_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {data["duration_count"]}')
+            lines.append(f'dgc_http_request_duration_seconds_sum{{view="{view}"}} {data["duration_sum"]:.6f}')
+            lines.append(f'dgc_http_request_duration_seconds_count{{view="{view}"}} {data["duration_count"]}')
+
+        family('dgc_db_queries_total', 'counter', 'Database queries issued.')
+        for view, data in views.items():
+            lines.append(f'dgc_db_queries_total{{view="{view}"}} {data["db_queries"]}')
+
+        family('dgc_db_query_seconds_total', 'counter', 'Time spent in database queries.')
+        for view, data in views.items():
+            lines.append(f'dgc_db_query_seconds_total{{view="{view}"}} {data["db_seconds"]:.6f}')
+
+        family('dgc_cache_requests_total', 'counter', 'Cache lookups by result; hit ratio is hit / (hit + miss).')
+        for view, data in views.items():
+            for result in ('hit', 'miss'):
+                lines.append(f'dgc_cache_requests_total{{view="{view}",result="{result}"}} {data["cache"][result]}')
+
+        family('dgc_throttled_requests_total', 'counter', 'Requests rejected with 429 by the throttle.')
+        for view, data in views.items():
+            lines.append(f'dgc_throttled_requests_total{{view="{view}"}} {sum(data["throttled"].values())}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write(path, content):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    global _registry
+    if _registry is None or _registry.pid != os.getpid():
+        # Created lazily so a registry inherited over fork is replaced.
+        with _registry_lock:
+            if _registry is None or _registry.pid != os.getpid():
+                _registry = MetricsRegistry()
+    return _registry
@@ -0,0 +1,368 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers, set_response_etag
+
+from . import routers, throttling
+from .compression import compress, compress_stream, negotiate_encoding
+from .metrics import get_registry
+
+logger = logging.getLogger('core.performance')
+
+# The CacheLookups of every layer observing the current request.
+_cache_lookups = ContextVar('core_cache_lookups', default=())
+
+
+class CacheLookups:
+    """Cache hits and misses counted by ``record_cache`` during one request."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def result(self):
+        """'hit' when every lookup hit, 'miss' when any missed, None without lookups."""
+        return 'miss' if self.misses else 'hit' if self.hits else None
+
+
+def record_cache(hit):
+    """Count one cache lookup of the current request; ``hit`` when the cache answered it."""
+    for lookups in _cache_lookups.get():
+        if hit:
+            lookups.hits += 1
+        else:
+            lookups.misses += 1
+
+
+@contextmanager
+def observe_cache(lookups):
+    token = _cache_lookups.set((*_cache_lookups.get(), lookups))
+    try:
+        yield lookups
+    finally:
+        _cache_lookups.reset(token)
+
+
+def instrument(metrics):
+    """Count the queries and cache lookups made while the returned context is active."""
+    stack = ExitStack()
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(metrics))
+    stack.enter_context(observe_cache(metrics.cache))
+    return stack
+
+
+def iterate(content, context):
+    """
+    Iterate ``content`` with ``context()`` active around each step.
+
+    Streamed bodies render after the middleware has returned, and entering
+    the context per chunk keeps context variables valid whichever context
+    the server iterates them in.
+    """
+    iterator = iter(content)
+    while True:
+        with context():
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+        yield chunk
+
+
+class RequestMetrics:
+    """Numbers collected for a single request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_name = None
+        self.status = None
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.template_time = None
+        self.cache = CacheLookups()
+        self.response_size = None
+        self.total_time = None
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed as a database execute wrapper.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_time += time.perf_counter() - start
+
+    def as_dict(self):
+        return {
+            'view': self.view_name,
+            'status': self.status,
+            'db_queries': self.db_queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'template_ms': None if self.template_time is None else round(self.template_time * 1000, 2),
+            'cache': self.cache.result,
+            'bytes': self.response_size,
+            'total_ms': round(self.total_time * 1000, 2),
+        }
+
+    def server_timing(self):
+        parts = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"',
+            f'total;dur={self.total_time * 1000:.1f}',
+        ]
+        if self.template_time is not None:
+            parts.insert(1, f'tpl;dur={self.template_time * 1000:.1f}')
+        if self.cache.result:
+            parts.append(f'cache;desc={self.cache.result}')
+        return ', '.join(parts)
+
+
+class PerformanceMiddleware:
+    """
+    Time a sample of requests and report them as a ``Server-Timing`` header
+    and one JSON line on the ``core.performance`` logger.
+
+    The sample rate is ``PERFORMANCE_SAMPLE_RATE`` (0.0 - 1.0). When
+    ``METRICS_ENABLED`` is set every request is still measured and fed to
+    the ``/metrics`` registry; otherwise requests outside the sample pay no
+    instrumentation cost.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PERFORMANCE_SAMPLE_RATE', 1.0)
+        self.server_timing = getattr(settings, 'PERFORMANCE_SERVER_TIMING', True)
+        self.collect_metrics = getattr(settings, 'METRICS_ENABLED', False)
+
+    def __call__(self, request):
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not sampled and not self.collect_metrics:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        request._metrics = metrics
+        with instrument(metrics):
+            response = self.get_response(request)
+
+        if response.streaming:
+            # Headers leave before the body is rendered, so Server-Timing
+            # can only describe the work done up to that point.
+            self.finish(request, response, metrics, sampled, report=False)
+            response.streaming_content = self.stream(
+                request, response, response.streaming_content, metrics, sampled
+            )
+        else:
+            self.finish(request, response, metrics, sampled)
+        return response
+
+    def stream(self, request, response, content, metrics, sampled):
+        metrics.response_size = 0
+        try:
+            for chunk in iterate(content, lambda: instrument(metrics)):
+                metrics.response_size += len(chunk)
+                yield chunk
+        finally:
+            self.finish(request, response, metrics, sampled, headers=False)
+
+    def process_template_response(self, request, response):
+        metrics = getattr(request, '_metrics', None)
+        if metrics is not None:
+            render_started = time.perf_counter()
+
+            def rendered(response):
+                metrics.template_time = time.perf_counter() - render_started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, metrics, sampled=True, headers=True, report=True):
+        metrics.total_time = time.perf_counter() - metrics.started
+        match = getattr(request, 'resolver_match', None)
+        metrics.view_name = match.view_name if match else None
+        metrics.status = response.status_code
+        if not response.streaming:
+            metrics.response_size = len(response.content)
+
+        if sampled and headers and self.server_timing:
+            response['Server-Timing'] = metrics.server_timing()
+        if not report:
+            return
+        if self.collect_metrics:
+            get_registry().observe(metrics)
+        if sampled:
+            logger.info(json.dumps({'path': request.path, **metrics.as_dict()}))
+
+
+class ThrottleMiddleware:
+    """
+    Reject clients that exceed a route's ``THROTTLE_RULES`` with a 429.
+
+    A request that turns out to be answered from caches (every
+    ``record_cache`` lookup hit and no query ran, or a 304) gets its token
+    back, so only the requests that actually reach the database count
+    against the client. Streamed pages are settled once their body is done.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'THROTTLE_ENABLED', False):
+            return self.get_response(request)
+        observed = RequestMetrics()
+        with instrument(observed):
+            response = self.get_response(request)
+        if not getattr(request, '_throttle_charge', None):
+            return response
+        if response.streaming:
+            response.streaming_content = self.stream(request, response, response.streaming_content, observed)
+        else:
+            self.settle(request, response, observed)
+        return response
+
+    def stream(self, request, response, content, observed):
+        try:
+            yield from iterate(content, lambda: instrument(observed))
+        finally:
+            self.settle(request, response, observed)
+
+    def settle(self, request, response, observed):
+        cached = observed.cache.result == 'hit' and not observed.db_queries
+        if cached or response.status_code == 304:
+            throttling.get_buckets().refund(*request._throttle_charge)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(settings, 'THROTTLE_ENABLED', False):
+            return None
+        view_name = request.resolver_match.view_name
+        rule = throttling.rule_for(request, view_name)
+        if rule is None:
+            return None
+        client = throttling.client_ip(request)
+        if client in getattr(settings, 'THROTTLE_EXEMPT_ADDRESSES', ()):
+            return None
+
+        key = f'{view_name}:{client}'
+        wait = throttling.get_buckets().take(key, rule)
+        if not wait:
+            request._throttle_charge = (key, rule)
+            return None
+
+        if getattr(settings, 'METRICS_ENABLED', False):
+            get_registry().observe_throttled(view_name, client)
+        seconds = throttling.retry_after(wait)
+        response = HttpResponse(
+            f"Too many requests. Please try again in {seconds} seconds.\n",
+            status=429, content_type='text/plain; charset=utf-8',
+        )
+        response['Retry-After'] = str(seconds)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+class ReadOnlyMiddleware:
+    """Route the reads of GET/HEAD requests to the site's views to the read-only alias (core.routers)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Cleared at the start rather than reset at the end: a streamed
+        # page still runs its queries after this returns.
+        routers.route_reads(False)
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method in ('GET', 'HEAD') and request.resolver_match.app_name == 'core':
+            routers.route_reads(True)
+        return None
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli compression for HTML, JSON and text responses.
+
+    Complete responses are compressed once per ETag: the compressed body is
+    kept in the ``COMPRESSION_CACHE_ALIAS`` cache, so repeat requests cost a
+    hash rather than a compression. Streamed responses (the template pages
+    when ``STREAMING_RESPONSES`` is on) are compressed on the fly on every
+    request: their body, and so any cache key, is only known once the last
+    chunk has already been sent. Turn streaming off where compression cost
+    matters more than time to first byte.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 512)
+        self.levels = {
+            'gzip': getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6),
+            'br': getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5),
+        }
+        self.content_types = getattr(
+            settings, 'COMPRESSION_CONTENT_TYPES', ('text/html', 'application/json', 'text/plain')
+        )
+        self.cache_alias = getattr(settings, 'COMPRESSION_CACHE_ALIAS', 'default')
+        self.cache_timeout = getattr(settings, 'COMPRESSION_CACHE_TIMEOUT', 600)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        level = self.levels[encoding]
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding, level)
+            del response.headers['Content-Length']
+        else:
+            if len(response.content) < self.min_size:
+                return response
+            if not response.has_header('ETag'):
+                set_response_etag(response)
+            body = self.compressed_body(response, encoding, level)
+            if len(body) >= len(response.content):
+                return response
+            response.content = body
+            response['Content-Length'] = str(len(body))
+
+        # The encoded body is a different representation, so a strong ETag
+        # must not be shared with the identity response.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def is_compressible(self, response):
+        if response.has_header('Content-Encoding') or response.status_code in (204, 304):
+            return False
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        return content_type in self.content_types
+
+    def compressed_body(self, response, encoding, level):
+        etag = response['ETag']
+        if etag.startswith('W/'):
+            # A weak ETag does not promise byte-identical bodies.
+            return compress(response.content, encoding, level)
+        cache = caches[self.cache_alias]
+        key = 'compressed:%s:%s:%s' % (encoding, level, etag.strip('"'))
+        body = cache.get(key)
+        record_cache(body is not None)
+        if body is None:
+            body = compress(response.content, encoding, level)
+            cache.set(key, body, self.cache_timeout)
+        return body
+
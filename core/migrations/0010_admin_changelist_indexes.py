@@ -0,0 +1,167 @@
+# Generated by Django 5.2 on 2026-10-19 08:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Admin search uses istartswith, which PostgreSQL compiles to
+# UPPER(col::text) LIKE UPPER('term%'); only a pattern_ops expression
+# index can serve that outside the C locale.
+TITLE_SEARCH_INDEXES = [
+    ('core_notice_title_upper_idx', 'core_notice'),
+    ('core_event_title_upper_idx', 'core_event'),
+    ('core_gallery_title_upper_idx', 'core_gallery'),
+]
+
+
+def create_title_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in TITLE_SEARCH_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" (UPPER("title"::text) text_pattern_ops)'
+        )
+
+
+def drop_title_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _table in TITLE_SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_remove_faculty_is_featured_alter_faculty_designation_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='department',
+            options={'ordering': ['name']},
+        ),
+        migrations.AlterModelOptions(
+            name='event',
+            options={'ordering': ['-date'], 'verbose_name_plural': 'Events'},
+        ),
+        migrations.AlterModelOptions(
+            name='faculty',
+            options={'ordering': ['designation', 'name'], 'verbose_name_plural': 'Teachers'},
+        ),
+        migrations.AlterModelOptions(
+            name='faq',
+            options={'ordering': ['question'], 'verbose_name_plural': 'FAQs'},
+        ),
+        migrations.AlterModelOptions(
+            name='notice',
+            options={'ordering': ['-publish_date'], 'verbose_name_plural': 'Notices'},
+        ),
+        migrations.AlterModelOptions(
+            name='program',
+            options={'verbose_name_plural': 'Programs'},
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='code',
+            field=models.CharField(max_length=10, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='description',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='department',
+            name='established',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='faculty',
+            name='bio',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='faculty',
+            name='education',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='faq',
+            name='page',
+            field=models.CharField(choices=[('admission', 'ভর্তি'), ('contact', 'যোগাযোগ')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='gallery',
+            name='category',
+            field=models.CharField(choices=[('campus', 'ক্যাম্পাস'), ('history', 'ইতিহাস'), ('event', 'ইভেন্ট'), ('students activity', 'ছাত্র কার্যক্রম'), ('other', 'অন্যান্য')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='gallery',
+            name='title',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notice',
+            name='description',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='program',
+            name='department',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='programs', to='core.department'),
+        ),
+        migrations.AlterField(
+            model_name='program',
+            name='slug',
+            field=models.SlugField(blank=True, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='department',
+            index=models.Index(fields=['slug'], name='core_depart_slug_f736dd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['is_featured', '-date'], name='core_event_is_feat_ef622f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-date'], name='core_event_date_228368_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['slug'], name='core_event_slug_7e3734_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(fields=['slug'], name='core_facult_slug_2b1bcf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(fields=['category'], name='core_galler_categor_f566a5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(fields=['-upload_date'], name='core_galler_upload__686751_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['category'], name='core_notice_categor_72bc99_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['is_important', '-publish_date'], name='core_notice_is_impo_484ad2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['-publish_date'], name='core_notice_publish_bfab91_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['slug'], name='core_notice_slug_3f2870_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='program',
+            index=models.Index(fields=['slug'], name='core_progra_slug_9f56e9_idx'),
+        ),
+        migrations.RunPython(create_title_search_indexes, drop_title_search_indexes),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-19 08:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_designation_rank(apps, schema_editor):
+    Faculty = apps.get_model('core', 'Faculty')
+    designations = ['principal', 'vice principal', 'professor', 'associate professor',
+                    'assistant professor', 'lecturer', 'staff']
+    for rank, designation in enumerate(designations):
+        Faculty.objects.filter(designation__iexact=designation).update(designation_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_admin_changelist_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='faculty',
+            options={'ordering': ['designation_rank', 'name'], 'verbose_name_plural': 'Teachers'},
+        ),
+        migrations.AddField(
+            model_name='faculty',
+            name='designation_rank',
+            field=models.PositiveSmallIntegerField(default=7, editable=False),
+        ),
+        migrations.RunPython(populate_designation_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(fields=['designation_rank', 'name'], name='core_facult_designa_789f60_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faculty',
+            index=models.Index(fields=['department', 'designation_rank', 'name'], name='core_facult_departm_326162_idx'),
+        ),
+        migrations.AlterField(
+            model_name='faculty',
+            name='department',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.department'),
+        ),
+    ]
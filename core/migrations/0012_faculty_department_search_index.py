@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-19 08:12
+
+from django.db import migrations, models
+
+from core.normalization import search_key, trigrams
+
+
+def build_search_index(apps, schema_editor):
+    SearchTrigram = apps.get_model('core', 'SearchTrigram')
+    sources = {
+        'faculty': (apps.get_model('core', 'Faculty'), ('name',)),
+        'department': (apps.get_model('core', 'Department'), ('name', 'code')),
+    }
+    for kind, (model, fields) in sources.items():
+        rows = []
+        for obj in model.objects.only('pk', *fields).iterator():
+            obj.search_key = search_key(' '.join(getattr(obj, f) or '' for f in fields))
+            model.objects.filter(pk=obj.pk).update(search_key=obj.search_key)
+            rows.extend(SearchTrigram(kind=kind, object_id=obj.pk, trigram=g) for g in trigrams(obj.search_key))
+        SearchTrigram.objects.bulk_create(rows, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_faculty_designation_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='search_key',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='faculty',
+            name='search_key',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+        migrations.CreateModel(
+            name='SearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('faculty', 'Faculty'), ('department', 'Department')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('trigram', models.CharField(max_length=3)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'trigram', 'object_id'], name='core_search_kind_2aa1f8_idx'), models.Index(fields=['kind', 'object_id'], name='core_search_kind_76771b_idx')],
+            },
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
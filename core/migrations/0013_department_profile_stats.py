@@ -0,0 +1,47 @@
+# Generated by Django 5.2 on 2026-10-19 08:13
+
+import cloudinary.models
+from django.db import migrations, models
+
+
+def populate_department_stats(apps, schema_editor):
+    Department = apps.get_model('core', 'Department')
+    for department in Department.objects.select_related('department_head'):
+        head = department.department_head
+        Department.objects.filter(pk=department.pk).update(
+            faculty_count=department.faculty_set.count(),
+            program_count=department.programs.count(),
+            head_name=head.name if head else '',
+            head_photo=head.photo if head else None,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_faculty_department_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='faculty_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='head_name',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='head_photo',
+            field=cloudinary.models.CloudinaryField(blank=True, editable=False, max_length=255, null=True, verbose_name='image'),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='program_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_department_stats, migrations.RunPython.noop),
+    ]
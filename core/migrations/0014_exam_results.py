@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-19 08:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_department_profile_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Exam',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('is_published', models.BooleanField(default=False)),
+                ('published_at', models.DateTimeField(blank=True, editable=False, null=True)),
+                ('result_count', models.PositiveIntegerField(default=0, editable=False)),
+                ('slug', models.SlugField(blank=True, unique=True)),
+            ],
+            options={
+                'ordering': ['-year', 'name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExamResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('roll', models.CharField(max_length=20)),
+                ('name', models.CharField(blank=True, max_length=100)),
+                ('gpa', models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True)),
+                ('grade', models.CharField(blank=True, max_length=4)),
+                ('subjects', models.JSONField(blank=True, default=dict)),
+                ('exam', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='results', to='core.exam')),
+            ],
+            options={
+                'ordering': ['exam', 'roll'],
+                'constraints': [models.UniqueConstraint(fields=('exam', 'roll'), name='unique_exam_roll')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-19 08:30
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_exam_results'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionApplication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reference', models.CharField(editable=False, max_length=12, unique=True)),
+                ('applicant_name', models.CharField(max_length=100)),
+                ('father_name', models.CharField(max_length=100)),
+                ('mother_name', models.CharField(max_length=100)),
+                ('date_of_birth', models.DateField()),
+                ('phone', models.CharField(max_length=20)),
+                ('email', models.EmailField(blank=True, max_length=254)),
+                ('ssc_roll', models.CharField(max_length=20)),
+                ('ssc_board', models.CharField(choices=[('dhaka', 'Dhaka'), ('rajshahi', 'Rajshahi'), ('comilla', 'Comilla'), ('jessore', 'Jessore'), ('chittagong', 'Chittagong'), ('barisal', 'Barisal'), ('sylhet', 'Sylhet'), ('dinajpur', 'Dinajpur'), ('mymensingh', 'Mymensingh'), ('madrasah', 'Madrasah'), ('technical', 'Technical')], max_length=20)),
+                ('ssc_year', models.PositiveSmallIntegerField()),
+                ('ssc_gpa', models.DecimalField(decimal_places=2, max_digits=3)),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], default='submitted', max_length=20)),
+                ('submitted_at', models.DateTimeField(default=django.utils.timezone.now, editable=False)),
+                ('submission_hash', models.CharField(editable=False, max_length=64, unique=True)),
+                ('program', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='applications', to='core.program')),
+            ],
+            options={
+                'ordering': ['-submitted_at'],
+                'indexes': [models.Index(fields=['program', 'status', '-submitted_at'], name='core_admiss_program_d143dd_idx'), models.Index(fields=['ssc_roll'], name='core_admiss_ssc_rol_ba2ae6_idx')],
+            },
+        ),
+    ]
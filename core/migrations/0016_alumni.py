@@ -0,0 +1,41 @@
+# Generated by Django 5.2 on 2026-10-19 08:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_admission_applications'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='searchtrigram',
+            name='kind',
+            field=models.CharField(choices=[('faculty', 'Faculty'), ('department', 'Department'), ('alumnus', 'Alumnus')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='Alumnus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150)),
+                ('batch_year', models.PositiveSmallIntegerField()),
+                ('roll', models.CharField(blank=True, max_length=30)),
+                ('profession', models.CharField(blank=True, max_length=150)),
+                ('organization', models.CharField(blank=True, max_length=150)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('email', models.EmailField(blank=True, max_length=254)),
+                ('bio', models.TextField(blank=True)),
+                ('search_key', models.CharField(blank=True, editable=False, max_length=255)),
+                ('department', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='alumni', to='core.department')),
+            ],
+            options={
+                'verbose_name_plural': 'Alumni',
+                'ordering': ['-batch_year', 'name', 'id'],
+                'indexes': [models.Index(fields=['-batch_year', 'name', 'id'], name='core_alumnu_batch_y_0882ed_idx'), models.Index(fields=['department', '-batch_year', 'name', 'id'], name='core_alumnu_departm_581fd0_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('roll', ''), _negated=True), fields=('batch_year', 'roll'), name='unique_alumnus_batch_roll')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2 on 2026-10-19 08:48
+
+from django.db import migrations, models
+
+
+def populate_navigation(apps, schema_editor):
+    from core.navigation import rebuild
+
+    rebuild(apps.get_model('core', 'Notice'), ('publish_date', 'category'))
+    rebuild(apps.get_model('core', 'Event'), ('date', 'location'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_alumni'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='core_event_date_228368_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notice',
+            name='core_notice_categor_72bc99_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notice',
+            name='core_notice_publish_bfab91_idx',
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='navigation',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='notice',
+            name='navigation',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-date', '-id'], name='core_event_date_2655d4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['location', '-date', '-id'], name='core_event_locatio_17544d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['category', '-publish_date', '-id'], name='core_notice_categor_c69e63_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notice',
+            index=models.Index(fields=['-publish_date', '-id'], name='core_notice_publish_530308_idx'),
+        ),
+        migrations.RunPython(populate_navigation, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def normalize_rolls(apps, schema_editor):
+    from core.normalization import normalize_roll
+
+    ExamResult = apps.get_model('core', 'ExamResult')
+    for pk, exam_id, roll in ExamResult.objects.values_list('pk', 'exam_id', 'roll').iterator():
+        normalized = normalize_roll(roll)
+        if normalized == roll:
+            continue
+        # A row already stored under the normalized roll wins; it is the one lookups found.
+        if not ExamResult.objects.filter(exam_id=exam_id, roll=normalized).exists():
+            ExamResult.objects.filter(pk=pk).update(roll=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_detail_navigation'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_rolls, migrations.RunPython.noop),
+    ]
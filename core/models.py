@@ -3,8 +3,10 @@ from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.utils.text import slugify
 from cloudinary.models import CloudinaryField
+from .normalization import normalize_roll, search_key
+from .tracking import TrackedFieldsMixin
 
-class Department(models.Model):
+class Department(TrackedFieldsMixin, models.Model):
     name = models.CharField(max_length=100)
     code = models.CharField(max_length=10, unique=True)
     description = models.TextField(blank=True, null=True)
@@ -13,6 +15,14 @@ class Department(models.Model):
     )
     established = models.DateField(null=True, blank=True)
     slug = models.SlugField(unique=True, blank=True)
+    search_key = models.CharField(max_length=255, blank=True, editable=False)
+    # Denormalised profile stats, kept current by core.stats.
+    faculty_count = models.PositiveIntegerField(default=0, editable=False)
+    program_count = models.PositiveIntegerField(default=0, editable=False)
+    head_name = models.CharField(max_length=100, blank=True, editable=False)
+    head_photo = CloudinaryField('image', blank=True, null=True, editable=False)
+
+    SEARCH_FIELDS = ('name', 'code')
 
     class Meta:
         ordering = ['name']
@@ -24,8 +34,16 @@ class Department(models.Model):
         if not self.code.strip():
             raise ValidationError("Department code cannot be empty.")
 
+    def search_text(self):
+        return ' '.join(getattr(self, field) or '' for field in self.SEARCH_FIELDS)
+
     def save(self, *args, **kwargs):
         self.full_clean()  # Run validation
+        self.search_key = search_key(self.search_text())
+        if self.has_changed('department_head'):
+            head = self.department_head
+            self.head_name = head.name if head else ''
+            self.head_photo = head.photo if head else None
         if not self.slug:
             self.slug = slugify(self.name)[:50]
             # Ensure unique slug
@@ -42,7 +60,7 @@ class Department(models.Model):
     def __str__(self):
         return self.name
 
-class Faculty(models.Model):
+class Faculty(TrackedFieldsMixin, models.Model):
     DESIGNATION_CHOICES = [
         ('principal', 'অধ্যক্ষ'),
         ('vice principal', 'সহযোগী অধ্যক্ষ'),
@@ -52,10 +70,14 @@ class Faculty(models.Model):
         ('lecturer', 'প্রভাষক'),
         ('staff', 'কর্মচারী'),
     ]
+    # Seniority order for listings; lower ranks sort first.
+    DESIGNATION_RANKS = {value: rank for rank, (value, _) in enumerate(DESIGNATION_CHOICES)}
 
     name = models.CharField(max_length=100)
     designation = models.CharField(max_length=50, choices=DESIGNATION_CHOICES)
-    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True)
+    designation_rank = models.PositiveSmallIntegerField(default=len(DESIGNATION_CHOICES), editable=False)
+    # Lookups by department use the (department, designation_rank, name) index.
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True, db_index=False)
     education = models.TextField(blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
     photo = CloudinaryField('image', blank=True, null=True)
@@ -63,11 +85,18 @@ class Faculty(models.Model):
     phone = models.CharField(max_length=20, blank=True, null=True)
     join_date = models.DateField()
     slug = models.SlugField(unique=True, blank=True)
+    search_key = models.CharField(max_length=255, blank=True, editable=False)
+
+    SEARCH_FIELDS = ('name',)
 
     class Meta:
         verbose_name_plural = "Teachers"
-        ordering = ['designation', 'name']
-        indexes = [models.Index(fields=['slug'])]
+        ordering = ['designation_rank', 'name']
+        indexes = [
+            models.Index(fields=['slug']),
+            models.Index(fields=['designation_rank', 'name']),
+            models.Index(fields=['department', 'designation_rank', 'name']),
+        ]
 
     def clean(self):
         if not self.name.strip():
@@ -75,8 +104,13 @@ class Faculty(models.Model):
         if self.email and not self.email.strip():
             raise ValidationError("Email cannot be empty if provided.")
 
+    def search_text(self):
+        return ' '.join(getattr(self, field) or '' for field in self.SEARCH_FIELDS)
+
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.designation_rank = self.DESIGNATION_RANKS.get(self.designation, len(self.DESIGNATION_RANKS))
+        self.search_key = search_key(self.search_text())
         if not self.slug:
             self.slug = slugify(self.name)[:50]
             original_slug = self.slug
@@ -92,7 +126,7 @@ class Faculty(models.Model):
     def __str__(self):
         return self.name
 
-class Notice(models.Model):
+class Notice(TrackedFieldsMixin, models.Model):
     CATEGORY_CHOICES = [
         ('routine', 'রুটিন'),
         ('academic', 'একাডেমিক'),
@@ -110,13 +144,17 @@ class Notice(models.Model):
     image = CloudinaryField('image', blank=True, null=True)
     is_important = models.BooleanField(default=False)
     slug = models.SlugField(unique=True, blank=True)
+    # Previous/next and related notices, kept current by core.navigation.
+    navigation = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         verbose_name_plural = "Notices"
         ordering = ['-publish_date']
         indexes = [
-            models.Index(fields=['category']),
+            # (date, id) seeks for previous/next and related notices.
+            models.Index(fields=['category', '-publish_date', '-id']),
             models.Index(fields=['is_important', '-publish_date']),
+            models.Index(fields=['-publish_date', '-id']),
             models.Index(fields=['slug']),
         ]
 
@@ -143,7 +181,7 @@ class Notice(models.Model):
     def __str__(self):
         return self.title
 
-class Program(models.Model):
+class Program(TrackedFieldsMixin, models.Model):
     LEVEL_CHOICES = [
         ('hsc', 'Higher Secondary'),
         ('undergraduate', 'Undergraduate'),
@@ -182,7 +220,7 @@ class Program(models.Model):
     def __str__(self):
         return f"{self.name} ({self.get_level_display()})"
 
-class Event(models.Model):
+class Event(TrackedFieldsMixin, models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     date = models.DateField()
@@ -191,19 +229,24 @@ class Event(models.Model):
     image = CloudinaryField('image', blank=True, null=True)
     is_featured = models.BooleanField(default=False)
     slug = models.SlugField(unique=True, blank=True)
+    # Previous/next events and others at the same venue (core.navigation).
+    navigation = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         verbose_name_plural = "Events"
         ordering = ['-date']
         indexes = [
             models.Index(fields=['is_featured', '-date']),
+            models.Index(fields=['-date', '-id']),
+            models.Index(fields=['location', '-date', '-id']),
             models.Index(fields=['slug']),
         ]
 
     def clean(self):
         if not self.title.strip():
             raise ValidationError("Event title cannot be empty.")
-        if self.date and self.date < timezone.now().date():
+        # Only a new or moved date must lie ahead; past events stay editable.
+        if self.date and self.has_changed('date') and self.date < timezone.now().date():
             raise ValidationError("Event date cannot be in the past.")
 
     def save(self, *args, **kwargs):
@@ -226,7 +269,7 @@ class Event(models.Model):
     def __str__(self):
         return self.title
 
-class Gallery(models.Model):
+class Gallery(TrackedFieldsMixin, models.Model):
     CATEGORY_CHOICES = [
         ('campus', 'ক্যাম্পাস'),
         ('history', 'ইতিহাস'),
@@ -238,12 +281,16 @@ class Gallery(models.Model):
     title = models.CharField(max_length=100, blank=True, null=True)
     image = CloudinaryField('image', blank=True, null=True)
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
+    description = models.TextField(blank=True, null=True)
     upload_date = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name_plural = "Gallery"
         ordering = ['-upload_date']
-        indexes = [models.Index(fields=['category'])]
+        indexes = [
+            models.Index(fields=['category']),
+            models.Index(fields=['-upload_date']),
+        ]
 
     def clean(self):
         if not self.image:
@@ -259,7 +306,7 @@ class Gallery(models.Model):
     def __str__(self):
         return self.title or f"Image ({self.category})"
 
-class Faq(models.Model):
+class Faq(TrackedFieldsMixin, models.Model):
     FAQ_PAGES = [
         ('admission', 'ভর্তি'),
         ('contact', 'যোগাযোগ'),
@@ -286,4 +333,196 @@ class Faq(models.Model):
             raise ValidationError(f"Error saving FAQ: {e}")
 
     def __str__(self):
-        return self.question
\ No newline at end of file
+        return self.question
+
+class SearchTrigram(models.Model):
+    """One trigram of a Faculty/Department/Alumnus ``search_key``; see core.search."""
+    KIND_CHOICES = [
+        ('faculty', 'Faculty'),
+        ('department', 'Department'),
+        ('alumnus', 'Alumnus'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        indexes = [
+            # Covers the lookup: trigram IN (...) grouped by object_id.
+            models.Index(fields=['kind', 'trigram', 'object_id']),
+            models.Index(fields=['kind', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}:{self.trigram}"
+
+class Exam(TrackedFieldsMixin, models.Model):
+    name = models.CharField(max_length=200)
+    year = models.PositiveSmallIntegerField()
+    is_published = models.BooleanField(default=False)
+    published_at = models.DateTimeField(null=True, blank=True, editable=False)
+    result_count = models.PositiveIntegerField(default=0, editable=False)
+    slug = models.SlugField(unique=True, blank=True)
+
+    class Meta:
+        ordering = ['-year', 'name']
+
+    def clean(self):
+        if not self.name.strip():
+            raise ValidationError("Exam name cannot be empty.")
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        if not self.slug:
+            self.slug = slugify(f"{self.name}-{self.year}")[:50]
+            original_slug = self.slug
+            counter = 1
+            while Exam.objects.filter(slug=self.slug).exclude(id=self.id).exists():
+                self.slug = f"{original_slug}-{counter}"
+                counter += 1
+        if self.is_published and not self.published_at:
+            self.published_at = timezone.now()
+        try:
+            super().save(*args, **kwargs)
+        except Exception as e:
+            raise ValidationError(f"Error saving exam: {e}")
+
+    def __str__(self):
+        return f"{self.name} {self.year}"
+
+class ExamResult(models.Model):
+    """One student's result sheet; served from the index in core.results."""
+    # Lookups by exam use the unique (exam, roll) constraint's index.
+    exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name='results', db_index=False)
+    roll = models.CharField(max_length=20)
+    name = models.CharField(max_length=100, blank=True)
+    gpa = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    grade = models.CharField(max_length=4, blank=True)
+    # Subject name -> grade, in the order of the imported sheet.
+    subjects = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ['exam', 'roll']
+        constraints = [
+            models.UniqueConstraint(fields=['exam', 'roll'], name='unique_exam_roll'),
+        ]
+
+    def clean(self):
+        # Before the (exam, roll) uniqueness check, so 00123 and 123 collide.
+        self.roll = normalize_roll(self.roll)
+
+    def save(self, *args, **kwargs):
+        # The result index looks rolls up normalized; every write path
+        # (import, admin, shell) must store them the same way.
+        self.roll = normalize_roll(self.roll)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.exam} - {self.roll}"
+
+class AdmissionApplication(models.Model):
+    """An online application, written in batches from the spool in core.admissions."""
+    BOARD_CHOICES = [
+        ('dhaka', 'Dhaka'),
+        ('rajshahi', 'Rajshahi'),
+        ('comilla', 'Comilla'),
+        ('jessore', 'Jessore'),
+        ('chittagong', 'Chittagong'),
+        ('barisal', 'Barisal'),
+        ('sylhet', 'Sylhet'),
+        ('dinajpur', 'Dinajpur'),
+        ('mymensingh', 'Mymensingh'),
+        ('madrasah', 'Madrasah'),
+        ('technical', 'Technical'),
+    ]
+    STATUS_CHOICES = [
+        ('submitted', 'Submitted'),
+        ('accepted', 'Accepted'),
+        ('rejected', 'Rejected'),
+    ]
+
+    reference = models.CharField(max_length=12, unique=True, editable=False)
+    # Lookups by program use the (program, status, -submitted_at) index.
+    program = models.ForeignKey(Program, on_delete=models.PROTECT, related_name='applications', db_index=False)
+    applicant_name = models.CharField(max_length=100)
+    father_name = models.CharField(max_length=100)
+    mother_name = models.CharField(max_length=100)
+    date_of_birth = models.DateField()
+    phone = models.CharField(max_length=20)
+    email = models.EmailField(blank=True)
+    ssc_roll = models.CharField(max_length=20)
+    ssc_board = models.CharField(max_length=20, choices=BOARD_CHOICES)
+    ssc_year = models.PositiveSmallIntegerField()
+    ssc_gpa = models.DecimalField(max_digits=3, decimal_places=2)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='submitted')
+    submitted_at = models.DateTimeField(default=timezone.now, editable=False)
+    # SHA-256 of program, board, year and roll: one application per
+    # candidate per program.
+    submission_hash = models.CharField(max_length=64, unique=True, editable=False)
+
+    class Meta:
+        ordering = ['-submitted_at']
+        indexes = [
+            models.Index(fields=['program', 'status', '-submitted_at']),
+            models.Index(fields=['ssc_roll']),
+        ]
+
+    def __str__(self):
+        return f"{self.reference} - {self.applicant_name}"
+
+class Alumnus(TrackedFieldsMixin, models.Model):
+    """A graduate in the alumni directory, usually bulk-loaded by ``import_alumni``."""
+    name = models.CharField(max_length=150)
+    batch_year = models.PositiveSmallIntegerField()
+    # Lookups by department use the (department, -batch_year, name, id) index.
+    department = models.ForeignKey(
+        Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='alumni', db_index=False,
+    )
+    # College roll or registration number; re-importing a batch updates by it.
+    roll = models.CharField(max_length=30, blank=True)
+    profession = models.CharField(max_length=150, blank=True)
+    organization = models.CharField(max_length=150, blank=True)
+    location = models.CharField(max_length=100, blank=True)
+    email = models.EmailField(blank=True)
+    bio = models.TextField(blank=True)
+    search_key = models.CharField(max_length=255, blank=True, editable=False)
+
+    SEARCH_FIELDS = ('name',)
+    # Columns shown on list pages; the bio is only loaded on the detail page.
+    LIST_FIELDS = (
+        'id', 'name', 'batch_year', 'profession', 'organization', 'location',
+        'department__id', 'department__name', 'department__slug',
+    )
+
+    class Meta:
+        verbose_name_plural = "Alumni"
+        ordering = ['-batch_year', 'name', 'id']
+        indexes = [
+            # Directory listing and keyset pagination, optionally per department.
+            models.Index(fields=['-batch_year', 'name', 'id']),
+            models.Index(fields=['department', '-batch_year', 'name', 'id']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['batch_year', 'roll'], condition=~models.Q(roll=''), name='unique_alumnus_batch_roll',
+            ),
+        ]
+
+    def clean(self):
+        if not self.name.strip():
+            raise ValidationError("Alumnus name cannot be empty.")
+
+    def search_text(self):
+        return ' '.join(getattr(self, field) or '' for field in self.SEARCH_FIELDS)
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        self.search_key = search_key(self.search_text())
+        try:
+            super().save(*args, **kwargs)
+        except Exception as e:
+            raise ValidationError(f"Error saving alumnus: {e}")
+
+    def __str__(self):
+        return f"{self.name} ({self.batch_year})"
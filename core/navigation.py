@@ -0,0 +1,171 @@
+"""
+Previous/next and related links for the notice and event pages.
+
+Each notice and event stores its links in its ``navigation`` column: the
+items just before and after it in date order, and the ``RELATED_EACH_SIDE``
+nearest items of its group (a notice's category, an event's venue) on
+either side. Detail pages render them without a query. The links are
+found with seek queries on the (date, id) indexes and refreshed on write.
+
+The related window reaches the same distance both ways, so the items an
+object links to are exactly the items that link to it. Its stored links
+therefore name everything to refresh when it moves or is deleted.
+"""
+from django.db import connections, transaction
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Event, Notice
+from .pagination import seek
+from .signals import content_changed
+
+RELATED_EACH_SIDE = 3
+
+# Model -> (date field, group field).
+SEQUENCES = {
+    Notice: ('publish_date', 'category'),
+    Event: ('date', 'location'),
+}
+
+# Above this many changed rows a full rebuild is cheaper than seeking per row.
+BULK_REBUILD = 50
+
+
+def _entry(obj, date_field):
+    return {'id': obj.pk, 'slug': obj.slug, 'title': obj.title, 'date': getattr(obj, date_field).isoformat()}
+
+
+def _neighbours(model, obj, count, grouped):
+    date_field, group_field = SEQUENCES[model]
+    queryset = model.objects.only('id', 'slug', 'title', date_field)
+    if grouped:
+        queryset = queryset.filter(**{group_field: getattr(obj, group_field)})
+    key = [getattr(obj, date_field), obj.pk]
+    older = (f'-{date_field}', '-id')
+    newer = (date_field, 'id')
+    return (
+        list(queryset.filter(seek(older, key)).order_by(*older)[:count]),
+        list(queryset.filter(seek(newer, key)).order_by(*newer)[:count]),
+    )
+
+
+def compute(model, obj):
+    date_field, _ = SEQUENCES[model]
+    older, newer = _neighbours(model, obj, 1, grouped=False)
+    related_older, related_newer = _neighbours(model, obj, RELATED_EACH_SIDE, grouped=True)
+    return {
+        'older': _entry(older[0], date_field) if older else None,
+        'newer': _entry(newer[0], date_field) if newer else None,
+        'related': [_entry(item, date_field) for item in related_newer[::-1] + related_older],
+    }
+
+
+def linked_ids(navigation):
+    ids = {item['id'] for item in (navigation or {}).get('related', ())}
+    for side in ('older', 'newer'):
+        if (navigation or {}).get(side):
+            ids.add(navigation[side]['id'])
+    return ids
+
+
+def refresh(model, pks):
+    """Recompute the links of ``pks``; returns them."""
+    date_field, group_field = SEQUENCES[model]
+    objs = list(model.objects.only('id', 'slug', 'title', date_field, group_field).filter(pk__in=pks))
+    for obj in objs:
+        obj.navigation = compute(model, obj)
+    # bulk_update sends no signals, so this doesn't announce a change itself.
+    model.objects.bulk_update(objs, ['navigation'], batch_size=500)
+    return {obj.pk: obj.navigation for obj in objs}
+
+
+def refresh_around(model, pks, previously_linked=()):
+    navigations = refresh(model, pks)
+    affected = set(previously_linked)
+    for navigation in navigations.values():
+        affected |= linked_ids(navigation)
+    refresh(model, affected - set(pks))
+
+
+def build(rows):
+    """Links for ``rows`` of (id, slug, title, date, group) in date order, by id."""
+    entries = [{'id': pk, 'slug': slug, 'title': title, 'date': date.isoformat()} for pk, slug, title, date, _ in rows]
+    groups = {}
+    for i, row in enumerate(rows):
+        groups.setdefault(row[4], []).append(i)
+
+    navigation = {}
+    for members in groups.values():
+        for position, i in enumerate(members):
+            older = members[max(0, position - RELATED_EACH_SIDE):position]
+            newer = members[position + 1:position + 1 + RELATED_EACH_SIDE]
+            navigation[rows[i][0]] = {
+                'older': entries[i - 1] if i > 0 else None,
+                'newer': entries[i + 1] if i + 1 < len(rows) else None,
+                'related': [entries[j] for j in newer[::-1] + older[::-1]],
+            }
+    return navigation
+
+
+def rebuild(model, sequence=None):
+    """Recompute every row's links in one ordered pass."""
+    date_field, group_field = sequence or SEQUENCES[model]
+    rows = model.objects.order_by(date_field, 'id').values_list('id', 'slug', 'title', date_field, group_field)
+    navigation = build(list(rows))
+    # One prepared UPDATE per row; bulk_update's CASE expressions take
+    # minutes to build for a table of notices.
+    connection = connections[model.objects.db]
+    field = model._meta.get_field('navigation')
+    sql = 'UPDATE %s SET %s = %%s WHERE %s = %%s' % (
+        connection.ops.quote_name(model._meta.db_table),
+        connection.ops.quote_name(field.column),
+        connection.ops.quote_name(model._meta.pk.column),
+    )
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            (field.get_db_prep_save(links, connection), pk) for pk, links in navigation.items()
+        ])
+    return len(navigation)
+
+
+def links(obj):
+    """The stored links of ``obj`` with their dates parsed, computing them if never stored."""
+    model = type(obj)
+    navigation = obj.navigation or compute(model, obj)
+    parse = parse_datetime if SEQUENCES[model][0] == 'publish_date' else parse_date
+
+    def parsed(entry):
+        return entry and {**entry, 'date': parse(entry['date'])}
+
+    return {
+        'older': parsed(navigation.get('older')),
+        'newer': parsed(navigation.get('newer')),
+        'related': [parsed(entry) for entry in navigation.get('related', ())],
+    }
+
+
+@receiver(content_changed)
+def refresh_navigation(sender, pks=None, fields=None, **kwargs):
+    if sender not in SEQUENCES:
+        return
+    if fields is not None and not {'title', 'slug', *SEQUENCES[sender]} & set(fields):
+        return
+    if pks is None or len(pks) > BULK_REBUILD:
+        transaction.on_commit(lambda: rebuild(sender))
+        return
+    # The links stored so far still describe the old positions.
+    previously_linked = set()
+    for navigation in sender.objects.filter(pk__in=pks).values_list('navigation', flat=True):
+        previously_linked |= linked_ids(navigation)
+    transaction.on_commit(lambda: refresh_around(sender, pks, previously_linked))
+
+
+@receiver(pre_delete)
+def unlink_deleted(sender, instance, **kwargs):
+    if sender in SEQUENCES:
+        # Read from the row: links are refreshed in the database, not on
+        # instances already in memory.
+        stored = sender.objects.filter(pk=instance.pk).values_list('navigation', flat=True).first()
+        linked = linked_ids(stored) - {instance.pk}
+        transaction.on_commit(lambda: refresh(sender, linked))
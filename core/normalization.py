@@ -0,0 +1,114 @@
+"""
+Name normalisation shared by the fuzzy search index (core.search), and
+the roll numbers exam results are stored and looked up by.
+
+``search_key`` reduces a name to a Unicode-normalised, transliterated,
+phonetically folded consonant skeleton, so that spelling variants meet:
+হোসেন, Hossain, Hussain and Hosain all become ``hsn``.
+"""
+import re
+import unicodedata
+
+# Two-character sequences that NFC leaves decomposed (nukta forms).
+BENGALI_SEQUENCES = {
+    'ড়': 'r', 'ঢ়': 'r', 'য়': 'y',
+}
+
+BENGALI_TO_LATIN = {
+    # Independent vowels
+    'অ': 'a', 'আ': 'a', 'ই': 'i', 'ঈ': 'i', 'উ': 'u', 'ঊ': 'u', 'ঋ': 'ri',
+    'এ': 'e', 'ঐ': 'oi', 'ও': 'o', 'ঔ': 'ou',
+    # Vowel signs
+    'া': 'a', 'ি': 'i', 'ী': 'i', 'ু': 'u', 'ূ': 'u', 'ৃ': 'ri',
+    'ে': 'e', 'ৈ': 'oi', 'ো': 'o', 'ৌ': 'ou',
+    # Consonants
+    'ক': 'k', 'খ': 'kh', 'গ': 'g', 'ঘ': 'gh', 'ঙ': 'ng',
+    'চ': 'ch', 'ছ': 'chh', 'জ': 'j', 'ঝ': 'jh', 'ঞ': 'n',
+    'ট': 't', 'ঠ': 'th', 'ড': 'd', 'ঢ': 'dh', 'ণ': 'n',
+    'ত': 't', 'থ': 'th', 'দ': 'd', 'ধ': 'dh', 'ন': 'n',
+    'প': 'p', 'ফ': 'ph', 'ব': 'b', 'ভ': 'bh', 'ম': 'm',
+    'য': 'j', 'র': 'r', 'ল': 'l', 'শ': 'sh', 'ষ': 'sh', 'স': 's', 'হ': 'h',
+    'ড়': 'r', 'ঢ়': 'r', 'য়': 'y', 'ৎ': 't', 'ং': 'ng', 'ঃ': 'h',
+    # Signs without a sound of their own
+    'ঁ': '', '্': '', '়': '',
+    # Digits
+    '০': '0', '১': '1', '২': '2', '৩': '3', '৪': '4',
+    '৫': '5', '৬': '6', '৭': '7', '৮': '8', '৯': '9',
+}
+
+# Common abbreviations and spellings of the same name part.
+TOKEN_ALIASES = {
+    'md': 'mohammad', 'mohd': 'mohammad', 'muhammad': 'mohammad', 'mohammed': 'mohammad',
+    'muhammed': 'mohammad', 'mst': 'mosammat', 'most': 'mosammat',
+}
+
+# Titles that carry no identifying information.
+STOP_TOKENS = {'dr', 'prof', 'mr', 'mrs', 'ms', 'sk'}
+
+# Applied in order to each Latin token.
+PHONETIC_RULES = [
+    (re.compile(r'chh|ch'), '#'),
+    (re.compile(r'kh|q|c'), 'k'),
+    (re.compile(r'#'), 'c'),
+    (re.compile(r'gh'), 'g'),
+    (re.compile(r'jh|z'), 'j'),
+    (re.compile(r'th'), 't'),
+    (re.compile(r'dh'), 'd'),
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'bh|v'), 'b'),
+    (re.compile(r'sh'), 's'),
+    (re.compile(r'ng'), 'n'),
+    (re.compile(r'x'), 'ks'),
+]
+
+VOWELS = re.compile(r'[aeiouwy]')
+REPEATS = re.compile(r'(.)\1+')
+NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def transliterate(text):
+    for sequence, latin in BENGALI_SEQUENCES.items():
+        text = text.replace(sequence, latin)
+    text = ''.join(BENGALI_TO_LATIN.get(char, char) for char in text)
+    # Strip accents from any remaining Latin letters.
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def fold_token(token):
+    token = TOKEN_ALIASES.get(token, token)
+    if token.isdigit():
+        return token
+    for pattern, replacement in PHONETIC_RULES:
+        token = pattern.sub(replacement, token)
+    # Keep a leading vowel as a marker, drop the rest: vowels are where
+    # romanisations of the same name disagree most.
+    head = 'a' if VOWELS.match(token) else token[:1]
+    token = head + VOWELS.sub('', token[1:])
+    return REPEATS.sub(r'\1', token)
+
+
+def search_key(text):
+    """Normalised, transliterated, phonetically folded form of ``text``."""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFC', text).casefold()
+    text = transliterate(text)
+    tokens = [token for token in NON_ALNUM.split(text) if token and token not in STOP_TOKENS]
+    return ' '.join(fold_token(token) for token in tokens)
+
+
+def trigrams(key):
+    grams = set()
+    for token in key.split():
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def normalize_roll(roll):
+    """Rolls are compared without surrounding spaces, case or leading zeros."""
+    roll = str(roll).strip().upper()
+    if roll.isdigit():
+        return roll.lstrip('0') or '0'
+    return roll
@@ -0,0 +1,137 @@
+"""
+Keyset (seek) pagination for long, stably ordered lists.
+
+An OFFSET page reads and throws away every row before it, so deep pages
+of a large table get slower and slower. A keyset page instead starts
+from the sort key of the last row shown, ``WHERE key > :last ORDER BY key
+LIMIT n``, which an index on the key answers directly at any depth. The
+position travels in the opaque ``?after=`` / ``?before=`` cursors.
+"""
+import base64
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, model, ordering):
+    """The sort key in ``token`` as values of the ordering's fields, or None if it isn't one."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    # Cursors come from the URL: anything that isn't a value of the field
+    # (or is NULL, which the seek can't compare) is treated as no cursor.
+    try:
+        values = [
+            model._meta.get_field(field.lstrip('-')).to_python(value)
+            for field, value in zip(ordering, values)
+        ]
+    except (ValidationError, TypeError, ValueError):
+        return None
+    if any(value is None for value in values):
+        return None
+    return values
+
+
+def seek(ordering, values, backwards=False):
+    """Filter for the rows that follow ``values`` in ``ordering`` (or precede them when ``backwards``)."""
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        descending = field.startswith('-') != backwards
+        step = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[i]})
+        for previous, value in zip(ordering[:i], values[:i]):
+            step &= Q(**{previous.lstrip('-'): value})
+        condition |= step
+    # The bound on the leading column alone lets the database start an
+    # index range scan instead of evaluating the OR over every row.
+    first = ordering[0]
+    lead = 'lte' if first.startswith('-') != backwards else 'gte'
+    return Q(**{f"{first.lstrip('-')}__{lead}": values[0]}) & condition
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    has_next: bool
+    has_previous: bool
+    next_cursor: str = None
+    previous_cursor: str = None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def paginate(queryset, ordering, per_page, after=None, before=None):
+    """One page of ``queryset`` in ``ordering`` after or before a cursor."""
+    ordering = tuple(ordering)
+
+    def key(obj):
+        return [getattr(obj, field.lstrip('-')) for field in ordering]
+
+    cursor = decode_cursor(before, queryset.model, ordering) if before else None
+    if cursor is not None:
+        reverse = [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+        rows = list(queryset.filter(seek(ordering, cursor, backwards=True)).order_by(*reverse)[:per_page + 1])
+        has_previous = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        cursor = decode_cursor(after, queryset.model, ordering) if after else None
+        if cursor is not None:
+            queryset = queryset.filter(seek(ordering, cursor))
+        rows = list(queryset.order_by(*ordering)[:per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_previous = cursor is not None
+
+    return KeysetPage(
+        object_list=rows,
+        has_next=has_next and bool(rows),
+        has_previous=has_previous and bool(rows),
+        next_cursor=encode_cursor(key(rows[-1])) if rows else None,
+        previous_cursor=encode_cursor(key(rows[0])) if rows else None,
+    )
+
+
+class KeysetPaginationMixin:
+    """
+    ListView pagination by cursor instead of page number.
+
+    Set ``keyset_ordering`` to a unique ordering backed by an index (end it
+    with ``id``). The context gets ``page_obj`` as a KeysetPage plus
+    ``next_url``/``previous_url`` that keep the other query parameters.
+    """
+    keyset_ordering = ('id',)
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate(
+            queryset, self.keyset_ordering, page_size,
+            after=self.request.GET.get('after'), before=self.request.GET.get('before'),
+        )
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if isinstance(page, KeysetPage):
+            params = self.request.GET.copy()
+            params.pop('after', None)
+            params.pop('before', None)
+            for name, cursor, available in (
+                ('next_url', ('after', page.next_cursor), page.has_next),
+                ('previous_url', ('before', page.previous_cursor), page.has_previous),
+            ):
+                if available:
+                    query = params.copy()
+                    query[cursor[0]] = cursor[1]
+                    context[name] = f'?{query.urlencode()}'
+        return context
@@ -0,0 +1,95 @@
+"""
+Precache manifest for the service worker (templates/sw.js).
+
+Every entry carries a revision: a hash of the static file's bytes, or of
+what a page renders (its fields, its previous/next links and the
+stylesheet it links). The manifest is embedded in sw.js, so any revision
+change (a notice is edited, output.css is rebuilt) changes the worker's
+bytes and browsers install the new version. On install the worker only
+downloads entries whose revision it doesn't already hold.
+"""
+import hashlib
+import json
+from functools import lru_cache
+
+from cloudinary import CloudinaryResource
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.urls import reverse
+
+from . import reference
+from .critical_css import load_manifest
+from .models import Notice
+
+PRECACHE_STATIC = ('css/output.css', 'images/logo.png')
+PRECACHE_NOTICES = getattr(settings, 'PWA_PRECACHE_NOTICES', 20)
+
+# Pages served stale-while-revalidate by the worker: shown from cache at
+# once and refreshed in the background for the next visit. Precached pages
+# are served the same way; only static files are served cache-first.
+LIST_PAGES = ('core:home', 'core:notices', 'core:events', 'core:admission')
+
+
+def _text(part):
+    # An empty CloudinaryField comes back as a resource whose str() is None.
+    if isinstance(part, CloudinaryResource):
+        part = part.public_id
+    return '' if part is None else str(part)
+
+
+def _digest(*parts):
+    return hashlib.sha256('\x1f'.join(_text(part) for part in parts).encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=None)
+def static_revision(path):
+    found = finders.find(path)
+    if not found:
+        return None
+    with open(found, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def precache_entries():
+    paths = list(PRECACHE_STATIC)
+    css = load_manifest()
+    if css:
+        # Pages load the purged stylesheet once build_css has run.
+        paths[paths.index('css/output.css')] = css['stylesheet']
+    entries = [{'url': static(path), 'revision': static_revision(path)} for path in paths]
+    # Every page links the stylesheet, so a rebuilt one changes them all.
+    stylesheet = entries[0]['revision']
+
+    faqs = [(faq.id, faq.question, faq.ans) for faq in reference.faqs('admission')]
+    entries.append({'url': reverse('core:admission'), 'revision': _digest(stylesheet, *faqs)})
+
+    notices = Notice.objects.order_by('-publish_date').values_list(
+        'slug', 'title', 'description', 'category', 'publish_date', 'document', 'image', 'is_important',
+        'navigation',
+    )[:PRECACHE_NOTICES]
+    pages = [
+        {
+            'url': reverse('core:notice_detail', args=[notice[0]]),
+            'revision': _digest(stylesheet, *notice[:-1], json.dumps(notice[-1], sort_keys=True)),
+        }
+        for notice in notices
+    ]
+    # The list pages are refreshed by the worker on every visit; precaching
+    # them only guarantees a first offline copy.
+    listed = _digest(*(page['revision'] for page in pages))
+    entries.append({'url': reverse('core:home'), 'revision': listed})
+    entries.append({'url': reverse('core:notices'), 'revision': listed})
+    return entries + pages
+
+
+def service_worker_config():
+    """The JSON the worker is built with, plus its version."""
+    entries = precache_entries()
+    config = {
+        'precache': entries,
+        'listPages': [reverse(name) for name in LIST_PAGES],
+        'offlinePage': reverse('core:notices'),
+    }
+    version = _digest(json.dumps(config, sort_keys=True))
+    return version, config
@@ -0,0 +1,135 @@
+"""
+Reference data (departments, FAQs) held in each worker's memory.
+
+These rows change a few times a term but are read by almost every list
+and info page. Each kind is loaded once into compact tuples and kept
+until its version changes. The version lives outside the process, so a
+save in one worker is seen by all of them: by default it is a file in
+``REFERENCE_VERSION_DIR`` that is replaced on every change (checking it
+is one ``stat()``, not a query); with ``REFERENCE_CACHE_ALIAS`` it is a
+key in a cache shared by the workers.
+"""
+import os
+import threading
+import uuid
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.dispatch import receiver
+
+from .middleware import record_cache
+from .models import Department, Faq
+from .signals import content_changed
+
+
+class DepartmentRef(NamedTuple):
+    id: int
+    name: str
+    slug: str
+    code: str
+
+    def __str__(self):
+        return self.name
+
+
+class FaqRef(NamedTuple):
+    id: int
+    question: str
+    ans: str
+    page: str
+
+
+def _load_departments():
+    rows = Department.objects.order_by('name').values_list('id', 'name', 'slug', 'code')
+    return tuple(DepartmentRef(*row) for row in rows)
+
+
+def _load_faqs():
+    faqs = {}
+    for row in Faq.objects.order_by('question').values_list('id', 'question', 'ans', 'page'):
+        faqs.setdefault(row[3], []).append(FaqRef(*row))
+    return {page: tuple(rows) for page, rows in faqs.items()}
+
+
+LOADERS = {'departments': _load_departments, 'faqs': _load_faqs}
+MODEL_KINDS = {Department: 'departments', Faq: 'faqs'}
+
+_store = {}
+_lock = threading.Lock()
+
+
+def _version_path(kind):
+    return os.path.join(settings.REFERENCE_VERSION_DIR, f'{kind}.version')
+
+
+def current_version(kind):
+    alias = getattr(settings, 'REFERENCE_CACHE_ALIAS', None)
+    if alias:
+        cache = caches[alias]
+        # An evicted key comes back as a new version, which only costs a reload.
+        cache.add(f'reference:{kind}', uuid.uuid4().hex, None)
+        return cache.get(f'reference:{kind}')
+    try:
+        stat = os.stat(_version_path(kind))
+    except FileNotFoundError:
+        return None
+    # bump() replaces the file, so the inode changes even within one mtime tick.
+    return f'{stat.st_ino}-{stat.st_mtime_ns}'
+
+
+def bump(kind):
+    """Mark ``kind`` as changed for every worker."""
+    alias = getattr(settings, 'REFERENCE_CACHE_ALIAS', None)
+    if alias:
+        caches[alias].set(f'reference:{kind}', uuid.uuid4().hex, None)
+    else:
+        path = _version_path(kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            f.write(uuid.uuid4().hex)
+        os.replace(tmp, path)
+    with _lock:
+        _store.pop(kind, None)
+
+
+def get(kind):
+    version = current_version(kind)
+    entry = _store.get(kind)
+    if entry is not None and entry[0] == version:
+        record_cache(True)
+        return entry[1]
+    record_cache(False)
+    with _lock:
+        entry = _store.get(kind)
+        if entry is None or entry[0] != version:
+            # The version is read before loading: a change committed while
+            # loading leaves the stored version stale, so it reloads again.
+            entry = (version, LOADERS[kind]())
+            _store[kind] = entry
+    return entry[1]
+
+
+def departments():
+    return get('departments')
+
+
+def department_id(value):
+    """The id of the department with this id or slug, or None."""
+    for department in departments():
+        if value == department.slug or value == str(department.id):
+            return department.id
+    return None
+
+
+def faqs(page):
+    return get('faqs').get(page, ())
+
+
+@receiver(content_changed)
+def bump_on_change(sender, **kwargs):
+    kind = MODEL_KINDS.get(sender)
+    if kind is not None:
+        transaction.on_commit(lambda: bump(kind))
@@ -0,0 +1,276 @@
+"""
+Exam result lookups served from memory-mapped index files.
+
+Publishing an exam writes its results to ``RESULTS_INDEX_DIR`` as one
+read-only file: fixed-width roll numbers in sorted order, then an
+(offset, length) pair per roll, then each result pre-encoded as JSON. A
+worker maps the file and answers a lookup with a binary search over the
+rolls and a slice of the JSON; there is no query and nothing to decode.
+Every worker on the host shares the same pages through the OS page
+cache, so memory stays flat as workers are added.
+
+``exams.json`` in the same directory lists the published exams. Workers
+stat it at most every ``RESULTS_INDEX_CHECK_INTERVAL`` seconds and
+reopen indexes whose version changed.
+"""
+import bisect
+import json
+import logging
+import mmap
+import os
+import random
+import struct
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .middleware import record_cache
+from .models import Exam, ExamResult
+from .normalization import normalize_roll
+from .signals import content_changed
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'DGR1'
+HEADER = struct.Struct('<4sII')  # magic, row count, roll width
+ENTRY = struct.Struct('<II')  # offset and length of the JSON record
+MANIFEST = 'exams.json'
+
+
+def index_dir():
+    return getattr(settings, 'RESULTS_INDEX_DIR', os.path.join(settings.BASE_DIR, '.results'))
+
+
+def encode_result(roll, name, gpa, grade, subjects):
+    return json.dumps(
+        {'roll': roll, 'name': name, 'gpa': None if gpa is None else str(gpa), 'grade': grade, 'subjects': subjects},
+        ensure_ascii=False, separators=(',', ':'),
+    ).encode()
+
+
+def _atomic_write(path, write):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.chmod(tmp, 0o644)  # mkstemp creates files only the owner can read
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def build_index(exam):
+    """Write the index file for ``exam`` and return its version."""
+    keys, records = [], []
+    rows = (
+        ExamResult.objects.filter(exam=exam)
+        .values_list('roll', 'name', 'gpa', 'grade', 'subjects')
+        .iterator(chunk_size=5000)
+    )
+    for roll, name, gpa, grade, subjects in rows:
+        # Rows saved before ExamResult normalized its roll still index under the key lookups use.
+        keys.append(normalize_roll(roll).encode())
+        records.append(encode_result(roll, name, gpa, grade, subjects))
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    width = max((len(key) for key in keys), default=1)
+
+    def write(f):
+        f.write(HEADER.pack(MAGIC, len(keys), width))
+        f.write(b''.join(keys[i].ljust(width, b'\0') for i in order))
+        offset = 0
+        for i in order:
+            f.write(ENTRY.pack(offset, len(records[i])))
+            offset += len(records[i])
+        for i in order:
+            f.write(records[i])
+
+    path = os.path.join(index_dir(), f'exam-{exam.pk}.idx')
+    _atomic_write(path, write)
+    return os.stat(path).st_mtime_ns
+
+
+def write_manifest():
+    exams = []
+    for exam in Exam.objects.filter(is_published=True):
+        path = os.path.join(index_dir(), f'exam-{exam.pk}.idx')
+        if os.path.exists(path):
+            exams.append({
+                'slug': exam.slug, 'name': exam.name, 'year': exam.year,
+                'file': os.path.basename(path), 'version': os.stat(path).st_mtime_ns,
+            })
+    _atomic_write(
+        os.path.join(index_dir(), MANIFEST),
+        lambda f: f.write(json.dumps(exams, ensure_ascii=False).encode()),
+    )
+
+
+def prefault(path):
+    """Read the file once so its pages are cached before students arrive."""
+    with open(path, 'rb') as f:
+        while f.read(1 << 20):
+            pass
+
+
+def publish(exam_ids=None):
+    """Rebuild the indexes of published exams (all, or ``exam_ids``) and drop unpublished ones."""
+    exams = Exam.objects.all() if exam_ids is None else Exam.objects.filter(pk__in=exam_ids)
+    for exam_id in set(exam_ids or ()) - set(exams.values_list('pk', flat=True)):
+        # Deleted exams.
+        path = os.path.join(index_dir(), f'exam-{exam_id}.idx')
+        if os.path.exists(path):
+            os.remove(path)
+    for exam in exams:
+        path = os.path.join(index_dir(), f'exam-{exam.pk}.idx')
+        if exam.is_published:
+            started = time.perf_counter()
+            build_index(exam)
+            prefault(path)
+            logger.info(f"Built result index for {exam} in {time.perf_counter() - started:.2f}s")
+        elif os.path.exists(path):
+            os.remove(path)
+    write_manifest()
+
+
+class _Rolls:
+    """The sorted roll column of an index, as a sequence for ``bisect``."""
+
+    def __init__(self, buffer, count, width):
+        self.buffer, self.count, self.width = buffer, count, width
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        start = HEADER.size + i * self.width
+        return self.buffer[start:start + self.width]
+
+
+class ResultIndex:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.width = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a result index")
+        self.rolls = _Rolls(self.buffer, self.count, self.width)
+        self.entries_start = HEADER.size + self.count * self.width
+        self.data_start = self.entries_start + self.count * ENTRY.size
+
+    def __len__(self):
+        return self.count
+
+    def lookup(self, roll):
+        """The JSON record for ``roll`` as bytes, or None."""
+        key = normalize_roll(roll).encode()
+        if not key or len(key) > self.width:
+            return None
+        key = key.ljust(self.width, b'\0')
+        i = bisect.bisect_left(self.rolls, key)
+        if i == self.count or self.rolls[i] != key:
+            return None
+        offset, length = ENTRY.unpack_from(self.buffer, self.entries_start + i * ENTRY.size)
+        start = self.data_start + offset
+        return self.buffer[start:start + length]
+
+    def sample(self, n):
+        picks = random.sample(range(self.count), min(n, self.count))
+        return [self.rolls[i].rstrip(b'\0').decode() for i in picks]
+
+
+class _Registry:
+    """Per-worker view of the published exams and their open indexes."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked = None
+        self.manifest_version = None
+        self.exams = []
+        self.indexes = {}
+
+    def refresh(self):
+        now = time.monotonic()
+        if self.checked is not None and now - self.checked < getattr(settings, 'RESULTS_INDEX_CHECK_INTERVAL', 2):
+            return
+        with self.lock:
+            self.checked = now
+            path = os.path.join(index_dir(), MANIFEST)
+            try:
+                version = os.stat(path).st_mtime_ns
+            except FileNotFoundError:
+                self.exams, self.indexes, self.manifest_version = [], {}, None
+                return
+            if version == self.manifest_version:
+                return
+            with open(path, encoding='utf-8') as f:
+                exams = json.load(f)
+            versions = {exam['slug']: exam['version'] for exam in exams}
+            self.indexes = {
+                slug: (index, v) for slug, (index, v) in self.indexes.items() if versions.get(slug) == v
+            }
+            self.exams, self.manifest_version = exams, version
+
+    def index(self, slug):
+        self.refresh()
+        cached = self.indexes.get(slug)
+        if cached:
+            return cached[0]
+        exam = next((exam for exam in self.exams if exam['slug'] == slug), None)
+        if exam is None:
+            return None
+        with self.lock:
+            index = ResultIndex(os.path.join(index_dir(), exam['file']))
+            self.indexes[slug] = (index, exam['version'])
+        return index
+
+
+_registry = _Registry()
+
+
+def published_exams():
+    _registry.refresh()
+    return _registry.exams
+
+
+def lookup(exam_slug, roll):
+    """The JSON-encoded result for ``roll`` in a published exam, or None."""
+    index = _registry.index(exam_slug)
+    # The index answers found and missing rolls alike; no index means
+    # an unknown or unpublished exam.
+    record_cache(index is not None)
+    return index.lookup(roll) if index else None
+
+
+def sample_rolls(n=200):
+    """``(exam slug, roll)`` pairs for load testing."""
+    exams = published_exams()
+    if not exams:
+        return []
+    slug = exams[0]['slug']
+    return [(slug, roll) for roll in _registry.index(slug).sample(n)]
+
+
+def _publish_on_commit(exam_ids):
+    exam_ids = set(exam_ids) if exam_ids is not None else None
+    transaction.on_commit(lambda: publish(exam_ids))
+
+
+@receiver(content_changed)
+def republish_exams(sender, pks=None, **kwargs):
+    if sender is Exam:
+        _publish_on_commit(pks)
+
+
+@receiver(post_save, sender=ExamResult)
+def republish_exam_of_result(sender, instance, **kwargs):
+    # One-off corrections from the admin; bulk imports publish once at the
+    # end. Deletes are announced by ExamResultAdmin so that clearing an
+    # exam's results stays a single fast DELETE.
+    _publish_on_commit([instance.exam_id])
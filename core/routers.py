@@ -0,0 +1,50 @@
+"""
+Read-only database connections for public pages.
+
+With the SQLite profile in settings, ``DATABASES['readonly']`` opens the
+same file with ``PRAGMA query_only``. ``ReadOnlyMiddleware`` marks GET and
+HEAD requests to the site's own views, and their reads go through that
+alias: a public page can never write, and its reads never queue behind
+the write transaction the default connection may be holding. Everything
+else (admin, POSTs, reads inside ``transaction.atomic``) keeps using the
+default connection, so it sees its own uncommitted writes.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+READ_ONLY_ALIAS = 'readonly'
+
+_route_reads = ContextVar('core_route_reads', default=False)
+
+
+def route_reads(enabled):
+    """Send this thread's reads to the read-only alias (or stop doing so)."""
+    # Checked per request so tests can turn it off: under TestCase the
+    # second connection can't see the test's uncommitted rows.
+    enabled = enabled and getattr(settings, 'SQLITE_READ_ONLY_VIEWS', False)
+    _route_reads.set(enabled and READ_ONLY_ALIAS in connections)
+
+
+class ReadOnlyRouter:
+    def db_for_read(self, model, **hints):
+        if _route_reads.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return READ_ONLY_ALIAS
+        # Said explicitly: otherwise a related lookup would follow an
+        # instance loaded on the read-only alias back to it.
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, READ_ONLY_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == READ_ONLY_ALIAS:
+            return False
+        return None
@@ -0,0 +1,93 @@
+"""
+Transliteration-aware fuzzy name search for faculty, departments and alumni.
+
+Each row's ``search_key`` (see core.normalization) is split into padded
+trigrams stored in ``SearchTrigram``. A lookup is an indexed
+``trigram IN (...)`` scan grouped by object, so its cost follows the query
+length rather than the size of the roster.
+"""
+from django.db import connection, transaction
+from django.db.models import Count
+from django.dispatch import receiver
+
+from .models import Alumnus, Department, Faculty, SearchTrigram
+from .normalization import search_key, trigrams
+from .signals import content_changed
+
+
+INDEXED_MODELS = {
+    'faculty': Faculty,
+    'department': Department,
+    'alumnus': Alumnus,
+}
+
+
+def _kind_for(model):
+    return next((kind for kind, m in INDEXED_MODELS.items() if m is model), None)
+
+
+def update_index(kind, pks=None):
+    """
+    Recompute ``search_key`` and trigrams for ``pks`` of one indexed model,
+    or for all of its rows when ``pks`` is None.
+    """
+    model = INDEXED_MODELS[kind]
+    queryset = model.objects.all() if pks is None else model.objects.filter(pk__in=pks)
+    with transaction.atomic():
+        stale = SearchTrigram.objects.filter(kind=kind)
+        if pks is not None:
+            stale = stale.filter(object_id__in=pks)
+        stale.delete()
+
+        changed, rows = [], []
+        for obj in queryset.only('pk', 'search_key', *model.SEARCH_FIELDS).iterator(chunk_size=2000):
+            key = search_key(obj.search_text())
+            if key != obj.search_key:
+                # Rows written by bulk_create never went through save().
+                obj.search_key = key
+                changed.append(obj)
+            rows.extend(SearchTrigram(kind=kind, object_id=obj.pk, trigram=gram) for gram in trigrams(key))
+            if len(rows) >= 5000:
+                SearchTrigram.objects.bulk_create(rows)
+                rows = []
+        SearchTrigram.objects.bulk_create(rows)
+        model.objects.bulk_update(changed, ['search_key'], batch_size=1000)
+        if pks is None:
+            analyze()
+
+
+def analyze():
+    """
+    Refresh the planner statistics of the trigram table. Without them a
+    freshly bulk-loaded table is read through the (kind, object_id) index,
+    visiting every trigram of the kind instead of the query's few.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE {SearchTrigram._meta.db_table}')
+
+
+def fuzzy_ids(kind, query, min_similarity=0.5, limit=500):
+    """
+    Primary keys of ``kind`` rows whose key shares at least
+    ``min_similarity`` of the query's trigrams, best matches first.
+    """
+    grams = trigrams(search_key(query))
+    if not grams:
+        return []
+    needed = max(1, round(len(grams) * min_similarity))
+    matches = (
+        SearchTrigram.objects.filter(kind=kind, trigram__in=grams)
+        .values('object_id')
+        .annotate(hits=Count('object_id'))
+        .filter(hits__gte=needed)
+        .order_by('-hits')[:limit]
+    )
+    return [row['object_id'] for row in matches]
+
+
+@receiver(content_changed)
+def refresh_search_index(sender, pks=None, fields=None, **kwargs):
+    kind = _kind_for(sender)
+    # search_key is rewritten whenever a searched field changes.
+    if kind is not None and (fields is None or 'search_key' in fields):
+        transaction.on_commit(lambda: update_index(kind, pks))
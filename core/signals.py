@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .models import Department, Faculty, Notice, Program, Event, Gallery, Faq, Exam, Alumnus
+
+# Sent once per write batch with ``sender`` (the model class) and ``pks``
+# (a list of primary keys, or None when the whole table may have changed).
+# Row saves also pass ``fields``, the columns written, when only some were.
+# Caches and search indexes listen to this instead of post_save so that bulk
+# updates from the admin invalidate once per batch rather than once per row.
+content_changed = Signal()
+
+CONTENT_MODELS = (Department, Faculty, Notice, Program, Event, Gallery, Faq, Exam, Alumnus)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def announce_content_change(sender, instance, **kwargs):
+    if sender in CONTENT_MODELS:
+        content_changed.send(sender=sender, pks=[instance.pk], fields=kwargs.get('update_fields'))
@@ -0,0 +1,93 @@
+"""
+Denormalised department profile stats.
+
+``Department.faculty_count``, ``program_count``, ``head_name`` and
+``head_photo`` let the department list and detail pages render without
+counting or joining the faculty and program tables. They are recomputed
+here, in one UPDATE per batch, whenever a faculty member, program or
+department is written.
+"""
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Department, Faculty, Program
+from .signals import content_changed
+
+TRACKED_MODELS = (Faculty, Program)
+
+
+def _count(model):
+    rows = (
+        model.objects.filter(department=OuterRef('pk'))
+        .order_by()
+        .values('department')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
+
+
+def refresh_department_stats(department_ids=None):
+    """Recompute the stats of ``department_ids``, or of every department."""
+    departments = Department.objects.all()
+    if department_ids is not None:
+        department_ids = {pk for pk in department_ids if pk is not None}
+        if not department_ids:
+            return
+        departments = departments.filter(pk__in=department_ids)
+    head = Faculty.objects.filter(pk=OuterRef('department_head'))
+    departments.update(
+        faculty_count=_count(Faculty),
+        program_count=_count(Program),
+        head_name=Coalesce(Subquery(head.values('name')[:1]), Value('')),
+        head_photo=Subquery(head.values('photo')[:1]),
+    )
+
+
+def _refresh_on_commit(department_ids):
+    department_ids = set(department_ids)
+    transaction.on_commit(lambda: refresh_department_stats(department_ids))
+
+
+@receiver(post_init)
+def remember_department(sender, instance, **kwargs):
+    if sender in TRACKED_MODELS:
+        # Read from __dict__ so querysets using only() don't fetch the column.
+        instance._loaded_department_id = instance.__dict__.get('department_id')
+
+
+@receiver(pre_delete, sender=Faculty)
+def remember_headed_departments(sender, instance, **kwargs):
+    # department_head is SET_NULL, so the link is gone by post_delete.
+    instance._headed_department_ids = list(
+        Department.objects.filter(department_head=instance).values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def update_department_stats(sender, instance, **kwargs):
+    if sender is Department:
+        _refresh_on_commit([instance.pk])
+        return
+    if sender not in TRACKED_MODELS:
+        return
+    department_ids = {instance.department_id, getattr(instance, '_loaded_department_id', None)}
+    if sender is Faculty:
+        department_ids.update(getattr(instance, '_headed_department_ids', ()))
+        if kwargs.get('signal') is post_save:
+            department_ids.update(
+                Department.objects.filter(department_head=instance).values_list('pk', flat=True)
+            )
+    instance._loaded_department_id = instance.department_id
+    _refresh_on_commit(department_ids)
+
+
+@receiver(content_changed)
+def refresh_after_bulk_change(sender, pks=None, **kwargs):
+    # Row-level writes are handled above; this covers bulk loads.
+    if pks is None and sender in TRACKED_MODELS + (Department,):
+        transaction.on_commit(refresh_department_stats)
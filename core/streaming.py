@@ -0,0 +1,152 @@
+"""
+Progressive rendering of Django templates.
+
+``iter_template`` walks the same node tree ``Template.render`` would, but
+yields output as it goes: everything up to the ``content`` block (the
+``<head>`` with the stylesheet link, the announcement banner and the site
+header) leaves as one chunk before any of the page body is rendered, and
+the body follows in chunks of at least ``STREAM_CHUNK_SIZE`` characters.
+"""
+import itertools
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.template.context import make_context
+from django.template.loader_tags import BLOCK_CONTEXT_KEY, BlockContext, BlockNode, ExtendsNode
+from django.template.base import TextNode
+from django.template.response import TemplateResponse
+
+STREAM_CHUNK_SIZE = 4096
+
+# Blocks that hold the slow, data-driven part of a page. Output is flushed
+# right before they start, and their top-level nodes are streamed one by one.
+STREAMED_BLOCKS = ('content',)
+
+
+def _iter_nodes(nodelist, context):
+    for node in nodelist:
+        if isinstance(node, BlockNode) and node.name in STREAMED_BLOCKS:
+            yield None  # flush marker
+            yield from _iter_block(node, context)
+        else:
+            yield node.render_annotated(context)
+
+
+def _iter_block(node, context):
+    # Mirrors BlockNode.render() with the nodelist rendered lazily.
+    block_context = context.render_context.get(BLOCK_CONTEXT_KEY)
+    with context.push():
+        if block_context is None:
+            context['block'] = node
+            yield from _iter_nodes(node.nodelist, context)
+            return
+        push = block = block_context.pop(node.name)
+        if block is None:
+            block = node
+        block = type(node)(block.name, block.nodelist)
+        block.context = context
+        context['block'] = block
+        yield from _iter_nodes(block.nodelist, context)
+        if push is not None:
+            block_context.push(node.name, push)
+
+
+def _iter_template(template, context):
+    # Mirrors ExtendsNode.render() for each level of {% extends %}.
+    extends = next((n for n in template.nodelist if isinstance(n, ExtendsNode)), None)
+    if extends is None:
+        yield from _iter_nodes(template.nodelist, context)
+        return
+
+    parent = extends.get_parent(context)
+    if BLOCK_CONTEXT_KEY not in context.render_context:
+        context.render_context[BLOCK_CONTEXT_KEY] = BlockContext()
+    block_context = context.render_context[BLOCK_CONTEXT_KEY]
+    block_context.add_blocks(extends.blocks)
+    for node in parent.nodelist:
+        if not isinstance(node, TextNode):
+            if not isinstance(node, ExtendsNode):
+                block_context.add_blocks(
+                    {n.name: n for n in parent.nodelist.get_nodes_by_type(BlockNode)}
+                )
+            break
+    with context.render_context.push_state(parent, isolated_context=False):
+        yield from _iter_template(parent, context)
+
+
+def iter_template(template, context, request=None):
+    """
+    Render a backend template (as returned by ``get_template``) to an
+    iterator of strings.
+    """
+    engine_template = template.template
+    context = make_context(context, request, autoescape=template.backend.engine.autoescape)
+    buffer = []
+    size = 0
+    in_body = False
+    with context.render_context.push_state(engine_template):
+        with context.bind_template(engine_template):
+            context.template_name = engine_template.name
+            for piece in _iter_template(engine_template, context):
+                if piece is None:
+                    in_body = True
+                    if buffer:
+                        yield ''.join(buffer)
+                        buffer, size = [], 0
+                    continue
+                buffer.append(piece)
+                size += len(piece)
+                if in_body and size >= STREAM_CHUNK_SIZE:
+                    yield ''.join(buffer)
+                    buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+class StreamingTemplateResponse(TemplateResponse):
+    """
+    A TemplateResponse whose ``render()`` returns a StreamingHttpResponse.
+
+    The first chunk (up to the ``content`` block) is rendered eagerly so
+    that template errors in the layout still produce a normal error page
+    and flash messages are consumed before MessageMiddleware runs.
+    """
+
+    def render(self):
+        if self._is_rendered:
+            return self
+        template = self.resolve_template(self.template_name)
+        chunks = iter_template(template, self.context_data, self._request)
+        first = next(chunks, '')
+
+        response = StreamingHttpResponse(itertools.chain([first], chunks), status=self.status_code)
+        for header, value in self.headers.items():
+            response[header] = value
+        response.cookies = self.cookies
+        self._is_rendered = True
+        for post_callback in self._post_render_callbacks:
+            post_callback(self)
+        return response
+
+
+class StreamingResponseMixin:
+    """
+    Stream template views when ``STREAMING_RESPONSES`` is on.
+
+    Falls back to a regular TemplateResponse for non-GET requests and when
+    the cache middleware is going to store the page, since only a complete
+    body can be cached.
+    """
+
+    def should_stream(self):
+        request = self.request
+        return (
+            getattr(settings, 'STREAMING_RESPONSES', False)
+            and request.method == 'GET'
+            and not getattr(request, '_cache_update_cache', False)
+        )
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.should_stream():
+            self.response_class = StreamingTemplateResponse
+        return super().render_to_response(context, **response_kwargs)
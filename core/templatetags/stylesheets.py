@@ -0,0 +1,31 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from core.critical_css import SOURCE_STYLESHEET, critical_css, load_manifest
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def stylesheets(context):
+    """
+    Inline the page's critical CSS and load the purged site stylesheet
+    without blocking rendering. Falls back to a plain link to output.css
+    until ``manage.py build_css`` has been run.
+    """
+    manifest = load_manifest()
+    if not manifest:
+        return format_html('<link rel="stylesheet" href="{}">', static(SOURCE_STYLESHEET))
+    href = static(manifest['stylesheet'])
+    critical = critical_css(context.template_name)
+    if critical is None:
+        return format_html('<link rel="stylesheet" href="{}">', href)
+    return format_html(
+        '<style>{}</style>\n'
+        '    <link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        '    <noscript><link rel="stylesheet" href="{}"></noscript>',
+        # Built from our own stylesheet; "</" cannot occur in it.
+        mark_safe(critical), href, href,
+    )
@@ -1,3 +1,960 @@
-from django.test import TestCase
+import datetime
+import io
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import zipfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings as django_settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.migrations.writer import MigrationWriter
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+
+from . import admin, admissions, critical_css, export, metrics, navigation, reference, results, routers, throttling
+from .admin import GalleryImportForm
+from .facets import grouped_counts
+from .management.commands import index_advice
+from .forms import INPUT_CLASSES
+from .middleware import ReadOnlyMiddleware
+from .models import AdmissionApplication, Alumnus, Department, Exam, ExamResult, Faculty, Notice, Program
+from .normalization import search_key
+from .pagination import encode_cursor, paginate
+from .pwa import precache_entries
+from .search import fuzzy_ids
+from .signals import content_changed
+from .streaming import StreamingTemplateResponse
+from .views import FacultyListView, HomeView
+
+
+# Views read on the default connection: under TestCase the read-only
+# connection can't see the rows a test has not committed.
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+class ServiceWorkerTests(TestCase):
+    def test_notice_without_document_or_image(self):
+        notice = Notice.objects.create(title="Holiday", description="Closed on Friday.", category='other')
+        # Older rows hold '' rather than NULL, which loads as a CloudinaryResource whose str() is None.
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE core_notice SET document = '', image = '' WHERE id = %s", [notice.pk])
+
+        urls = [entry['url'] for entry in precache_entries()]
+        self.assertIn(reverse('core:notice_detail', args=[notice.slug]), urls)
+        response = self.client.get(reverse('core:service_worker'), HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+
+    def revisions(self):
+        return {entry['url']: entry['revision'] for entry in precache_entries()}
+
+    def test_page_revisions_follow_navigation(self):
+        notice = Notice.objects.create(title="Holiday", description="Closed on Friday.", category='other')
+        url = reverse('core:notice_detail', args=[notice.slug])
+        before = self.revisions()[url]
+        Notice.objects.filter(pk=notice.pk).update(navigation={'next': {'slug': 'exams', 'title': "Exams"}})
+        self.assertNotEqual(self.revisions()[url], before)
+
+    def test_page_revisions_follow_the_stylesheet(self):
+        Notice.objects.create(title="Holiday", description="Closed on Friday.", category='other')
+        before = self.revisions()
+        with mock.patch('core.pwa.load_manifest', return_value={'stylesheet': 'images/logo.png'}):
+            after = self.revisions()
+        for url in (reverse('core:admission'), reverse('core:notice_detail', args=['holiday'])):
+            self.assertNotEqual(after[url], before[url])
+
+
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+class IndexAdviceTests(TestCase):
+    # The command captures queries on every alias, the read-only one included.
+    databases = '__all__'
+
+    def test_statements_differing_in_literals_normalize_alike(self):
+        self.assertEqual(
+            index_advice.normalize("SELECT 1 FROM t WHERE a = 'x' AND b = 20 LIMIT 12"),
+            index_advice.normalize("SELECT 1 FROM t WHERE a = 'it''s' AND b = 7 LIMIT 3"),
+        )
+
+    def test_wanted_columns_lead_with_equality_then_ordering(self):
+        sql = (
+            'SELECT "core_notice"."id" FROM "core_notice" WHERE ("core_notice"."category" = \'exam\' '
+            'AND "core_notice"."publish_date" < \'2025-01-01\') ORDER BY "core_notice"."publish_date" DESC, '
+            '"core_notice"."id" DESC LIMIT 12'
+        )
+        self.assertEqual(index_advice.wanted_columns(sql, 'core_notice'), ['category', '-publish_date', '-id'])
+
+    @skipUnless(connection.vendor in ('sqlite', 'postgresql'), "EXPLAIN parsing covers SQLite and PostgreSQL")
+    def test_explain_tells_scans_from_index_reads(self):
+        scans, used, sorted_ = index_advice.explain(
+            connection, 'SELECT "id" FROM "core_notice" WHERE "description" = \'x\' ORDER BY "title"',
+        )
+        self.assertEqual((scans, sorted_), ({'core_notice'}, True))
+        scans, used, _ = index_advice.explain(connection, 'SELECT "id" FROM "core_notice" WHERE "slug" = \'x\'')
+        self.assertEqual(scans, set())
+        self.assertTrue(used)
+
+    def test_reports_covered_indexes_and_writes_a_migration(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, '0099_index_advice.py')
+        out = io.StringIO()
+        with mock.patch.object(MigrationWriter, 'path', new_callable=mock.PropertyMock, return_value=path):
+            call_command('index_advice', routes=['notices', 'faculty'], migration=True, stdout=out)
+        report = out.getvalue()
+        self.assertIn("core_notice_slug_3f2870_idx on core_notice('slug',) is covered by", report)
+        # Faculty.department no longer has an index of its own.
+        self.assertNotIn("db_index=False on Faculty.department", report)
+        with open(path) as f:
+            migration = f.read()
+        self.assertIn("migrations.RemoveIndex(\n            model_name='notice',\n            name='core_notice_slug_3f2870_idx'", migration)
+
+
+@override_settings(STREAMING_RESPONSES=True, SQLITE_READ_ONLY_VIEWS=False)
+class StreamingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(15):
+            Notice.objects.create(title=f"Notice {i}", description="Closed on Friday.", category='other')
+
+    def test_head_and_header_leave_before_the_body(self):
+        response = self.client.get(reverse('core:home'), HTTP_HOST='localhost')
+        self.assertTrue(response.streaming)
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        self.assertIn('stylesheet', chunks[0])
+        self.assertIn('</header>', chunks[0])
+        self.assertNotIn('<!-- Hero Section -->', chunks[0])
+        self.assertIn('<!-- Hero Section -->', ''.join(chunks))
+
+    def test_streamed_page_matches_the_rendered_page(self):
+        url = reverse('core:notices')
+        streamed = b''.join(self.client.get(url, HTTP_HOST='localhost').streaming_content)
+        with override_settings(STREAMING_RESPONSES=False):
+            rendered = self.client.get(url, HTTP_HOST='localhost')
+        self.assertFalse(rendered.streaming)
+        self.assertEqual(streamed.decode(), rendered.content.decode())
+
+    def test_falls_back_when_the_page_will_be_cached(self):
+        request = RequestFactory().get(reverse('core:home'))
+        streamed = HomeView.as_view()(request)
+        request._cache_update_cache = True  # set by UpdateCacheMiddleware
+        cached = HomeView.as_view()(request)
+        self.assertIsInstance(streamed, StreamingTemplateResponse)
+        self.assertNotIsInstance(cached, StreamingTemplateResponse)
+
+
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.science = Department.objects.create(name="Science", code="SCI")
+        reference.bump('departments')
+        for name, designation in (("Amina", 'lecturer'), ("Bashir", 'lecturer'), ("Chandra", 'professor')):
+            Faculty.objects.create(
+                name=name, designation=designation, department=self.science, join_date=datetime.date(2020, 1, 1),
+            )
+
+    def test_counts_apply_the_other_facets(self):
+        response = self.client.get(reverse('core:faculty'), {'designation': 'lecturer'}, HTTP_HOST='localhost')
+        facets = response.context['facets']
+        designations = {option['value']: option['count'] for option in facets['designation']['options']}
+        self.assertEqual(designations['lecturer'], 2)
+        self.assertEqual(designations['professor'], 1)
+        self.assertEqual(facets['designation']['selected'], 'lecturer')
+        departments = {option['value']: option['count'] for option in facets['department']['options']}
+        self.assertEqual(departments[self.science.slug], 2)
+
+    def test_faculty_without_department_list_as_one_group(self):
+        Faculty.objects.create(name="Zaman", designation='principal', join_date=datetime.date(2019, 1, 1))
+        response = self.client.get(reverse('core:faculty'), HTTP_HOST='localhost')
+        # Ordered as the (department, designation_rank, name) index stores NULLs.
+        expected = ["Chandra", "Amina", "Bashir"]
+        if connection.features.nulls_order_largest:
+            expected.append("Zaman")
+        else:
+            expected.insert(0, "Zaman")
+        self.assertEqual([faculty.name for faculty in response.context['faculty']], expected)
+
+    def test_invalid_value_lists_nothing(self):
+        response = self.client.get(reverse('core:faculty'), {'designation': 'dean'}, HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['faculty']), [])
+
+    def test_empty_queryset_has_zero_counts(self):
+        self.assertEqual(grouped_counts(Faculty.objects.filter(pk__in=[]), FacultyListView.facets), [])
+        with self.assertNoLogs('core.facets', 'ERROR'):
+            response = self.client.get(reverse('core:faculty'), {'search': 'zzzzqq'}, HTTP_HOST='localhost')
+        options = response.context['facets']['designation']['options']
+        self.assertTrue(options)
+        self.assertEqual({option['count'] for option in options}, {0})
+
+    def test_counts_follow_changes(self):
+        facets = FacultyListView.facets
+        self.assertEqual(sum(n for _, n in grouped_counts(Faculty.objects.all(), facets)), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            Faculty.objects.create(name="Dipa", designation='staff', join_date=datetime.date(2021, 1, 1))
+        self.assertEqual(sum(n for _, n in grouped_counts(Faculty.objects.all(), facets)), 4)
+
+
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+class DepartmentStatsTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.department = Department.objects.create(name="Science", code="SCI")
+            self.head = Faculty.objects.create(
+                name="Rina", designation='professor', department=self.department,
+                join_date=datetime.date(2020, 1, 1), photo='faculty/rina',
+            )
+
+    def test_counts_follow_faculty_and_programs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Program.objects.create(
+                name="HSC Science", level='hsc', department=self.department, description="Science group",
+                duration="2 years",
+            )
+            Faculty.objects.create(
+                name="Amina", designation='lecturer', department=self.department, join_date=datetime.date(2021, 1, 1),
+            )
+        self.department.refresh_from_db()
+        self.assertEqual((self.department.faculty_count, self.department.program_count), (2, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Faculty.objects.filter(name="Amina").get().delete()
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.faculty_count, 1)
+
+    def test_head_is_copied_and_cleared(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.department.department_head = self.head
+            self.department.save()
+        response = self.client.get(
+            reverse('core:department_detail', args=[self.department.slug]), HTTP_HOST='localhost',
+        )
+        self.assertContains(response, 'faculty/rina')
+        self.assertEqual(response.context['department'].head_name, "Rina")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.head.name = "Rina Das"
+            self.head.save()
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.head_name, "Rina Das")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.head.delete()
+        self.department.refresh_from_db()
+        self.assertEqual((self.department.head_name, self.department.faculty_count), ('', 0))
+        self.assertFalse(self.department.head_photo)
+
+
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+class ReferenceDataTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings = override_settings(REFERENCE_VERSION_DIR=directory)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.science = Department.objects.create(name="Science", code="SCI")
+
+    def test_reads_are_served_from_memory(self):
+        self.assertEqual([department.name for department in reference.departments()], ["Science"])
+        reference.faqs('admission')
+        with self.assertNumQueries(0):
+            self.assertEqual(reference.department_id(self.science.slug), self.science.pk)
+            self.assertEqual(reference.faqs('admission'), ())
+
+    def test_saves_reload_the_data(self):
+        reference.departments()
+        # Writes that bypass content_changed are not seen...
+        Department.objects.filter(pk=self.science.pk).update(name="Natural Science")
+        self.assertEqual(reference.departments()[0].name, "Science")
+        # ...until any save of the kind bumps the version.
+        with self.captureOnCommitCallbacks(execute=True):
+            Department.objects.create(name="Arts", code="ART")
+        self.assertEqual([department.name for department in reference.departments()], ["Arts", "Natural Science"])
+
+    @override_settings(REFERENCE_CACHE_ALIAS='default')
+    def test_another_workers_bump_reloads_the_data(self):
+        reference.departments()
+        Department.objects.filter(pk=self.science.pk).update(name="Natural Science")
+        # What bump() leaves in the shared cache when it runs in another worker.
+        cache.set('reference:departments', 'changed elsewhere', None)
+        self.assertEqual(reference.departments()[0].name, "Natural Science")
+
+    @override_settings(STREAMING_RESPONSES=True)
+    def test_faculty_list_reads_departments_without_a_query(self):
+        for name in ("Amina", "Bashir"):
+            Faculty.objects.create(
+                name=name, designation='lecturer', department=self.science, join_date=datetime.date(2020, 1, 1),
+            )
+        url = reverse('core:faculty')
+        self.client.get(url, {'department': self.science.slug}, HTTP_HOST='localhost')
+        # Page count and rows; departments and facet counts come from memory and cache.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'department': self.science.slug}, HTTP_HOST='localhost')
+            body = b''.join(response.streaming_content).decode()
+        self.assertIn("Amina", body)
+
+
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+class FuzzySearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hossain = Faculty.objects.create(
+                name="Dr. Akbar Hossain", designation='professor', join_date=datetime.date(2020, 1, 1),
+            )
+            Faculty.objects.create(name="Rina Begum", designation='lecturer', join_date=datetime.date(2020, 1, 1))
+
+    def test_spelling_variants_share_a_key(self):
+        self.assertEqual(
+            {search_key(name) for name in ("হোসেন", "Hossain", "Hussain", "Hosain")}, {search_key("Hossain")},
+        )
+        self.assertEqual(search_key("Md. Karim"), search_key("Mohammad Karim"))
+
+    def test_bengali_query_finds_a_romanized_name(self):
+        self.assertEqual(fuzzy_ids('faculty', "আকবর হোসেন"), [self.hossain.pk])
+        response = self.client.get(reverse('core:faculty'), {'search': "Hussain"}, HTTP_HOST='localhost')
+        self.assertEqual([faculty.name for faculty in response.context['faculty']], ["Dr. Akbar Hossain"])
+
+    def test_index_follows_renames_and_rebuilds(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hossain.name = "Akbar Chowdhury"
+            self.hossain.save()
+        self.assertEqual(fuzzy_ids('faculty', "Hossain"), [])
+        self.assertEqual(fuzzy_ids('faculty', "Chowdhury"), [self.hossain.pk])
+
+        # bulk_create skips save(), so neither the key nor the trigrams exist until a rebuild.
+        Faculty.objects.bulk_create([
+            Faculty(name="Salma Khatun", designation='lecturer', join_date=datetime.date(2021, 1, 1), slug='salma'),
+        ])
+        self.assertEqual(fuzzy_ids('faculty', "Khatun"), [])
+        call_command('rebuild_search_index', kind='faculty', stdout=io.StringIO())
+        self.assertEqual(fuzzy_ids('faculty', "খাতুন"), [Faculty.objects.get(slug='salma').pk])
+
+
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+class NavigationTests(TestCase):
+    def notice(self, title, day, category='exam'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notice.objects.create(
+                title=title, description="Body", category=category,
+                publish_date=datetime.datetime(2025, 1, day, tzinfo=datetime.timezone.utc),
+            )
+
+    def stored(self, notice):
+        return Notice.objects.values_list('navigation', flat=True).get(pk=notice.pk)
+
+    def test_neighbours_follow_content_changes(self):
+        first = self.notice("First", 1)
+        third = self.notice("Third", 3)
+        self.assertEqual(self.stored(first)['newer']['id'], third.pk)
+
+        second = self.notice("Second", 2, category='other')
+        self.assertEqual(self.stored(first)['newer']['id'], second.pk)
+        self.assertEqual(self.stored(third)['older']['id'], second.pk)
+        # Related links stay within the category.
+        self.assertEqual([entry['id'] for entry in self.stored(first)['related']], [third.pk])
+        self.assertEqual(self.stored(second)['related'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.title = "Second (revised)"
+            second.save()
+        self.assertEqual(self.stored(first)['newer']['title'], "Second (revised)")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertEqual(self.stored(first)['newer']['id'], third.pk)
+        self.assertEqual(self.stored(third)['older']['id'], first.pk)
+
+    def test_rebuild_matches_the_incremental_links(self):
+        notices = [self.notice(f"Notice {day}", day, category=('exam', 'other')[day % 2]) for day in range(1, 8)]
+        incremental = {notice.pk: self.stored(notice) for notice in notices}
+        navigation.rebuild(Notice)
+        self.assertEqual({notice.pk: self.stored(notice) for notice in notices}, incremental)
+
+    def test_detail_page_renders_links_without_extra_queries(self):
+        first = self.notice("First", 1)
+        second = self.notice("Second", 2)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('core:notice_detail', args=[second.slug]), HTTP_HOST='localhost')
+        self.assertContains(response, reverse('core:notice_detail', args=[first.slug]))
+
+
+class KeysetPaginationTests(TestCase):
+    ordering = ('-batch_year', 'name', 'id')
+
+    def setUp(self):
+        Alumnus.objects.bulk_create(
+            Alumnus(name=f"Alumnus {i:02d}", batch_year=2000 + i % 4) for i in range(25)
+        )
+        self.expected = list(Alumnus.objects.order_by(*self.ordering))
+
+    def test_walks_forward_and_back(self):
+        pages, cursor = [], None
+        while True:
+            page = paginate(Alumnus.objects.all(), self.ordering, 10, after=cursor)
+            pages.append(page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual([obj for page in pages for obj in page.object_list], self.expected)
+        self.assertEqual([len(page.object_list) for page in pages], [10, 10, 5])
+        self.assertFalse(pages[0].has_previous)
+
+        back = paginate(Alumnus.objects.all(), self.ordering, 10, before=pages[2].previous_cursor)
+        self.assertEqual(back.object_list, pages[1].object_list)
+        self.assertTrue(back.has_previous and back.has_next)
+
+    def test_invalid_cursors_start_at_the_first_page(self):
+        for values in (["x", "y", 1], [None, "a", 1], [2001, "a"], {"batch_year": 2001}):
+            page = paginate(Alumnus.objects.all(), self.ordering, 10, after=encode_cursor(values))
+            self.assertEqual(page.object_list, self.expected[:10], values)
+        page = paginate(Alumnus.objects.all(), self.ordering, 10, before='not base64!')
+        self.assertEqual(page.object_list, self.expected[:10])
+
+    def test_alumni_page_ignores_crafted_cursors(self):
+        for values in (["x", "y", 1], [None, "a", 1]):
+            response = self.client.get(reverse('core:alumni'), {'after': encode_cursor(values)}, HTTP_HOST='localhost')
+            self.assertEqual(response.status_code, 200)
+
+
+class ResultIndexTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings = override_settings(RESULTS_INDEX_DIR=directory, RESULTS_INDEX_CHECK_INTERVAL=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.exam = Exam.objects.create(name="HSC", year=2025, is_published=True)
+
+    def publish(self):
+        results.publish([self.exam.pk])
+        return self.exam.slug
+
+    def test_build_index_round_trips_every_roll(self):
+        rolls = ['7', '42', '100', '999999', '1000000']
+        for roll in rolls:
+            ExamResult.objects.create(
+                exam=self.exam, roll=roll, name=f"Student {roll}", gpa='4.50', grade='A', subjects={'Bangla': 'A'},
+            )
+        slug = self.publish()
+        index = results.ResultIndex(os.path.join(results.index_dir(), f'exam-{self.exam.pk}.idx'))
+        self.assertEqual((len(index), index.width), (5, 7))
+        for roll in rolls:
+            self.assertEqual(json.loads(results.lookup(slug, roll)), {
+                'roll': roll, 'name': f"Student {roll}", 'gpa': '4.50', 'grade': 'A', 'subjects': {'Bangla': 'A'},
+            })
+        for missing in ('8', '0', '', 'abc', '10000000'):
+            self.assertIsNone(results.lookup(slug, missing))
+        self.assertIsNone(results.lookup('no-such-exam', '7'))
+
+    def test_empty_exam_and_unpublishing(self):
+        slug = self.publish()
+        self.assertEqual([exam['slug'] for exam in results.published_exams()], [slug])
+        self.assertIsNone(results.lookup(slug, '1'))
+
+        Exam.objects.filter(pk=self.exam.pk).update(is_published=False)
+        self.publish()
+        self.assertFalse(os.path.exists(os.path.join(results.index_dir(), f'exam-{self.exam.pk}.idx')))
+        self.assertEqual(results.published_exams(), [])
+        self.assertIsNone(results.lookup(slug, '1'))
+
+    def test_every_write_path_stores_the_normalized_roll(self):
+        result = ExamResult.objects.create(exam=self.exam, roll=' 00123 ', name="Rina", gpa='5.00', grade='A+')
+        self.assertEqual(result.roll, '123')
+        duplicate = ExamResult(exam=self.exam, roll='0123')
+        with self.assertRaises(ValidationError):
+            duplicate.full_clean()
+
+        slug = self.publish()
+        self.assertEqual(json.loads(results.lookup(slug, '00123'))['name'], "Rina")
+
+    @override_settings(SQLITE_READ_ONLY_VIEWS=False)
+    def test_lookup_caches_hits_briefly_and_misses_never(self):
+        ExamResult.objects.create(exam=self.exam, roll='123', name="Rina")
+        slug = self.publish()
+        url = reverse('core:result_lookup')
+        hit = self.client.get(url, {'exam': slug, 'roll': '0123'}, HTTP_HOST='localhost')
+        self.assertEqual(hit.status_code, 200)
+        self.assertEqual(hit['Cache-Control'], 'public, max-age=60')
+        miss = self.client.get(url, {'exam': slug, 'roll': '999'}, HTTP_HOST='localhost')
+        self.assertEqual(miss.status_code, 404)
+        self.assertEqual(miss['Cache-Control'], 'no-store')
+
+    def test_reimporting_corrected_rows_rebuilds_the_index(self):
+        path = os.path.join(results.index_dir(), 'results.csv')
+        for gpa, grade in (('3.00', 'B'), ('5.00', 'A+')):
+            with open(path, 'w') as f:
+                f.write(f'roll,name,gpa,grade\n1,Rina,{gpa},{grade}\n')
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('import_results', path, exam=self.exam.slug, publish=True, stdout=io.StringIO())
+        self.assertEqual(json.loads(results.lookup(self.exam.slug, '1'))['grade'], 'A+')
+
+    def test_admin_search_normalizes_rolls(self):
+        ExamResult.objects.create(exam=self.exam, roll='123', name="Rina")
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'x'))
+        response = self.client.get(reverse('admin:core_examresult_changelist'), {'q': '00123'}, HTTP_HOST='localhost')
+        self.assertEqual([result.roll for result in response.context['cl'].result_list], ['123'])
+
+
+class AdmissionSpoolTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings = override_settings(
+            ADMISSION_SPOOL_DIR=self.directory, ADMISSION_DRAIN_IN_PROCESS=False, ADMISSION_SPOOL_FSYNC=False,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        department = Department.objects.create(name="Science", code="SCI")
+        self.program = Program.objects.create(
+            name="HSC Science", level='hsc', department=department, description="Science group", duration="2 years",
+        )
+
+    def application(self, roll='123456'):
+        return AdmissionApplication(
+            program=self.program, applicant_name="Rina", father_name="Karim", mother_name="Salma",
+            date_of_birth=datetime.date(2008, 1, 1), phone='01700000000', ssc_roll=roll,
+            ssc_board='dhaka', ssc_year=2024, ssc_gpa='5.00',
+        )
+
+    def test_submit_then_drain_round_trips(self):
+        submitted = admissions.submit(self.application())
+        self.assertFalse(AdmissionApplication.objects.exists())
+        self.assertEqual(admissions.drain(), (1, 0))
+        stored = AdmissionApplication.objects.get()
+        self.assertEqual(stored.reference, submitted.reference)
+        self.assertEqual(stored.date_of_birth, datetime.date(2008, 1, 1))
+        self.assertEqual(str(stored.ssc_gpa), '5.00')
+        self.assertEqual(os.listdir(os.path.join(self.directory, admissions.PENDING_DIR)), [])
+        self.assertEqual(admissions.drain(), (0, 0))
+
+    def test_duplicate_is_caught_before_and_after_the_drain(self):
+        admissions.submit(self.application())
+        # Another worker shares nothing with this one but the spool directory.
+        cache.clear()
+        with self.assertRaises(ValidationError):
+            admissions.submit(self.application())
+        admissions.drain()
+        with self.assertRaises(ValidationError):
+            admissions.submit(self.application())
+        admissions.submit(self.application(roll='654321'))
+        self.assertEqual(admissions.drain(), (1, 0))
+
+    def test_claim_skips_empty_files_and_replays_dedupe(self):
+        admissions.submit(self.application())
+        open(os.path.join(self.directory, f'{admissions.SPOOL_PREFIX}0.jsonl'), 'w').close()
+        claimed = admissions.claim()
+        self.assertEqual(len(claimed), 1)
+        self.assertTrue(os.path.basename(claimed[0]).startswith(admissions.CLAIMED_PREFIX))
+        self.assertEqual(admissions.claim(), [])
+        records = admissions.read_claimed(claimed[0])
+        self.assertEqual(admissions.save(records + records), (1, 1))
+        self.assertEqual(admissions.save(records), (0, 1))
+
+    def test_colliding_reference_is_replaced_not_dropped(self):
+        with mock.patch.object(admissions, 'new_reference', side_effect=['SAMEREF2', 'SAMEREF2', 'FRESHREF']):
+            admissions.submit(self.application())
+            self.assertEqual(admissions.drain(), (1, 0))
+            admissions.submit(self.application(roll='654321'))
+            with self.assertLogs('core.admissions', 'WARNING'):
+                self.assertEqual(admissions.drain(), (1, 0))
+        self.assertEqual(
+            AdmissionApplication.objects.get(ssc_roll='654321').reference, 'FRESHREF',
+        )
+
+    def test_failed_append_releases_the_hash(self):
+        with mock.patch.object(admissions, '_append', side_effect=OSError):
+            with self.assertRaises(OSError):
+                admissions.submit(self.application())
+        admissions.submit(self.application())
+
+
+@override_settings(PERFORMANCE_SAMPLE_RATE=1.0, METRICS_ENABLED=False, SQLITE_READ_ONLY_VIEWS=False)
+class CacheInstrumentationTests(TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings = override_settings(RESULTS_INDEX_DIR=directory, RESULTS_INDEX_CHECK_INTERVAL=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        exam = Exam.objects.create(name="HSC", year=2025, is_published=True)
+        ExamResult.objects.create(exam=exam, roll='1', name="Rina")
+        results.publish([exam.pk])
+        self.url = reverse('core:result_lookup')
+        self.params = {'exam': exam.slug, 'roll': '1'}
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0, METRICS_ENABLED=True)
+    def test_cache_lookups_are_exported_as_metrics(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        registry = metrics.MetricsRegistry(directory, flush_interval=60)
+        with mock.patch.object(metrics, '_registry', registry):
+            for _ in range(2):
+                self.client.get(self.url, self.params, HTTP_HOST='localhost')
+            self.client.get(self.url, {'exam': 'unknown', 'roll': '1'}, HTTP_HOST='localhost')
+            rendered = registry.render()
+        self.assertIn('dgc_cache_requests_total{view="core:result_lookup",result="hit"} 2', rendered)
+        self.assertIn('dgc_cache_requests_total{view="core:result_lookup",result="miss"} 1', rendered)
+
+    def test_cache_lookups_reach_server_timing(self):
+        hit = self.client.get(self.url, self.params, HTTP_HOST='localhost')
+        self.assertIn('cache;desc=hit', hit['Server-Timing'])
+        miss = self.client.get(self.url, {'exam': 'unknown', 'roll': '1'}, HTTP_HOST='localhost')
+        self.assertIn('cache;desc=miss', miss['Server-Timing'])
+
+
+class ThrottleTests(TestCase):
+    rule = {'per_minute': 60, 'burst': 2}
+
+    def setUp(self):
+        throttling._buckets = None
+        self.addCleanup(setattr, throttling, '_buckets', None)
+
+    def test_local_bucket_allows_a_burst_then_refills(self):
+        buckets = throttling.LocalBuckets()
+        with mock.patch('core.throttling.time.monotonic', return_value=100.0):
+            self.assertEqual(buckets.take('a', self.rule), 0)
+            self.assertEqual(buckets.take('a', self.rule), 0)
+            self.assertAlmostEqual(buckets.take('a', self.rule), 1.0)
+            self.assertEqual(buckets.take('b', self.rule), 0)
+            buckets.refund('a', self.rule)
+            self.assertEqual(buckets.take('a', self.rule), 0)
+        with mock.patch('core.throttling.time.monotonic', return_value=100.5):
+            self.assertAlmostEqual(buckets.take('a', self.rule), 0.5)
+        with mock.patch('core.throttling.time.monotonic', return_value=101.5):
+            self.assertEqual(buckets.take('a', self.rule), 0)
+        self.assertEqual(throttling.retry_after(0.2), 1)
+
+    def test_local_buckets_forget_the_least_recent_client(self):
+        buckets = throttling.LocalBuckets(max_clients=2)
+        for key in ('a', 'b', 'a', 'c'):
+            buckets.take(key, self.rule)
+        self.assertEqual(list(buckets.buckets), ['a', 'c'])
+
+    def test_cache_buckets_count_per_minute(self):
+        cache.clear()
+        buckets = throttling.CacheBuckets('default')
+        with mock.patch('core.throttling.time.time', return_value=6015.0):
+            self.assertEqual(buckets.take('a', {'per_minute': 2}), 0)
+            self.assertEqual(buckets.take('a', {'per_minute': 2}), 0)
+            self.assertEqual(buckets.take('a', {'per_minute': 2}), 45)
+            buckets.refund('a', {'per_minute': 2})
+            buckets.refund('a', {'per_minute': 2})
+            self.assertEqual(buckets.take('a', {'per_minute': 2}), 0)
+        with mock.patch('core.throttling.time.time', return_value=6060.0):
+            self.assertEqual(buckets.take('a', {'per_minute': 2}), 0)
+
+    @override_settings(
+        THROTTLE_ENABLED=True, METRICS_ENABLED=False, SQLITE_READ_ONLY_VIEWS=False, RESULTS_INDEX_CHECK_INTERVAL=0,
+        THROTTLE_RULES={'core:result_lookup': {'per_minute': 1, 'burst': 1, 'params': ('roll',)}},
+    )
+    def test_responses_answered_from_caches_keep_their_token(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with override_settings(RESULTS_INDEX_DIR=directory):
+            exam = Exam.objects.create(name="HSC", year=2025, is_published=True)
+            ExamResult.objects.create(exam=exam, roll='1', name="Rina")
+            results.publish([exam.pk])
+            url = reverse('core:result_lookup')
+            for _ in range(3):
+                response = self.client.get(url, {'exam': exam.slug, 'roll': '1'}, HTTP_HOST='localhost')
+                self.assertEqual(response.status_code, 200)
+            # An unknown exam is a cache miss and is charged.
+            self.assertEqual(self.client.get(url, {'exam': 'x', 'roll': '1'}, HTTP_HOST='localhost').status_code, 404)
+            self.assertEqual(self.client.get(url, {'exam': 'x', 'roll': '1'}, HTTP_HOST='localhost').status_code, 429)
+
+    @override_settings(
+        THROTTLE_ENABLED=True, METRICS_ENABLED=False, SQLITE_READ_ONLY_VIEWS=False,
+        THROTTLE_RULES={'core:notices': {'per_minute': 1, 'burst': 2, 'params': ('search',)}},
+    )
+    def test_searches_past_the_burst_get_429(self):
+        url = reverse('core:notices')
+        for _ in range(2):
+            self.assertEqual(self.client.get(url, {'search': 'exam'}, HTTP_HOST='localhost').status_code, 200)
+        response = self.client.get(url, {'search': 'exam'}, HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertEqual(self.client.get(url, HTTP_HOST='localhost').status_code, 200)
+        other = self.client.get(url, {'search': 'exam'}, HTTP_HOST='localhost', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(other.status_code, 200)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.exam = Exam.objects.create(name="HSC", year=2025)
+        ExamResult.objects.create(
+            exam=self.exam, roll='1', name="রিনা", gpa='5.00', grade='A+', subjects={'Bangla': 'A+'},
+        )
+        ExamResult.objects.create(exam=self.exam, roll='2', name="Karim, Jr.")
+
+    def test_csv_has_a_bom_header_and_json_cells(self):
+        lines = list(export.encode(ExamResult.objects.order_by('roll'), 'csv', chunk_size=1))
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('\ufeff'.encode()))
+        self.assertEqual(
+            lines[0].decode().lstrip('\ufeff').strip(),
+            'id,exam_id,exam,roll,name,gpa,grade,subjects',
+        )
+        first = lines[1].decode()
+        self.assertIn(f',{self.exam.pk},HSC,1,রিনা,5.00,A+,', first)
+        self.assertIn('"{""Bangla"": ""A+""}"', first)
+        self.assertIn('"Karim, Jr.",,,{}', lines[2].decode())
+
+    def test_jsonl_rows_carry_the_foreign_key_label(self):
+        records = [json.loads(line) for line in export.encode(ExamResult.objects.order_by('roll'), 'jsonl')]
+        self.assertEqual(
+            [(r['roll'], r['exam_id'], r['exam'], r['gpa'], r['subjects']) for r in records],
+            [('1', self.exam.pk, "HSC", '5.00', {'Bangla': 'A+'}), ('2', self.exam.pk, "HSC", None, {})],
+        )
+        self.assertEqual(list(export.encode(ExamResult.objects.none(), 'jsonl')), [])
+        with self.assertRaises(ValueError):
+            list(export.encode(ExamResult.objects.all(), 'xml'))
+
+    def test_admin_exports_the_filtered_changelist(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'x'))
+        url = reverse('admin:core_examresult_export', args=['jsonl'])
+        response = self.client.get(url, {'q': '2'}, HTTP_HOST='localhost')
+        self.assertEqual(response['Content-Type'], export.FORMATS['jsonl'])
+        self.assertIn('attachment; filename="examresult-', response['Content-Disposition'])
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([record['roll'] for record in records], ['2'])
+        unknown = self.client.get(reverse('admin:core_examresult_export', args=['xml']), HTTP_HOST='localhost')
+        self.assertEqual(unknown.status_code, 404)
+
+
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+class BulkUpdateActionTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'x'))
+        self.notices = [
+            Notice.objects.create(title=f"Notice {i}", description="Body", category='other') for i in range(3)
+        ]
+        self.announced = []
+
+        def handler(sender, pks, fields, **kwargs):
+            self.announced.append((sender, pks and sorted(pks), fields))
+        content_changed.connect(handler, weak=False)
+        self.addCleanup(content_changed.disconnect, handler)
+
+    def mark_important(self, notices):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                reverse('admin:core_notice_changelist'),
+                {'action': 'mark_important', '_selected_action': [notice.pk for notice in notices]},
+                HTTP_HOST='localhost',
+            )
+
+    def test_updates_the_selection_and_announces_its_pks(self):
+        response = self.mark_important(self.notices[:2])
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            set(Notice.objects.filter(is_important=True).values_list('pk', flat=True)),
+            {notice.pk for notice in self.notices[:2]},
+        )
+        self.assertEqual(
+            self.announced, [(Notice, [notice.pk for notice in self.notices[:2]], ['is_important'])],
+        )
+
+    def test_large_selections_are_announced_without_pks(self):
+        with mock.patch.object(admin, 'ANNOUNCE_MAX_PKS', 2):
+            self.mark_important(self.notices)
+        self.assertEqual(Notice.objects.filter(is_important=True).count(), 3)
+        self.assertEqual(self.announced, [(Notice, None, ['is_important'])])
+
+
+class CriticalCssTests(TestCase):
+    def test_page_markup_is_assembled_in_document_order(self):
+        markup = critical_css.document_source('index.html')
+        header = markup.index(critical_css._read_template('components/header.html'))
+        footer = markup.index(critical_css._read_template('components/footer.html'))
+        content = markup.index('<!-- Hero Section -->')
+        self.assertNotIn('{% extends', markup)
+        self.assertLess(header, content)
+        self.assertLess(content, footer)
+
+    def test_critical_css_keeps_the_top_of_the_page_within_the_budget(self):
+        rules = critical_css.parse('.a{color:red}.b{color:blue}.c{margin:0 auto;padding:1rem}')
+        markup = '<p class="a"></p><p class="b"></p><p class="c"></p>'
+        everything = '.a{color:red}.b{color:blue}.c{margin:0 auto;padding:1rem}'
+        self.assertEqual(critical_css.critical_markup(rules, markup, 1000), everything)
+        self.assertEqual(critical_css.critical_markup(rules, markup, len(everything) - 1), '.a{color:red}.b{color:blue}')
+        self.assertEqual(critical_css.critical_markup(rules, markup, 5), '')
+
+    def test_python_sources_are_scanned(self):
+        candidates = critical_css.class_candidates(critical_css.python_sources())
+        self.assertLessEqual(set(INPUT_CLASSES.split()), candidates)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.registry = metrics.MetricsRegistry(self.directory, flush_interval=60)
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        self.dead_pid = process.pid
+
+    def snapshot(self, name, requests):
+        with open(os.path.join(self.directory, name), 'w') as f:
+            json.dump({'core:home': {'requests': {'2xx': requests}}}, f)
+
+    def requests(self):
+        return self.registry.collect()['core:home']['requests'].get('2xx', 0)
+
+    def test_exited_workers_are_folded_into_the_aggregate(self):
+        host = self.registry.host
+        self.snapshot(f'worker-{host}-{self.dead_pid}-1.json', 1)
+        self.snapshot(f'worker-{self.dead_pid}-2.json', 2)
+        self.snapshot(f'worker-{host}-{os.getppid()}-3.json', 4)
+        self.snapshot(f'worker-elsewhere-{self.dead_pid}-4.json', 8)
+        self.assertEqual(self.requests(), 15)
+        self.assertEqual(sorted(name for name in os.listdir(self.directory) if name.endswith('.json')), [
+            metrics.AGGREGATE, f'worker-elsewhere-{self.dead_pid}-4.json',
+            f'worker-{host}-{os.getppid()}-3.json', os.path.basename(self.registry.filename),
+        ])
+        self.assertEqual(self.requests(), 15)
+
+        self.snapshot(f'worker-{host}-{self.dead_pid}-5.json', 16)
+        self.assertEqual(self.requests(), 31)
+
+    def test_a_folded_snapshot_left_behind_is_not_counted_twice(self):
+        name = f'worker-{self.registry.host}-{self.dead_pid}-1.json'
+        self.snapshot(name, 1)
+        with open(os.path.join(self.directory, metrics.AGGREGATE), 'w') as f:
+            json.dump({'views': {'core:home': {'requests': {'2xx': 1}}}, 'folded': [name]}, f)
+        self.assertEqual(self.requests(), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, name)))
+
+
+class GalleryImportFormTests(TestCase):
+    def form(self, *names):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for name in names:
+                archive.writestr(name, b'')
+        upload = SimpleUploadedFile('photos.zip', buffer.getvalue(), content_type='application/zip')
+        return GalleryImportForm({'category': 'event'}, {'archive': upload})
+
+    @override_settings(GALLERY_IMPORT_ADMIN_MAX_FILES=2)
+    def test_archives_past_the_per_request_limit_are_refused(self):
+        self.assertTrue(self.form('a.jpg', 'b.png', 'notes.txt', '__MACOSX/._a.jpg').is_valid())
+        form = self.form('a.jpg', 'b.png', 'c.jpg')
+        self.assertFalse(form.is_valid())
+        self.assertIn("at most 2", form.errors['archive'][0])
+        self.assertIn("at most 2 images", form.fields['archive'].help_text)
+
+
+@skipUnless(connection.vendor == 'sqlite', "SQLite profile only")
+class SqliteProfileTests(SimpleTestCase):
+    def test_default_connection_applies_the_pragmas(self):
+        db = sqlite3.connect(':memory:')
+        self.addCleanup(db.close)
+        db.executescript(django_settings.DATABASES['default']['OPTIONS']['init_command'])
+        pragmas = django_settings.SQLITE_PRAGMAS
+        self.assertEqual(db.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+        self.assertEqual(db.execute('PRAGMA cache_size').fetchone()[0], pragmas['cache_size'])
+        self.assertEqual(db.execute('PRAGMA temp_store').fetchone()[0], 2)  # MEMORY
+
+    def test_read_only_connection_refuses_writes(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'db.sqlite3')
+        writer = sqlite3.connect(path)
+        writer.executescript(django_settings.DATABASES['default']['OPTIONS']['init_command'])
+        writer.execute('CREATE TABLE t (a)')
+        writer.commit()
+        writer.close()
+        reader = sqlite3.connect(path)
+        self.addCleanup(reader.close)
+        reader.executescript(django_settings.DATABASES['readonly']['OPTIONS']['init_command'])
+        self.assertEqual(reader.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        self.assertEqual(reader.execute('SELECT COUNT(*) FROM t').fetchone()[0], 0)
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.execute('INSERT INTO t VALUES (1)')
+
+    @override_settings(SQLITE_READ_ONLY_VIEWS=True)
+    def test_public_get_requests_read_through_the_read_only_alias(self):
+        router = routers.ReadOnlyRouter()
+        middleware = ReadOnlyMiddleware(lambda request: HttpResponse())
+
+        def route(method, url):
+            request = getattr(RequestFactory(), method)(url)
+            request.resolver_match = resolve(url)
+            middleware(request)
+            middleware.process_view(request, None, (), {})
+            return router.db_for_read(Notice), router.db_for_write(Notice)
+
+        self.assertEqual(route('get', reverse('core:notices')), ('readonly', 'default'))
+        self.assertEqual(route('post', reverse('core:admission_apply')), ('default', 'default'))
+        self.assertEqual(route('get', reverse('admin:core_notice_changelist')), ('default', 'default'))
+        with override_settings(SQLITE_READ_ONLY_VIEWS=False):
+            self.assertEqual(route('get', reverse('core:notices')), ('default', 'default'))
+
+
+class StartupTests(TestCase):
+    def test_boot_stays_within_the_startup_budget(self):
+        # Boots a fresh worker in a subprocess; raises CommandError past STARTUP_BUDGET_MS.
+        out = io.StringIO()
+        call_command('profile_startup', runs=1, top=0, stdout=out)
+        self.assertIn("budget", out.getvalue())
+
+
+@override_settings(SQLITE_READ_ONLY_VIEWS=False)
+class BenchmarkTests(TransactionTestCase):
+    # Committed rows: the benchmark's client threads use their own connections.
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        cache.clear()
+
+    def seed(self):
+        out = io.StringIO()
+        call_command(
+            'seed_scale', notices=30, faculty=20, gallery=5, events=5, programs=1, seed=1, stdout=out,
+        )
+        return out.getvalue()
+
+    def benchmark(self, **options):
+        call_command(
+            'benchmark', routes=['notices', 'faculty', 'notice_detail'], requests=4, concurrency=2, warmup=1,
+            output=os.path.join(self.directory, 'latest.json'),
+            baseline=os.path.join(self.directory, 'baseline.json'), stdout=io.StringIO(), **options,
+        )
+        with open(os.path.join(self.directory, 'latest.json')) as f:
+            return json.load(f)
+
+    def test_seeded_routes_answer_without_errors(self):
+        self.assertIn("Created 30", self.seed())
+        self.assertEqual(Notice.objects.count(), 30)
+        self.assertTrue(Faculty.objects.exclude(search_key='').exists())
+
+        report = self.benchmark(save_baseline=True)
+        self.assertEqual(set(report['routes']), {'notices', 'faculty', 'notice_detail'})
+        for name, result in report['routes'].items():
+            self.assertEqual((result['requests'], result['errors']), (4, 0), name)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'baseline.json')))
+
+    def test_regression_past_the_baseline_fails(self):
+        self.seed()
+        report = self.benchmark(save_baseline=True)
+        for result in report['routes'].values():
+            result['p95_ms'] = 0.01
+        with open(os.path.join(self.directory, 'baseline.json'), 'w') as f:
+            json.dump(report, f)
+        with mock.patch('core.management.commands.benchmark.NOISE_FLOOR_MS', 0), self.assertRaises(CommandError):
+            self.benchmark()
@@ -0,0 +1,125 @@
+"""
+Per-client throttling of expensive requests (search and filter queries).
+
+``THROTTLE_RULES`` maps a view name to a token bucket: ``per_minute``
+requests sustained and up to ``burst`` at once, per client IP. A rule
+with ``params`` only applies when one of those query parameters is
+present, so plain page views are never throttled.
+
+Buckets live in process memory by default, which bounds each worker
+separately. Set ``THROTTLE_CACHE_ALIAS`` to a cache shared by the workers
+(Redis, Memcached) to count across them; that backend uses per-minute
+windows, since a cache can only increment atomically.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def client_ip(request):
+    """The client address, taking ``THROTTLE_PROXY_COUNT`` trusted proxies' X-Forwarded-For into account."""
+    proxies = getattr(settings, 'THROTTLE_PROXY_COUNT', 0)
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',') if hop.strip()]
+        if hops:
+            return hops[-min(proxies, len(hops))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def rule_for(request, view_name):
+    rule = getattr(settings, 'THROTTLE_RULES', {}).get(view_name)
+    if rule is None:
+        return None
+    if request.method not in rule.get('methods', ('GET', 'HEAD')):
+        return None
+    params = rule.get('params')
+    if params and not any(request.GET.get(param, '').strip() for param in params):
+        return None
+    return rule
+
+
+class LocalBuckets:
+    """Token buckets in this process, least recently used dropped past ``max_clients``."""
+
+    def __init__(self, max_clients=10000):
+        self.max_clients = max_clients
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key, rule):
+        """Return 0 when a token was taken, else the seconds until one is available."""
+        rate = rule['per_minute'] / 60
+        capacity = rule.get('burst', rule['per_minute'])
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                self.buckets[key] = (tokens - 1, now)
+                wait = 0
+            else:
+                self.buckets[key] = (tokens, now)
+                wait = (1 - tokens) / rate
+            while len(self.buckets) > self.max_clients:
+                self.buckets.popitem(last=False)
+        return wait
+
+    def refund(self, key, rule):
+        with self.lock:
+            if key in self.buckets:
+                tokens, updated = self.buckets[key]
+                self.buckets[key] = (min(rule.get('burst', rule['per_minute']), tokens + 1), updated)
+
+
+class CacheBuckets:
+    """Per-minute request counters in a shared cache."""
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def window(self):
+        now = time.time()
+        return int(now // 60), 60 - now % 60
+
+    def take(self, key, rule):
+        window, remaining = self.window()
+        cache_key = f'throttle:{key}:{window}'
+        self.cache.add(cache_key, 0, 90)
+        try:
+            count = self.cache.incr(cache_key)
+        except ValueError:  # expired between add() and incr()
+            self.cache.set(cache_key, 1, 90)
+            count = 1
+        return 0 if count <= rule['per_minute'] else remaining
+
+    def refund(self, key, rule):
+        window, _ = self.window()
+        try:
+            self.cache.decr(f'throttle:{key}:{window}')
+        except ValueError:
+            pass
+
+
+_buckets = None
+_buckets_lock = threading.Lock()
+
+
+def get_buckets():
+    global _buckets
+    if _buckets is None:
+        with _buckets_lock:
+            if _buckets is None:
+                alias = getattr(settings, 'THROTTLE_CACHE_ALIAS', None)
+                _buckets = CacheBuckets(alias) if alias else LocalBuckets(
+                    getattr(settings, 'THROTTLE_MAX_CLIENTS', 10000)
+                )
+    return _buckets
+
+
+def retry_after(wait):
+    return max(1, math.ceil(wait))
@@ -0,0 +1,113 @@
+"""
+Change tracking for model saves.
+
+``TrackedFieldsMixin`` remembers the column values an instance was loaded
+(or last saved) with. Validation (``full_clean()`` or a ModelForm) then
+checks only the fields that changed, so unchanged unique fields cost no
+uniqueness query, and ``save()`` writes only the changed columns. A save that changes nothing
+writes nothing and sends no signals, so caches and search indexes are
+left alone.
+"""
+import copy
+
+
+def _comparable(field, value):
+    # Compare what would be written, so e.g. two CloudinaryResource objects
+    # for the same public id count as equal.
+    try:
+        return field.get_prep_value(value)
+    except Exception:
+        return value
+
+
+class TrackedFieldsMixin:
+    """Mix into a model before ``models.Model``."""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_fields()
+        return instance
+
+    def _remember_fields(self):
+        self._loaded_fields = {
+            field.attname: copy.copy(self.__dict__[field.attname])
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using, fields, from_queryset)
+        loaded = getattr(self, '_loaded_fields', None)
+        if loaded is not None:
+            # Also reached when a deferred field is first read.
+            for field in self._meta.concrete_fields:
+                if field.attname in self.__dict__ and (
+                    fields is None or field.name in fields or field.attname in fields
+                ):
+                    loaded[field.attname] = copy.copy(self.__dict__[field.attname])
+
+    def changed_fields(self):
+        """Names of the concrete fields changed since the instance was loaded or saved."""
+        loaded = getattr(self, '_loaded_fields', None)
+        if loaded is None:
+            return [field.name for field in self._meta.concrete_fields]
+        changed = []
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue  # deferred and never loaded
+            if field.attname not in loaded or (
+                _comparable(field, self.__dict__[field.attname]) != _comparable(field, loaded[field.attname])
+            ):
+                changed.append(field.name)
+        return changed
+
+    def has_changed(self, name):
+        return self._state.adding or name in self.changed_fields()
+
+    def _unchanged_exclude(self, exclude):
+        """``exclude`` plus the fields that need no validation because they haven't changed."""
+        if self._state.adding or getattr(self, '_loaded_fields', None) is None:
+            return exclude
+        changed = set(self.changed_fields())
+        unchanged = {field.name for field in self._meta.concrete_fields} - changed
+        # Fields checked together with a changed one (unique_together,
+        # UniqueConstraint) must stay in for that check to run.
+        groups = [set(fields) for fields in self._meta.unique_together]
+        groups += [set(getattr(constraint, 'fields', ())) for constraint in self._meta.constraints]
+        for group in groups:
+            if group & changed:
+                unchanged -= group
+        return set(exclude or ()) | unchanged
+
+    def clean_fields(self, exclude=None):
+        super().clean_fields(self._unchanged_exclude(exclude))
+
+    def validate_unique(self, exclude=None):
+        super().validate_unique(self._unchanged_exclude(exclude))
+
+    def validate_constraints(self, exclude=None):
+        super().validate_constraints(self._unchanged_exclude(exclude))
+
+    def save(self, *args, **kwargs):
+        tracked = (
+            not args
+            and not self._state.adding
+            and getattr(self, '_loaded_fields', None) is not None
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        )
+        if tracked:
+            changed = self.changed_fields()
+            if self._meta.pk.name in changed:
+                tracked = False
+            elif not changed:
+                return
+            else:
+                changed += [
+                    field.name for field in self._meta.concrete_fields
+                    if getattr(field, 'auto_now', False) and field.name not in changed
+                ]
+                kwargs['update_fields'] = changed
+        super().save(*args, **kwargs)
+        self._remember_fields()
@@ -36,20 +36,34 @@ urlpatterns = [
 
     # Alumni URL
     path('alumni/', views.AlumniView.as_view(), name='alumni'),
+    path('alumni/<int:pk>/', views.AlumnusDetailView.as_view(), name='alumnus_detail'),
 
     # Result URL
     path('result/', views.ResultView.as_view(), name='result'),
+    path('result/lookup/', views.ResultLookupView.as_view(), name='result_lookup'),
 
     # calendars URL
     path("calender/", views.CalenderView.as_view(), name="calender"),
     
     # Admission URL
     path('admission/', views.AdmissionView.as_view(), name='admission'),
+    path('admission/apply/', views.AdmissionApplyView.as_view(), name='admission_apply'),
     path('admission#admission-programs', views.AdmissionView.as_view(), name="programs"),
     
     # Contact URL
     path('contact/', views.ContactView.as_view(), name='contact'),
 
+    # Metrics URL
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
+    path('throttle/', views.ThrottleDashboardView.as_view(), name='throttle_dashboard'),
+
+    # Readiness / warmup
+    path('ready/', views.ReadinessView.as_view(), name='ready'),
+
+    # Offline support
+    path('sw.js', views.ServiceWorkerView.as_view(), name='service_worker'),
+    path('manifest.webmanifest', views.WebManifestView.as_view(), name='webmanifest'),
+
 ] 
 
 handle404 = '404.html'
\ No newline at end of file
@@ -1,16 +1,33 @@
-from django.views.generic import ListView, DetailView, TemplateView
+from django.conf import settings
+from django.views import View
+from django.views.generic import ListView, DetailView, TemplateView, FormView
+from django.db import connection
 from django.db.models import Q
-from django.core.exceptions import ObjectDoesNotExist
-from django.http import Http404
-from django.contrib import messages
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import redirect, render
+from django.templatetags.static import static
+from django.urls import reverse
+from django.contrib import admin, messages
+from django.middleware.csrf import get_token
 from django.utils import timezone
+import json
 import logging
-from .models import Department, Faculty, Notice, Program, Event, Gallery, Faq
+from .models import Department, Faculty, Notice, Program, Event, Gallery, Alumnus
+from .forms import AdmissionApplicationForm
+from .metrics import get_registry
+from .facets import DepartmentFacet, Facet, FacetedListMixin
+from .pagination import KeysetPaginationMixin
+from . import admissions, navigation, reference, results
+from .pwa import service_worker_config
+from .warmup import state as warmup_state, warmup
+from .search import fuzzy_ids
+from .streaming import StreamingResponseMixin
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-class HomeView(TemplateView):
+class HomeView(StreamingResponseMixin, TemplateView):
     template_name = 'index.html'
 
     def get_context_data(self, **kwargs):
@@ -27,7 +44,7 @@ class HomeView(TemplateView):
             context['principal'] = None
         return context
 
-class HistoryView(TemplateView):
+class HistoryView(StreamingResponseMixin, TemplateView):
     template_name = 'history.html'
 
     def get_context_data(self, **kwargs):
@@ -40,32 +57,50 @@ class HistoryView(TemplateView):
             context['gallery'] = []
         return context
 
-class FacultyListView(ListView):
+class FacultyListView(FacetedListMixin, StreamingResponseMixin, ListView):
     model = Faculty
     template_name = 'faculty.html'
     context_object_name = 'faculty'
     paginate_by = 18  # Added pagination
+    facets = (
+        DepartmentFacet(),
+        Facet('designation', choices=Faculty.DESIGNATION_CHOICES, label='পদবি'),
+    )
 
     def get_queryset(self):
         try:
             queryset = super().get_queryset().select_related('department')
             search_query = self.request.GET.get('search', '').strip()
-            department_filter = self.request.GET.get('department', '').strip()
 
             if search_query:
                 if len(search_query) < 2:
                     messages.warning(self.request, "Search term must be at least 2 characters long.")
                 else:
+                    # Fuzzy, transliteration-aware name match via the trigram index
+                    lowered = search_query.lower()
+                    designations = [
+                        value for value, label in Faculty.DESIGNATION_CHOICES
+                        if lowered in value or search_query in label
+                    ]
                     queryset = queryset.filter(
-                        Q(name__icontains=search_query) |
-                        Q(department__name__icontains=search_query) |
-                        Q(designation__icontains=search_query)
+                        Q(pk__in=fuzzy_ids('faculty', search_query)) |
+                        Q(department_id__in=fuzzy_ids('department', search_query)) |
+                        Q(designation__in=designations)
                     )
 
-            if department_filter:
-                queryset = queryset.filter(department__name__icontains=department_filter)
+            # Departments resolve from the in-memory list, so the filter
+            # needs no join and uses the (department, ...) index.
+            queryset = self.apply_facets(queryset)
 
-            return queryset.order_by('designation', 'name')
+            # Served by the (department, designation_rank, name) index; the
+            # template regroups the rows by department. Faculty without a
+            # department follow the index's NULL order: first on SQLite,
+            # last on PostgreSQL. Asking for NULLS FIRST would cost
+            # PostgreSQL a sort, and SQLite can't index it.
+            return queryset.order_by('department_id', 'designation_rank', 'name')
+        except ValueError as e:
+            logger.warning(f"Invalid query parameters in FacultyListView: {e}")
+            return Faculty.objects.none()
         except Exception as e:
             logger.error(f"Error in FacultyListView get_queryset: {e}", exc_info=True)
             messages.error(self.request, "Unable to load faculty list. Please try again later.")
@@ -74,7 +109,7 @@ class FacultyListView(ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         try:
-            context['departments'] = Department.objects.all()
+            context['departments'] = reference.departments()
             context['search_query'] = self.request.GET.get('search', '')
             context['department_filter'] = self.request.GET.get('department', '')
             context['get_params'] = self.request.GET.urlencode()
@@ -96,7 +131,7 @@ class FacultyDetailView(DetailView):
             logger.error(f"Faculty not found: {self.kwargs.get('slug')}")
             raise Http404("Faculty member not found.")
 
-class DepartmentListView(ListView):
+class DepartmentListView(StreamingResponseMixin, ListView):
     model = Department
     template_name = "departments.html"
     context_object_name = "departments"
@@ -105,7 +140,8 @@ class DepartmentListView(ListView):
 
     def get_queryset(self):
         try:
-            return super().get_queryset().select_related('department_head')
+            # Head name, photo and counts are denormalised onto Department (core.stats).
+            return super().get_queryset()
         except Exception as e:
             logger.error(f"Error in DepartmentListView get_queryset: {e}", exc_info=True)
             messages.error(self.request, "Unable to load departments. Please try again later.")
@@ -126,8 +162,8 @@ class DepartmentDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         try:
-            department = self.get_object()
-            context['faculty'] = Faculty.objects.filter(department=department).select_related('department')
+            department = self.object
+            context['faculty'] = Faculty.objects.filter(department=department).order_by('designation_rank', 'name')
             context['programs'] = Program.objects.filter(department=department)
         except Exception as e:
             logger.error(f"Error in DepartmentDetailView get_context_data: {e}", exc_info=True)
@@ -136,24 +172,18 @@ class DepartmentDetailView(DetailView):
             context['programs'] = []
         return context
 
-class NoticeListView(ListView):
+class NoticeListView(FacetedListMixin, StreamingResponseMixin, ListView):
     model = Notice
     template_name = 'notice.html'
     context_object_name = 'notices'
     paginate_by = 12
+    facets = (Facet('category', choices=Notice.CATEGORY_CHOICES, label='নোটিশ বিভাগসমূহ'),)
 
     def get_queryset(self):
         try:
             queryset = super().get_queryset()
-            category = self.request.GET.get('category', '').strip()
             search = self.request.GET.get('search', '').strip()
 
-            if category:
-                if category not in dict(Notice.CATEGORY_CHOICES):
-                    messages.warning(self.request, "Invalid category selected.")
-                    raise ValueError("Invalid category.")
-                queryset = queryset.filter(category=category)
-
             if search:
                 if len(search) < 2:
                     messages.warning(self.request, "Search term must be at least 2 characters long.")
@@ -161,6 +191,7 @@ class NoticeListView(ListView):
                 queryset = queryset.filter(
                     Q(title__icontains=search) | Q(description__icontains=search)
                 )
+            queryset = self.apply_facets(queryset)
 
             featured_notice = Notice.objects.filter(is_important=True).order_by('-publish_date').first()
             if featured_notice:
@@ -202,27 +233,29 @@ class NoticeDetailView(DetailView):
             logger.error(f"Notice not found: {self.kwargs.get('slug')}")
             raise Http404("Notice not found.")
 
-class ProgramListView(ListView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            # Stored on the row by core.navigation, so this costs no query.
+            context['navigation'] = navigation.links(self.object)
+        except Exception as e:
+            logger.error(f"Error in NoticeDetailView get_context_data: {e}", exc_info=True)
+            context['navigation'] = None
+        return context
+
+class ProgramListView(FacetedListMixin, StreamingResponseMixin, ListView):
     model = Program
     template_name = 'programs.html'
     context_object_name = 'programs'
     paginate_by = 10  # Added pagination
+    facets = (
+        Facet('level', choices=Program.LEVEL_CHOICES, name='program level', label='স্তর'),
+        DepartmentFacet(),
+    )
 
     def get_queryset(self):
         try:
-            queryset = super().get_queryset().select_related('department')
-            level_filter = self.request.GET.get('level', '').strip()
-            department_filter = self.request.GET.get('department', '').strip()
-
-            if level_filter:
-                if level_filter not in dict(Program.LEVEL_CHOICES):
-                    messages.warning(self.request, "Invalid program level selected.")
-                    raise ValueError("Invalid level.")
-                queryset = queryset.filter(level=level_filter)
-
-            if department_filter:
-                queryset = queryset.filter(department__name__icontains=department_filter)
-
+            queryset = self.apply_facets(super().get_queryset().select_related('department'))
             return queryset.order_by('name')
         except ValueError as e:
             logger.warning(f"Invalid query parameters in ProgramListView: {e}")
@@ -236,7 +269,7 @@ class ProgramListView(ListView):
         context = super().get_context_data(**kwargs)
         try:
             context['levels'] = Program.LEVEL_CHOICES
-            context['departments'] = Department.objects.all()
+            context['departments'] = reference.departments()
             context['get_params'] = self.request.GET.urlencode()
         except Exception as e:
             logger.error(f"Error in ProgramListView get_context_data: {e}", exc_info=True)
@@ -257,7 +290,7 @@ class ProgramDetailView(DetailView):
             logger.error(f"Program not found: {self.kwargs.get('slug')}")
             raise Http404("Program not found.")
 
-class EventListView(ListView):
+class EventListView(StreamingResponseMixin, ListView):
     model = Event
     template_name = 'events.html'
     context_object_name = 'events'
@@ -266,21 +299,11 @@ class EventListView(ListView):
     def get_queryset(self):
         try:
             queryset = super().get_queryset()
-            category = self.request.GET.get('category', '').strip()
-            if category:
-                if category not in dict(Gallery.CATEGORY_CHOICES):
-                    messages.warning(self.request, "Invalid event category selected.")
-                    raise ValueError("Invalid category.")
-                queryset = queryset.filter(category=category)
-            
             featured_notice = Event.objects.filter(is_featured=True, date__gte=timezone.now().date()).order_by('-date').first()
             if featured_notice:
                 queryset = queryset.exclude(id=featured_notice.id)
 
             return queryset.order_by('-date')
-        except ValueError as e:
-            logger.warning(f"Invalid query parameters in EventListView: {e}")
-            return Event.objects.none()
         except Exception as e:
             logger.error(f"Error in EventListView get_queryset: {e}", exc_info=True)
             messages.error(self.request, "Unable to load events. Please try again later.")
@@ -291,14 +314,12 @@ class EventListView(ListView):
         try:
             featured_event = Event.objects.filter(is_featured=True).order_by('-date').first()
             context['featured_event'] = featured_event
-            context['categories'] = Gallery.CATEGORY_CHOICES  # Assuming events use gallery categories
             context['get_params'] = self.request.GET.urlencode()
         except Exception as e:
             logger.error(f"Error in EventListView get_context_data: {e}", exc_info=True)
             messages.error(self.request, "Unable to load event data. Please try again later.")
             context['featured_event'] = None
             context['events'] = Event.objects.none()
-            context['categories'] = []
         return context
 
 class EventDetailView(DetailView):
@@ -313,21 +334,26 @@ class EventDetailView(DetailView):
             logger.error(f"Event not found: {self.kwargs.get('slug')}")
             raise Http404("Event not found.")
 
-class GalleryView(ListView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            # Stored on the row by core.navigation, so this costs no query.
+            context['navigation'] = navigation.links(self.object)
+        except Exception as e:
+            logger.error(f"Error in EventDetailView get_context_data: {e}", exc_info=True)
+            context['navigation'] = None
+        return context
+
+class GalleryView(FacetedListMixin, StreamingResponseMixin, ListView):
     model = Gallery
     template_name = 'gallery.html'
     context_object_name = 'images'
     paginate_by = 12
+    facets = (Facet('category', choices=Gallery.CATEGORY_CHOICES, name='gallery category', label='বিভাগ'),)
 
     def get_queryset(self):
         try:
-            queryset = super().get_queryset()
-            category = self.request.GET.get('category', '').strip()
-            if category:
-                if category not in dict(Gallery.CATEGORY_CHOICES):
-                    messages.warning(self.request, "Invalid gallery category selected.")
-                    raise ValueError("Invalid category.")
-                queryset = queryset.filter(category=category)
+            queryset = self.apply_facets(super().get_queryset())
             return queryset.order_by('-upload_date')
         except ValueError as e:
             logger.warning(f"Invalid query parameters in GalleryView: {e}")
@@ -348,7 +374,7 @@ class GalleryView(ListView):
             context['categories'] = []
         return context
 
-class CalenderView(TemplateView):
+class CalenderView(StreamingResponseMixin, TemplateView):
     template_name = 'calender.html'
 
     def get_context_data(self, **kwargs):
@@ -361,26 +387,133 @@ class CalenderView(TemplateView):
             context['events'] = []
         return context
 
-class AlumniView(TemplateView):
+class AlumniView(KeysetPaginationMixin, StreamingResponseMixin, ListView):
+    model = Alumnus
     template_name = 'alumni.html'
+    context_object_name = 'alumni'
+    paginate_by = 24
+    # Served by the (department, -batch_year, name, id) and (-batch_year, name, id) indexes.
+    keyset_ordering = ('-batch_year', 'name', 'id')
+
+    def get_queryset(self):
+        try:
+            queryset = Alumnus.objects.select_related('department').only(*Alumnus.LIST_FIELDS)
+            search_query = self.request.GET.get('search', '').strip()
+            department_filter = self.request.GET.get('department', '').strip()
+            batch_filter = self.request.GET.get('batch', '').strip()
+
+            if search_query:
+                if len(search_query) < 2:
+                    messages.warning(self.request, "Search term must be at least 2 characters long.")
+                else:
+                    queryset = queryset.filter(pk__in=fuzzy_ids('alumnus', search_query))
+
+            if department_filter:
+                # Resolved from the in-memory department list, so the filter
+                # needs no join and uses the department_id index.
+                department_id = reference.department_id(department_filter)
+                if department_id is None:
+                    return queryset.none()
+                queryset = queryset.filter(department_id=department_id)
+
+            if batch_filter.isdigit():
+                queryset = queryset.filter(batch_year=batch_filter)
+
+            return queryset
+        except Exception as e:
+            logger.error(f"Error in AlumniView get_queryset: {e}", exc_info=True)
+            messages.error(self.request, "Unable to load the alumni directory. Please try again later.")
+            return Alumnus.objects.none()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            context['departments'] = reference.departments()
+            # Two index seeks; a DISTINCT over the column would read the whole index.
+            years = Alumnus.objects.values_list('batch_year', flat=True)
+            newest, oldest = years.order_by('-batch_year').first(), years.order_by('batch_year').first()
+            context['batch_years'] = range(newest, oldest - 1, -1) if newest else []
+            context['search_query'] = self.request.GET.get('search', '')
+            context['department_filter'] = self.request.GET.get('department', '')
+            context['batch_filter'] = self.request.GET.get('batch', '')
+        except Exception as e:
+            logger.error(f"Error in AlumniView get_context_data: {e}", exc_info=True)
+            messages.error(self.request, "Unable to load alumni filters. Please try again later.")
+            context['departments'] = []
+            context['batch_years'] = []
+        return context
 
-class ResultView(TemplateView):
+class AlumnusDetailView(DetailView):
+    model = Alumnus
+    template_name = 'alumnus_detail.html'
+    context_object_name = 'alumnus'
+
+    def get_queryset(self):
+        return Alumnus.objects.select_related('department')
+
+    @classmethod
+    def benchmark_paths(cls):
+        return [reverse('core:alumnus_detail', args=[pk]) for pk in Alumnus.objects.values_list('pk', flat=True)[:50]]
+
+class ResultView(StreamingResponseMixin, TemplateView):
     template_name = 'result.html'
 
-class ContactView(TemplateView):
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['exams'] = results.published_exams()
+        exam = self.request.GET.get('exam', '').strip()
+        roll = self.request.GET.get('roll', '').strip()
+        context['selected_exam'] = exam
+        context['roll'] = roll
+        context['result'] = None
+        if exam and roll:
+            try:
+                record = results.lookup(exam, roll)
+                context['result'] = json.loads(record) if record else None
+            except Exception as e:
+                logger.error(f"Error in ResultView get_context_data: {e}", exc_info=True)
+                messages.error(self.request, "Unable to look up the result. Please try again later.")
+        return context
+
+    @classmethod
+    def benchmark_paths(cls):
+        paths = [f"{reverse('core:result')}?exam={exam}&roll={roll}" for exam, roll in results.sample_rolls()]
+        return paths or [reverse('core:result')]
+
+class ResultLookupView(View):
+    """JSON result for ``?exam=<slug>&roll=<roll>``, straight from the result index."""
+
+    def get(self, request):
+        record = results.lookup(request.GET.get('exam', ''), request.GET.get('roll', ''))
+        if record is None:
+            response = JsonResponse({'error': 'Result not found.'}, status=404)
+            # A miss just before publication must not stick.
+            response['Cache-Control'] = 'no-store'
+        else:
+            response = HttpResponse(record, content_type='application/json')
+            # Absorbs result-day refreshes; short, because corrections are
+            # republished (republish_exam_of_result).
+            response['Cache-Control'] = f"public, max-age={getattr(settings, 'RESULTS_LOOKUP_MAX_AGE', 60)}"
+        return response
+
+    @classmethod
+    def benchmark_paths(cls):
+        return [f"{reverse('core:result_lookup')}?exam={exam}&roll={roll}" for exam, roll in results.sample_rolls()]
+
+class ContactView(StreamingResponseMixin, TemplateView):
     template_name = 'contact.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         try:
-            context['faqs'] = Faq.objects.filter(page='contact')
+            context['faqs'] = reference.faqs('contact')
         except Exception as e:
             logger.error(f"Error in ContactView get_context_data: {e}", exc_info=True)
             messages.error(self.request, "Unable to load FAQs. Please try again later.")
             context['faqs'] = []
         return context
 
-class CampusView(TemplateView):
+class CampusView(StreamingResponseMixin, TemplateView):
     template_name = 'campus.html'
 
     def get_context_data(self, **kwargs):
@@ -393,17 +526,148 @@ class CampusView(TemplateView):
             context['campus_images'] = []
         return context
 
-class AdmissionView(TemplateView):
+class AdmissionView(StreamingResponseMixin, TemplateView):
     template_name = 'admission.html'
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         try:
-            context['faqs'] = Faq.objects.filter(page='admission')
+            context['faqs'] = reference.faqs('admission')
             context['notices'] = Notice.objects.filter(category='admission').order_by('-publish_date')[:5]
         except Exception as e:
             logger.error(f"Error in AdmissionView get_context_data: {e}", exc_info=True)
             messages.error(self.request, "Unable to load admission data. Please try again later.")
             context['faqs'] = []
             context['notices'] = []
-        return context
\ No newline at end of file
+        return context
+
+class AdmissionApplyView(StreamingResponseMixin, FormView):
+    """Online admission form; applications are spooled and saved in batches (core.admissions)."""
+    template_name = 'admission_apply.html'
+    form_class = AdmissionApplicationForm
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # The form is rendered after CsrfMiddleware has seen a streamed
+        # response, so the cookie has to be requested up front.
+        get_token(self.request)
+        context['reference'] = self.request.GET.get('ref', '')[:12]
+        return context
+
+    def form_valid(self, form):
+        try:
+            application = admissions.submit(form.save(commit=False))
+        except ValidationError as e:
+            form.add_error(None, e)
+            return self.form_invalid(form)
+        except Exception as e:
+            logger.error(f"Error in AdmissionApplyView form_valid: {e}", exc_info=True)
+            messages.error(self.request, "Unable to submit the application. Please try again later.")
+            return self.form_invalid(form)
+        messages.success(self.request, "Your application has been submitted.")
+        return redirect(f"{reverse('core:admission_apply')}?ref={application.reference}")
+
+class MetricsView(View):
+    """Prometheus scrape endpoint, visible to staff and local scrapers only."""
+    LOCAL_ADDRESSES = ('127.0.0.1', '::1')
+
+    def get(self, request):
+        is_local = (
+            settings.METRICS_ALLOW_LOCAL
+            and request.META.get('REMOTE_ADDR') in self.LOCAL_ADDRESSES
+        )
+        if not (request.user.is_staff or is_local):
+            raise Http404()
+        return HttpResponse(
+            get_registry().render(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
+
+
+class ThrottleDashboardView(View):
+    """Staff page listing the clients most often rejected by the throttle, across all workers."""
+    TOP_CLIENTS = 50
+
+    def get(self, request):
+        if not request.user.is_staff:
+            raise Http404()
+        clients, routes = {}, {}
+        if settings.METRICS_ENABLED:
+            for view_name, data in get_registry().collect().items():
+                for client, n in data['throttled'].items():
+                    entry = clients.setdefault(client, {'address': client, 'total': 0, 'routes': {}})
+                    entry['total'] += n
+                    entry['routes'][view_name] = entry['routes'].get(view_name, 0) + n
+                    routes[view_name] = routes.get(view_name, 0) + n
+        top = sorted(clients.values(), key=lambda entry: entry['total'], reverse=True)[:self.TOP_CLIENTS]
+        for entry in top:
+            entry['routes'] = sorted(entry['routes'].items(), key=lambda item: item[1], reverse=True)
+        return render(request, 'admin/throttle.html', {
+            **admin.site.each_context(request),
+            'title': 'Throttled clients',
+            'enabled': settings.THROTTLE_ENABLED,
+            'metrics_enabled': settings.METRICS_ENABLED,
+            'rules': [
+                {'view': view_name, **rule, 'throttled': routes.get(view_name, 0)}
+                for view_name, rule in settings.THROTTLE_RULES.items()
+            ],
+            'clients': top,
+            'tracked': len(clients),
+        })
+
+
+class ServiceWorkerView(View):
+    """The offline service worker, served from the site root so it controls every page."""
+
+    def get(self, request):
+        version, config = service_worker_config()
+        response = render(
+            request, 'sw.js', {'version': version, 'config': json.dumps(config)},
+            content_type='application/javascript; charset=utf-8',
+        )
+        # Browsers must see a new manifest as soon as notices change.
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+
+class WebManifestView(View):
+    def get(self, request):
+        manifest = {
+            'name': 'Dhamrai Government College',
+            'short_name': 'DGC',
+            'lang': 'bn',
+            'start_url': reverse('core:home'),
+            'scope': '/',
+            'display': 'standalone',
+            'background_color': '#f9fafb',
+            'theme_color': '#22c55e',
+            'icons': [{'src': static('images/logo.png'), 'sizes': '128x128', 'type': 'image/png'}],
+        }
+        return JsonResponse(manifest, content_type='application/manifest+json', json_dumps_params={'ensure_ascii': False})
+
+
+class ReadinessView(View):
+    """
+    Health check for the host: 200 once the worker is warm and the database
+    answers, 503 otherwise. Warms the worker first if wsgi.py didn't.
+    """
+
+    def get(self, request):
+        warmup()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            database = True
+        except Exception as e:
+            logger.error(f"Readiness check could not reach the database: {e}", exc_info=True)
+            database = False
+        ready = warmup_state['ready'] and database
+        return JsonResponse(
+            {
+                'status': 'ready' if ready else 'unavailable',
+                'database': database,
+                'warmup_ms': warmup_state['steps'],
+                'errors': warmup_state['errors'],
+            },
+            status=200 if ready else 503,
+        )
@@ -0,0 +1,109 @@
+"""
+Cold-start warmup for hosts that put idle instances to sleep.
+
+``warmup()`` does the work the first visitor would otherwise pay for:
+importing every view through the URLconf, compiling templates into the
+cached loader, opening database connections and rendering the main pages
+once (which also loads the per-process reference data, core.reference).
+The pages stream, so nothing lands in the compressed-body cache.
+dgc/wsgi.py runs it when the worker boots; ``/ready/`` reports whether it
+has finished.
+"""
+import io
+import logging
+import os
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template import engines
+from django.urls import get_resolver, reverse
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+state = {'ready': False, 'steps': {}, 'errors': []}
+
+
+def _timed(name, func):
+    started = time.perf_counter()
+    try:
+        func()
+    except Exception as e:
+        logger.error(f"Warmup step {name} failed: {e}", exc_info=True)
+        state['errors'].append(f"{name}: {e}")
+    state['steps'][name] = round((time.perf_counter() - started) * 1000, 1)
+
+
+def load_urlconf():
+    get_resolver().url_patterns
+
+
+def compile_templates():
+    directory = os.path.join(settings.BASE_DIR, 'templates')
+    engine = engines['django']
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            if name.endswith('.html'):
+                engine.get_template(os.path.relpath(os.path.join(root, name), directory))
+
+
+def open_connections():
+    for alias in connections:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+
+
+def render_pages():
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+    for name in getattr(settings, 'WARMUP_PAGES', ()):
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': reverse(name),
+            'QUERY_STRING': '',
+            'SCRIPT_NAME': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'HTTP_ACCEPT_ENCODING': 'br, gzip',
+            'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        body = handler(environ, lambda status, headers, exc_info=None: None)
+        try:
+            for _ in body:
+                pass
+        finally:
+            body.close()
+
+
+# Connections are opened last: a rendered page closes the ones it used
+# when CONN_MAX_AGE is 0.
+STEPS = (
+    ('urlconf', load_urlconf),
+    ('templates', compile_templates),
+    ('pages', render_pages),
+    ('database', open_connections),
+)
+
+
+def warmup():
+    """Run each warmup step once per process; return the step timings in ms."""
+    with _lock:
+        if not state['ready']:
+            for name, func in STEPS:
+                _timed(name, func)
+            state['ready'] = True
+            logger.info(f"Warmup finished: {state['steps']}")
+    return state['steps']
@@ -13,7 +13,6 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 import dj_database_url
-import cloudinary
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -53,13 +52,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ThrottleMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReadOnlyMiddleware',
 ]
 
 ROOT_URLCONF = 'dgc.urls'
@@ -87,23 +90,56 @@ WSGI_APPLICATION = 'dgc.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# SQLite in development
-
-# DATABASES = {
-#     'default': {
-#         'ENGINE': 'django.db.backends.sqlite3',
-#         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-#     }
-# }
-
-# PostgreSQL in production (neon.tech)
+# PostgreSQL in production (neon.tech), or SQLite with
+# DATABASE_URL=sqlite:////path/to/db.sqlite3 (tuned below).
 
 DATABASES = {
      'default': dj_database_url.config(
          default=os.environ.get('DATABASE_URL'),
-         conn_max_age=600
+         conn_max_age=600,
+         # A persistent connection may have been dropped while the instance slept.
+         conn_health_checks=True,
     )
 }
+
+# SQLite profile, used when DATABASE_URL is a sqlite:/// URL (PythonAnywhere).
+# WAL lets readers carry on while a write commits; with WAL, synchronous=NORMAL
+# only risks the last commits on power loss, not corruption. cache_size is in
+# KiB when negative; mmap_size lets reads come straight from the OS page cache.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_KB', 20000)),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_BYTES', 256 * 1024 * 1024)),
+    'temp_store': 'MEMORY',
+}
+# Seconds a connection waits for the write lock before "database is locked".
+SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5))
+# Public GET pages read through a second, query-only connection (core/routers.py).
+SQLITE_READ_ONLY_VIEWS = os.environ.get('SQLITE_READ_ONLY_VIEWS', 'True').lower() in ('1', 'true', 'yes')
+
+if DATABASES['default'].get('ENGINE') == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'init_command': ';'.join(f'PRAGMA {name} = {value}' for name, value in SQLITE_PRAGMAS.items()),
+        # Take the write lock when a transaction begins: upgrading a read
+        # lock later fails at once instead of waiting out the busy timeout.
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': SQLITE_BUSY_TIMEOUT,
+    })
+    if SQLITE_READ_ONLY_VIEWS:
+        # journal_mode is left to the default connection: it is stored in the file.
+        read_pragmas = {name: value for name, value in SQLITE_PRAGMAS.items() if name != 'journal_mode'}
+        DATABASES['readonly'] = {
+            **DATABASES['default'],
+            'OPTIONS': {
+                'init_command': ';'.join(
+                    f'PRAGMA {name} = {value}' for name, value in {**read_pragmas, 'query_only': 'ON'}.items()
+                ),
+                'timeout': SQLITE_BUSY_TIMEOUT,
+            },
+            'TEST': {'MIRROR': 'default'},
+        }
+        DATABASE_ROUTERS = ['core.routers.ReadOnlyRouter']
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -146,19 +182,160 @@ STATICFILES_DIRS = [
 
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# Upper bound on the CSS `manage.py build_css` inlines into each page
+# (core.critical_css): the rules for as much of the top of the page as
+# fits, which covers the banner, header and first screen of content. The
+# rest arrives with the asynchronously loaded site stylesheet.
+CRITICAL_CSS_MAX_BYTES = 14 * 1024
+
 MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Images one "Import ZIP" upload on the Gallery admin page may hold. The
+# import runs inside that request, so keep it well within the server's
+# request timeout; larger batches go through `manage.py import_gallery`.
+GALLERY_IMPORT_ADMIN_MAX_FILES = 40
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
-# Cloudinary settings
-cloudinary.config( 
-    cloud_name = os.environ.get('CLOUDINARY_CLOUD_NAME'), 
-    api_key = os.environ.get('CLOUDINARY_API_KEY'),
-    api_secret = os.environ.get('CLOUDINARY_API_SECRET'),
+# Per-process cache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+
+# Cloudinary settings, applied by CoreConfig.ready() so that loading
+# settings doesn't import the SDK.
+CLOUDINARY = {
+    'cloud_name': os.environ.get('CLOUDINARY_CLOUD_NAME'),
+    'api_key': os.environ.get('CLOUDINARY_API_KEY'),
+    'api_secret': os.environ.get('CLOUDINARY_API_SECRET'),
+}
+
+
+# Stream TemplateView/ListView pages so the <head> and header reach the
+# browser before the page body has rendered (core.streaming).
+STREAMING_RESPONSES = os.environ.get('STREAMING_RESPONSES', 'True').lower() in ('1', 'true', 'yes')
+
+# Response compression (core.middleware.CompressionMiddleware). Brotli is
+# used when the Brotli package is installed, gzip otherwise.
+COMPRESSION_MIN_SIZE = 512  # bytes
+COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+COMPRESSION_CONTENT_TYPES = (
+    'text/html', 'application/json', 'text/plain', 'application/javascript', 'application/manifest+json',
 )
+# Complete (non-streamed) bodies are cached by ETag so they compress only
+# once; streamed pages are compressed on every request.
+COMPRESSION_CACHE_ALIAS = 'default'
+COMPRESSION_CACHE_TIMEOUT = 600  # seconds
+
+# Performance instrumentation (core.middleware.PerformanceMiddleware)
+# Fraction of requests timed and reported; keep it low in production.
+PERFORMANCE_SAMPLE_RATE = float(os.environ.get('PERFORMANCE_SAMPLE_RATE', '1.0' if DEBUG else '0.05'))
+PERFORMANCE_SERVER_TIMING = True
+
+# Per-view Prometheus metrics served at /metrics (staff or localhost only).
+# Each worker snapshots its counters into METRICS_DIR, which must be shared
+# by all workers of one deployment.
+METRICS_ENABLED = True
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(BASE_DIR, '.metrics'))
+METRICS_FLUSH_INTERVAL = 5  # seconds
+# Disable when a reverse proxy on the same host makes every client look local.
+METRICS_ALLOW_LOCAL = True
+
+# Cold-start warmup (core.warmup), run by dgc/wsgi.py as each worker boots.
+# Turn it off when the server forks after loading the app (gunicorn
+# --preload) so forked workers don't share database connections.
+WARMUP_ON_BOOT = os.environ.get('WARMUP_ON_BOOT', 'True').lower() in ('1', 'true', 'yes')
+WARMUP_PAGES = ('core:home', 'core:notices', 'core:admission')
+# `manage.py profile_startup` fails when booting a worker takes longer.
+STARTUP_BUDGET_MS = 1500
+
+# Published exam results are served from memory-mapped index files
+# (core.results). The directory must be shared by all workers on a host.
+RESULTS_INDEX_DIR = os.environ.get('RESULTS_INDEX_DIR', os.path.join(BASE_DIR, '.results'))
+RESULTS_INDEX_CHECK_INTERVAL = 2  # seconds
+# Browser/proxy cache lifetime of a found result; misses are never cached.
+RESULTS_LOOKUP_MAX_AGE = 60  # seconds
+
+# Online admission applications (core.admissions) are appended to a spool
+# in ADMISSION_SPOOL_DIR and written to the database in batches by a
+# drainer thread in each worker, or by `manage.py drain_admissions --loop`
+# when ADMISSION_DRAIN_IN_PROCESS is off. The directory must be shared by
+# all workers on a host.
+ADMISSION_SPOOL_DIR = os.environ.get('ADMISSION_SPOOL_DIR', os.path.join(BASE_DIR, '.admissions'))
+ADMISSION_SPOOL_FSYNC = True  # an accepted application survives a crash
+ADMISSION_DRAIN_IN_PROCESS = os.environ.get('ADMISSION_DRAIN_IN_PROCESS', 'True').lower() in ('1', 'true', 'yes')
+ADMISSION_DRAIN_INTERVAL = 2  # seconds
+ADMISSION_DRAIN_STALE = 300  # seconds before a claimed file of a dead drainer is retried
+ADMISSION_BATCH_SIZE = 500
+# Hashes of applications spooled but not yet drained are kept as marker
+# files in ADMISSION_SPOOL_DIR, so a resubmission to any worker on the host
+# is caught before it reaches the database. When workers span several
+# hosts, name a cache they all share (Redis, Memcached) here instead.
+ADMISSION_CACHE_ALIAS = None
+
+# Per-client throttling of search queries (core.throttling). Each rule gives
+# a view a token bucket per client address: `per_minute` requests sustained,
+# `burst` at once. Rules with `params` only apply when one of those query
+# parameters is present, so plain page views are never throttled.
+THROTTLE_ENABLED = os.environ.get('THROTTLE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+THROTTLE_RULES = {
+    'core:notices': {'per_minute': 30, 'burst': 10, 'params': ('search',)},
+    'core:faculty': {'per_minute': 30, 'burst': 10, 'params': ('search',)},
+    'core:alumni': {'per_minute': 30, 'burst': 10, 'params': ('search',)},
+}
+# Buckets are kept per worker by default; name a cache shared by all workers
+# (Redis, Memcached) to enforce the limits across them.
+THROTTLE_CACHE_ALIAS = None
+THROTTLE_MAX_CLIENTS = 10000  # in-process buckets kept, least recently used dropped
+# Number of reverse proxies in front of the app whose X-Forwarded-For can be
+# trusted; 0 uses REMOTE_ADDR.
+THROTTLE_PROXY_COUNT = int(os.environ.get('THROTTLE_PROXY_COUNT', '0'))
+THROTTLE_EXEMPT_ADDRESSES = ()
+# Clients per view remembered for the /throttle/ dashboard, per worker.
+THROTTLE_TRACKED_CLIENTS = 200
+
+# Departments and FAQs are kept in each worker's memory (core.reference)
+# and reloaded when their version file in REFERENCE_VERSION_DIR changes.
+# The directory must be shared by the workers; on several hosts, name a
+# shared cache in REFERENCE_CACHE_ALIAS to hold the versions instead.
+REFERENCE_VERSION_DIR = os.environ.get('REFERENCE_VERSION_DIR', os.path.join(BASE_DIR, '.reference'))
+REFERENCE_CACHE_ALIAS = None
+
+# Facet counts of the list pages (core.facets), cached per query and
+# dropped when the listed model changes.
+FACET_CACHE_ALIAS = 'default'
+FACET_CACHE_TIMEOUT = 300  # seconds
+
+# Recent notice pages the service worker (templates/sw.js) keeps for offline use.
+PWA_PRECACHE_NOTICES = 20
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'bare': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'performance': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'bare',
+        },
+    },
+    'loggers': {
+        'core.performance': {
+            'handlers': ['performance'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
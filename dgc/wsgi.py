@@ -15,4 +15,11 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dgc.settings')
 
 application = get_wsgi_application()
 
-app = application
\ No newline at end of file
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_BOOT:
+    # Pay the cold-start cost before the first visitor does (core.warmup).
+    from core.warmup import warmup
+    warmup()
+
+app = application
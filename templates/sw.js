@@ -0,0 +1,118 @@
+// Service worker for offline access. Generated by core.views.ServiceWorkerView;
+// the precache manifest below changes whenever a precached page or file does.
+const VERSION = '{{ version }}';  // Identifies the live worker when debugging.
+const CONFIG = {{ config|safe }};
+
+const PRECACHE = 'dgc-precache';
+const PAGES = 'dgc-pages';
+
+function precacheKey(entry) {
+    const url = new URL(entry.url, self.location.origin);
+    url.searchParams.set('__rev', entry.revision);
+    return url.href;
+}
+
+const precacheKeys = new Map(
+    CONFIG.precache.map(entry => [new URL(entry.url, self.location.origin).href, precacheKey(entry)])
+);
+
+self.addEventListener('install', event => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(PRECACHE);
+        // Only download entries whose revision isn't cached already.
+        await Promise.all(CONFIG.precache.map(async entry => {
+            const key = precacheKey(entry);
+            if (await cache.match(key)) {
+                return;
+            }
+            const response = await fetch(entry.url, {credentials: 'same-origin', cache: 'no-cache'});
+            if (response.ok) {
+                await cache.put(key, response);
+            }
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        const wanted = new Set(precacheKeys.values());
+        const cache = await caches.open(PRECACHE);
+        for (const request of await cache.keys()) {
+            if (!wanted.has(request.url)) {
+                await cache.delete(request);
+            }
+        }
+        // The precache now holds the current copy of these pages.
+        const pages = await caches.open(PAGES);
+        for (const url of precacheKeys.keys()) {
+            await pages.delete(url);
+        }
+        for (const name of await caches.keys()) {
+            if (name !== PRECACHE && name !== PAGES) {
+                await caches.delete(name);
+            }
+        }
+        await self.clients.claim();
+    })());
+});
+
+async function staleWhileRevalidate(event, precached) {
+    const cache = await caches.open(PAGES);
+    const cached = (await cache.match(event.request)) || (precached && await caches.match(precached));
+    const network = fetch(event.request).then(response => {
+        if (response.ok) {
+            cache.put(event.request, response.clone());
+        }
+        return response;
+    });
+    if (cached) {
+        event.waitUntil(network.catch(() => {}));
+        return cached;
+    }
+    try {
+        return await network;
+    } catch (error) {
+        return offlineFallback(event.request);
+    }
+}
+
+async function networkFirst(event) {
+    const cache = await caches.open(PAGES);
+    try {
+        const response = await fetch(event.request);
+        if (response.ok && event.request.mode === 'navigate') {
+            cache.put(event.request, response.clone());
+        }
+        return response;
+    } catch (error) {
+        return (await cache.match(event.request)) || offlineFallback(event.request);
+    }
+}
+
+async function offlineFallback(request) {
+    if (request.mode !== 'navigate') {
+        return Response.error();
+    }
+    const url = new URL(CONFIG.offlinePage, self.location.origin).href;
+    return (await caches.match(precacheKeys.get(url) || url)) || Response.error();
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin
+            || url.pathname.startsWith('/admin/') || url.pathname.startsWith('/metrics/')) {
+        return;
+    }
+    const key = url.search ? null : precacheKeys.get(url.href);
+    if (key && request.mode !== 'navigate') {
+        // Static files: the revision is a hash of their bytes.
+        event.respondWith(caches.match(key).then(cached => cached || fetch(request)));
+    } else if (key || CONFIG.listPages.includes(url.pathname)) {
+        // Pages also show links and a stylesheet from outside their revision.
+        event.respondWith(staleWhileRevalidate(event, key));
+    } else if (request.mode === 'navigate') {
+        event.respondWith(networkFirst(event));
+    }
+});